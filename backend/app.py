@@ -6,9 +6,15 @@ from datetime import timedelta
 
 from models import db
 from auth import bcrypt, auth_bp
-from routes import main_bp
+from routes import main_bp, generate_pool_grid
 from extensions import jwt
 from trie_engine import DictionnaireTrie
+from engine.nogood_store import NogoodStore
+from generation_jobs import (GenerationJobRunner, DEFAULT_JOB_WORKERS, DEFAULT_MAX_PENDING_JOBS,
+                             DEFAULT_JOB_TIME_BUDGET_MS, DEFAULT_JOB_TTL_S)
+from grid_pool import GridPool, template_sizes, DEFAULT_POOL_IDLE_MS, DEFAULT_POOL_BACKOFF_MS
+from result_cache import ResultCache, DEFAULT_RESULT_CACHE_SIZE
+from compiled_cache import CompiledCache, DEFAULT_LEXICON_CACHE_SIZE, DEFAULT_TEMPLATE_CACHE_SIZE
 
 def create_app(test_config=None):
     logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -53,10 +59,58 @@ def create_app(test_config=None):
         # En mode test, on met un placeholder pour éviter les erreurs
         app.dela_trie = None
 
+    # Version du lexique global (empreinte du DELA), clé des caches de grilles
+    app.dela_version = NogoodStore.lexicon_version(app.dela_trie.words) if app.dela_trie else None
+
+    # NOUVEAU : Cache de nogoods partagé entre les requêtes (sur disque si NOGOOD_STORE_PATH est défini)
+    app.nogood_store = NogoodStore(path=app.config.get('NOGOOD_STORE_PATH', os.environ.get('NOGOOD_STORE_PATH')))
+    # NOUVEAU : Pool borné de workers pour les générations asynchrones (POST /api/grids/jobs)
+    # GENERATION_JOB_WORKERS : threads de ce processus, qui partagent le GIL avec les requêtes
+    # (voir GenerationJobRunner) ; le garder bas, la montée en charge passe par les processus WSGI.
+    app.generation_jobs = GenerationJobRunner(
+        app,
+        max_workers=int(app.config.get('GENERATION_JOB_WORKERS', os.environ.get('GENERATION_JOB_WORKERS', DEFAULT_JOB_WORKERS))),
+        max_pending=int(app.config.get('GENERATION_JOB_QUEUE', DEFAULT_MAX_PENDING_JOBS)),
+        time_budget_ms=float(app.config.get('GENERATION_JOB_TIME_BUDGET_MS', DEFAULT_JOB_TIME_BUDGET_MS)),
+        ttl_s=float(app.config.get('GENERATION_JOB_TTL_S', os.environ.get('GENERATION_JOB_TTL_S', DEFAULT_JOB_TTL_S))),
+    )
+    # NOUVEAU : Réserve de grilles pré-générées (requêtes anonymes sur le DELA), remplie en tâche de fond.
+    # Sur demande seulement (GRID_POOL_TARGET défini) : chaque processus qui charge l'application
+    # (worker WSGI, script, test) aurait sinon sa propre réserve et son propre thread de remplissage ;
+    # à définir pour un seul processus du déploiement.
+    app.grid_pool = None
+    pool_target = app.config.get('GRID_POOL_TARGET', os.environ.get('GRID_POOL_TARGET'))
+    pool_target = int(pool_target) if pool_target not in (None, '') else 0
+    if app.dela_trie is not None and pool_target > 0:
+        dela_trie = app.dela_trie
+        refill_budget_ms = app.generation_jobs.time_budget_ms
+        app.grid_pool = GridPool(
+            lambda width, height, cancel_token: generate_pool_grid(dela_trie, width, height, refill_budget_ms,
+                                                                   cancel_token),
+            sizes=template_sizes(),
+            lexicon_version=app.dela_version,
+            target=pool_target,
+            idle_ms=float(app.config.get('GRID_POOL_IDLE_MS', DEFAULT_POOL_IDLE_MS)),
+            backoff_ms=float(app.config.get('GRID_POOL_BACKOFF_MS', DEFAULT_POOL_BACKOFF_MS)),
+        )
+        app.grid_pool.start()
+    # NOUVEAU : Cache des grilles reproductibles (seed), persisté en base si RESULT_CACHE_PERSIST
+    app.result_cache = ResultCache(
+        max_entries=int(app.config.get('RESULT_CACHE_SIZE', DEFAULT_RESULT_CACHE_SIZE)),
+        persist=str(app.config.get('RESULT_CACHE_PERSIST', os.environ.get('RESULT_CACHE_PERSIST', ''))).lower()
+        in ('1', 'true', 'yes'),
+    )
+    # NOUVEAU : Lexiques et gabarits compilés de /grids/regenerate, réutilisés d'un appel à l'autre
+    app.regeneration_lexicons = CompiledCache(
+        int(app.config.get('REGENERATION_LEXICON_CACHE_SIZE', DEFAULT_LEXICON_CACHE_SIZE)))
+    app.regeneration_templates = CompiledCache(DEFAULT_TEMPLATE_CACHE_SIZE)
+
     with app.app_context():
         try:
             db.create_all()
             logging.info("Tables de la BDD vérifiées/créées.")
+            # Jobs laissés en cours par un processus arrêté, jobs terminés expirés
+            app.generation_jobs.sweep()
         except Exception as e:
             logging.critical(f"Échec de la création des tables BDD: {e}")
 
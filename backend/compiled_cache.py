@@ -0,0 +1,43 @@
+# DANS backend/compiled_cache.py
+
+import threading
+from collections import OrderedDict
+
+DEFAULT_LEXICON_CACHE_SIZE = 4     # Lexiques compilés (mots + Trie) gardés (config : REGENERATION_LEXICON_CACHE_SIZE)
+DEFAULT_TEMPLATE_CACHE_SIZE = 64   # Gabarits compilés (GridTemplate + slots) gardés
+
+
+class CompiledCache:
+    """
+    LRU borné de structures compilées, réutilisées d'une requête à l'autre
+    par /grids/regenerate : lexiques (liste de mots + Trie) et gabarits
+    (GridTemplate + SlotFinder). Les valeurs sont partagées entre les threads
+    du serveur et ne doivent donc plus être modifiées une fois construites.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # clé -> valeur, de la plus ancienne à la plus récente
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'evicted': 0}
+
+    def get_or_build(self, key, build):
+        """Valeur gardée sous `key`, ou construite par build() (hors verrou) puis gardée."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.stats['hits'] += 1
+                return self._entries[key]
+            self.stats['misses'] += 1
+        value = build()
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats['evicted'] += 1
+        return value
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
@@ -0,0 +1,179 @@
+# DANS backend/engine/beam_solver.py
+
+import logging
+import math
+import time
+
+from engine.grid_solver import GridSolver
+
+
+class BeamSolver(GridSolver):
+    """
+    Moteur de remplissage par beam search : alternative rapide (mais incomplète)
+    au backtracking exhaustif de GridSolver, même interface (solve,
+    placed_words, get_solve_statistics, status).
+
+    La recherche avance par niveaux : à chaque niveau, chacune des
+    `beam_width` meilleures affectations partielles choisit son slot le plus
+    contraint (MRV) et propose tous ses candidats valides (fragments croisés
+    + forward checking simple). Seules les `beam_width` meilleures affectations
+    filles sont conservées. Aucune preuve d'impasse n'est faite : si le
+    faisceau se vide, la résolution échoue.
+
+    Classement d'une affectation : somme, sur ses mots, de
+    SCORE_WEIGHT * log(1 + score du mot) et du logarithme de la part des
+    candidats que le mot laisse à chacun de ses croisements encore ouverts
+    (log(après / avant) <= 0) : les bons mots qui étranglent le moins la
+    suite de la grille passent en tête. Un léger bruit (RANK_JITTER) varie
+    les grilles d'un seed à l'autre, comme le mélange du top 20% du backtracking.
+    """
+
+    DEFAULT_BEAM_WIDTH = 8
+    MAX_BEAM_WIDTH = 256
+    SCORE_WEIGHT = 1.0  # Poids du score des mots face à la taille des domaines restants
+    RANK_JITTER = 0.5   # Bruit aléatoire (log) ajouté à chaque mot : grilles variées d'un seed à l'autre
+
+    def __init__(self, template, repository, finder, beam_width: int = DEFAULT_BEAM_WIDTH):
+        super().__init__(template, repository, finder)
+        if not 1 <= beam_width <= self.MAX_BEAM_WIDTH:
+            raise ValueError(f"Largeur de faisceau invalide : {beam_width} (attendu : 1 à {self.MAX_BEAM_WIDTH})")
+        self.beam_width = beam_width
+        self.metrics.update({
+            'beam_levels': 0,            # Niveaux (profondeurs) parcourus
+            'beam_children': 0,          # Affectations filles valides proposées
+            'beam_dropped': 0,           # Affectations filles écartées par la largeur du faisceau
+        })
+
+    def solve(self, time_budget_ms: float | None = None, node_budget: int | None = None,
+              cancel_token=None, **options) -> bool:
+        """
+        Lance le beam search. Chaque affectation développée compte pour un nœud.
+
+        Args:
+            time_budget_ms (float | None): Durée maximale de la recherche.
+            node_budget (int | None): Nombre maximal d'affectations développées.
+                Budget épuisé : la meilleure grille partielle vue est restituée
+                et self.status vaut 'incomplete'.
+            cancel_token (CancellationToken | None): Annulation coopérative,
+                consultée avant chaque affectation développée (même issue).
+            **options: Options propres au backtracking (propagation,
+                backjumping, redémarrages...) : sans objet ici, ignorées.
+
+        Returns:
+            bool: True seulement si la grille est entièrement remplie.
+        """
+        logging.info(f"Début de la résolution de la grille (beam search, largeur {self.beam_width})...")
+        self._init_fc_threshold()
+        self._build_compatibility_tables()
+        self._set_value_order('score')
+        self._init_zobrist(False)
+        self.propagation = 'fc'
+        self.domains = None
+        self.start_time = time.time()
+        deadline = None if time_budget_ms is None else time.perf_counter() + time_budget_ms / 1000
+        self._stack = []
+        self.status = self.STATUS_RUNNING
+
+        try:
+            beam = [(0.0, ())]
+            while self.status == self.STATUS_RUNNING:
+                self.metrics['beam_levels'] += 1
+                children = {}
+                for rank, path in beam:
+                    if cancel_token is not None and cancel_token.cancelled:
+                        self.cancel_reason = cancel_token.reason
+                        logging.info(f"ANNULATION ({self.cancel_reason}) : restitution de la meilleure grille partielle.")
+                        self._finish(self.STATUS_INCOMPLETE)
+                        break
+                    if (node_budget is not None and self.metrics['recursive_calls'] >= node_budget) or \
+                            (deadline is not None and time.perf_counter() >= deadline):
+                        logging.info("BUDGET ÉPUISÉ : restitution de la meilleure grille partielle.")
+                        self._finish(self.STATUS_INCOMPLETE)
+                        break
+                    self._expand(rank, path, children)
+                    if self.status != self.STATUS_RUNNING:
+                        break
+                    self._unwind()
+                else:
+                    if not children:
+                        logging.info("ÉCHEC : le faisceau est vide.")
+                        self.status = self.STATUS_FAILED
+                        break
+                    ranked = sorted(children.values(), key=lambda child: child[0], reverse=True)
+                    beam = ranked[:self.beam_width]
+                    self.metrics['beam_dropped'] += len(ranked) - len(beam)
+            return self.status == self.STATUS_SOLVED
+        finally:
+            self._print_metrics()
+
+    def _expand(self, rank: float, path: tuple, children: dict):
+        """
+        Rejoue l'affectation `path` ((indice_slot, mot), ...) sur la grille puis
+        ajoute à `children` (clé : ensemble des affectations, les ordres
+        différents d'un même état étant fusionnés) chaque affectation fille
+        valide sur son slot le plus contraint. Sans slot ouvert, la grille est
+        résolue et la recherche s'arrête avec l'affectation en place.
+        """
+        self.metrics['recursive_calls'] += 1
+        if self.progress_callback is not None:
+            self._report_progress()
+        for slot_index, word in path:
+            slot = self.slots[slot_index]
+            original_state = self._place_word_on_grid(word, slot)
+            self._consume(slot, word)
+            self._stack.append({'slot': slot, 'placed': (word, self._score_word(word), original_state, None)})
+        self._record_partial()
+
+        slot = self._choose_next_slot()
+        if slot is None:
+            logging.info("SUCCÈS : Tous les slots ont été remplis.")
+            self._finish(self.STATUS_SOLVED)
+            return
+
+        candidates = self._filter_compatible(slot, self._get_candidates(slot, slot['pattern']))
+        scored_candidates = sorted(self._score_candidates(slot, candidates), key=lambda x: x[0], reverse=True)
+        crossing_counts = {}
+        for score, word in scored_candidates[:self.MAX_CANDIDATES_PER_SLOT]:
+            self.metrics['candidates_tested'] += 1
+            original_state = self._place_word_on_grid(word, slot)
+            if self._find_invalid_fragment(word, slot, original_state) is None \
+                    and self._completion_conflict(word, slot) is None:
+                self.metrics['fc_checks'] += 1
+                if self._find_starved_crossing(word, slot, original_state, crossing_counts) is None:
+                    child = path + ((slot['index'], word),)
+                    gain = self._child_gain(word, score, slot, original_state, crossing_counts)
+                    children.setdefault(frozenset(child), (rank + gain, child))
+                    self.metrics['beam_children'] += 1
+                else:
+                    self.metrics['fc_skips'] += 1
+            self._revert_grid_state(original_state, slot)
+
+    def _init_fc_threshold(self):
+        """
+        Forward checking simple (un candidat suffit) : le seuil strict
+        MIN_SAFE_CANDIDATES écarte des branches pour épargner des retours
+        arrière au backtracking ; sans retour arrière, il ne fait que retirer
+        au faisceau des affectations valides (faisceau vidé en fin de grille).
+        """
+        self._fc_threshold = 1
+
+    def _child_gain(self, word: str, score: int, slot: dict, original_state: bytes,
+                    crossing_counts: dict) -> float:
+        """
+        Apport du mot au classement : son score, et la part des candidats qu'il
+        laisse à chaque croisement dont il remplit la case (tables de lettres
+        relevées par le forward checking, sans nouvelle recherche de motif).
+        """
+        gain = self.SCORE_WEIGHT * math.log1p(score) + self.rng.uniform(0, self.RANK_JITTER)
+        for pos, crossing, _ in slot['crossings']:
+            counts = crossing_counts.get(crossing['index'])
+            if counts is None or crossing['is_filled'] or original_state[pos] != self._EMPTY_BYTE:
+                continue
+            gain += math.log(counts[word[pos]] / sum(counts.values()))
+        return gain
+
+    def _print_metrics(self):
+        m = self.metrics
+        logging.info(f"BEAM SEARCH (largeur {self.beam_width}) : {m['beam_levels']} niveaux, "
+                     f"{m['beam_children']} affectations proposées, {m['beam_dropped']} écartées")
+        super()._print_metrics()
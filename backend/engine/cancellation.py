@@ -0,0 +1,56 @@
+# DANS backend/engine/cancellation.py
+
+import threading
+import time
+
+
+class CancellationToken:
+    """
+    Jeton d'annulation coopérative d'une résolution, utilisable entre threads
+    (contrairement à SIGALRM, réservé au thread principal) : le solveur le
+    consulte tous les GridSolver.CANCEL_CHECK_NODES nœuds et s'arrête comme
+    à l'épuisement d'un budget (meilleure grille partielle restituée).
+
+    Déclenché par cancel() (client déconnecté, job annulé) ou par
+    l'échéance `deadline` (horloge time.monotonic()) : en-tête de délai du
+    client ou plafond du serveur.
+
+    `event` (optionnel) remplace l'Event interne : un multiprocessing.Event
+    partagé avec les processus d'un lot (GridGenerator.generate_batch) fait
+    suivre l'annulation aux workers.
+    """
+
+    REASON_CANCELLED = 'cancelled'
+    REASON_DISCONNECTED = 'disconnected'
+    REASON_DEADLINE = 'deadline'
+
+    def __init__(self, deadline: float | None = None, event=None):
+        self.deadline = deadline
+        self.reason = None
+        self._event = event if event is not None else threading.Event()
+
+    @classmethod
+    def with_timeout(cls, timeout_ms: float | None) -> 'CancellationToken':
+        """Jeton qui expire dans `timeout_ms` millisecondes (None : sans échéance)."""
+        return cls(None if timeout_ms is None else time.monotonic() + timeout_ms / 1000)
+
+    def cancel(self, reason: str = REASON_CANCELLED):
+        """Demande l'arrêt (la première raison est conservée)."""
+        if not self._event.is_set():
+            self.reason = reason
+            self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        if self._event.is_set():
+            return True
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            self.cancel(self.REASON_DEADLINE)
+            return True
+        return False
+
+    def remaining_ms(self) -> float | None:
+        """Temps restant avant l'échéance (None : sans échéance)."""
+        if self.deadline is None:
+            return None
+        return max(0.0, (self.deadline - time.monotonic()) * 1000)
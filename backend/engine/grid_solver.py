@@ -1,11 +1,16 @@
 # DANS backend/engine/grid_solver.py
 
+import heapq
 import logging
+import math
 import random
 import time
+from collections import Counter, OrderedDict
 
 from .grid_template import GridTemplate
+from .slot_domains import SlotDomains
 from .slot_finder import SlotFinder
+from .solver_trace import SolverTrace
 from .word_repository import WordRepository
 
 logger = logging.getLogger(__name__)
@@ -15,8 +20,36 @@ class GridSolver:
     # --- CONSTANTE ---
     MAX_CANDIDATES_PER_SLOT = 100  # Réduit pour accélérer le backtracking
     MIN_SAFE_CANDIDATES = 3  # Nombre minimum de candidats pour considérer un slot "sûr" (Forward Checking strict)
+    SHUFFLE_TOP_DIVISOR = 5  # Le top 1/5 (20%) des candidats est mélangé aléatoirement
+    GRID_ENCODING = 'cp1252'  # Encodage 1 octet/case de la grille à plat (couvre Œ, Æ...)
+    # Modes de propagation : 'fc' = forward checking strict, 'ac3' = arc-consistance sur domaines
+    PROPAGATION_MODES = ('fc', 'ac3')
+    MAX_LEARNED_NOGOODS = 5000  # Taille max du store de nogoods appris (éviction LRU)
+    MAX_NOGOOD_SIZE = 40  # Au-delà de ce nombre de cases, un nogood est trop spécifique pour être appris
+    MAX_TRANSPOSITIONS = 20000  # Taille max de la table de transposition des états en échec (LRU)
+    ZOBRIST_SEED = 0x5EED  # Générateur dédié : les clés ne consomment pas l'aléa global de la recherche
+    MAX_COMPONENT_FAILURES = 5000  # Taille max du cache des composantes indépendantes en échec (LRU)
+    MAX_FORCED_WORDS = 3  # Story B1 : l'utilisateur impose de 1 à 3 mots
+    MAX_FORCED_PLACEMENTS = 500  # Positions essayées au plus par la recherche de faisabilité des mots imposés
+    # États du moteur itératif (start / step)
+    STATUS_RUNNING, STATUS_SOLVED, STATUS_FAILED = 'running', 'solved', 'failed'
+    STATUS_INCOMPLETE = 'incomplete'  # Budget épuisé : meilleure grille partielle restituée
+    CHECKPOINT_VERSION = 1
+    PROGRESS_INTERVAL_MS = 250  # Intervalle minimal entre deux rapports de progression (set_progress_callback)
+    CANCEL_CHECK_NODES = 32  # Le jeton d'annulation (CancellationToken) est consulté tous les N nœuds
+    # Redémarrages aléatoires : 'luby' (1,1,2,1,1,2,4,...) ou 'geometric' (x FACTOR à chaque fois)
+    RESTART_POLICIES = ('luby', 'geometric')
+    RESTART_UNIT = 50  # Échecs (backtracks + backjumps) autorisés par unité de la suite
+    RESTART_GEOMETRIC_FACTOR = 1.5
+    # Ordre des valeurs : 'score' = LETTER_SCORES, 'lcv' = least-constraining-value (fréquences positionnelles)
+    VALUE_ORDERS = ('score', 'lcv')
     # ---------------------------------------------
 
+    # Table de traduction octets -> motif : case vide / noire -> '?'
+    _PATTERN_TABLE = bytes.maketrans(b'.# ', b'???')
+    _EMPTY_BYTE = ord(GridTemplate.EMPTY_CELL)
+    _BLACK_BYTE = ord(GridTemplate.BLACK_SQUARE)
+
     LETTER_SCORES = {
         # ... (scores inchangés)
         'A': 9, 'B': 2, 'C': 2, 'D': 3, 'E': 13, 'F': 1, 'G': 1, 'H': 1,
@@ -31,47 +64,216 @@ class GridSolver:
         
         # IMPORTANT: Initialisation des slots avec 'is_filled' pour l'heuristique MRV
         self.slots = []
-        for slot in finder.slots:
+        for index, slot in enumerate(finder.slots):
             new_slot = slot.copy()
             new_slot['is_filled'] = False 
+            new_slot['index'] = index  # Position dans self.slots (départage MRV)
+            new_slot['completed_by'] = None  # Slot dont le placement l'a complété (mot consommé implicitement)
             self.slots.append(new_slot)
             
-        self.grid = [row[:] for row in template.grid]
         self.height = template.height
         self.width = template.width
+        # OPTIMISATION : Grille à plat (un octet par case, offset = y * width + x)
+        # Les motifs et placements deviennent de simples opérations de slice.
+        self.cells = bytearray(
+            ''.join(''.join(row) for row in template.grid), self.GRID_ENCODING
+        )
         self.placed_words = []
         
-        # NOUVEAU : Système de nogoods pour éviter les boucles
-        # Format: {slot_id: {pattern1, pattern2, ...}}
-        # Enregistre les patterns qui ont échoué pour chaque slot
-        self.nogoods = {}
+        # NOUVEAU : Nogoods appris (backjumping dirigé par les conflits)
+        # Format: {nogood_id: ((slot_index, position, lettre), ...)} en ordre LRU
+        # Un nogood = combinaison de lettres dans la grille déjà prouvée sans issue
+        self.nogoods = OrderedDict()
+        self._nogood_cells = {}    # nogood_id -> ((offset, octet), ...) (forme interne)
+        self._nogood_watch = {}    # (offset, octet) -> {nogood_id, ...}
+        self._next_nogood_id = 0
+        self._last_conflict = set()  # Explication (offsets) du dernier échec d'un nœud
+        self._last_complete = True   # Explication complète (voir _fail) : seule apprise comme nogood
+        self.trace = None  # SolverTrace (opt-in, voir enable_trace)
+        self.progress_callback = None  # Rapports de progression (opt-in, voir set_progress_callback)
+        self._progress_interval = self.PROGRESS_INTERVAL_MS / 1000
+        self._next_progress = 0.0
+        self.start_time = None
+        self.cancel_reason = None  # Raison de l'arrêt par un CancellationToken ('deadline', 'disconnected'...)
+        self.rng = random  # Aléa du mélange des candidats (GridGenerator : random.Random(seed) propre à la grille)
+        self._shared_nogood_ids = set()  # Nogoods préchargés depuis un NogoodStore (voir preload_nogoods)
+        self.backjumping = True
         
         # OPTIMISATION : Pré-calculer les intersections entre slots
         self._precompute_intersections()
+        # OPTIMISATION : Pré-calculer les offsets de chaque slot dans la grille à plat
+        self._precompute_slot_offsets()
+
+        # OPTIMISATION : File de priorité MRV avec suivi des slots "sales"
+        self.slots_by_length = {}
+        for slot in self.slots:
+            self.slots_by_length.setdefault(slot['length'], []).append(slot)
+        self._mrv_heap = []                            # [(score, index, version), ...]
+        self._mrv_versions = [0] * len(self.slots)     # Invalide les entrées périmées
+        self._dirty_slots = set(range(len(self.slots)))
+        # Slots ouverts (non remplis) par longueur, tenus à jour par _set_filled
+        self._reset_open_slots()
+
+        # Propagation (choisie à chaque solve) : domaines explicites en mode 'ac3'
+        self.propagation = 'fc'
+        self.domains = None
+
+        # NOUVEAU : Moteur itératif - pile de décisions explicite (voir start/step)
+        self._stack = []
+        self.status = None
+
+        # NOUVEAU : Politique de redémarrage (choisie à chaque start)
+        self.restart_policy = None
+        self.keep_nogoods = True
+        self._restart_index = 0      # Nombre de redémarrages effectués
+        self._restart_base = 0       # Échecs comptés au dernier (re)démarrage
+
+        # NOUVEAU : Meilleure affectation partielle vue (résultat "anytime" si budget épuisé)
+        # Format: {'key': (cases_remplies, slots_complets), 'cells': bytes, 'placed_words': [...]}
+        self.best_partial = None
+        self._black_count = self.cells.count(self._BLACK_BYTE)
+
+        # NOUVEAU : Ordre des valeurs (choisi à chaque start) et tables de fréquences pour 'lcv'
+        self.value_order = 'score'
+        self._letter_log_freq = None  # longueur -> [ {lettre: log(1 + nb_mots)}, ... ] par position
+
+        # NOUVEAU : Tables de compatibilité des croisements (construites à chaque start)
+        self._letter_counts = None        # longueur -> [ {lettre: nb_mots}, ... ] par position
+        self._compatible_letters = None   # longueur -> [ lettres présentes assez souvent pour le FC strict ]
+
+        # NOUVEAU : Hachage de Zobrist de l'état (grille + slots remplis) et table de transposition
+        # Format: {hash_état: frozenset(offsets expliquant l'échec)} en ordre LRU
+        self.transpositions = OrderedDict()
+        self._zobrist = None        # offset -> [clé 64 bits par octet] (None = désactivé)
+        self._slot_keys = None      # index de slot -> clé 64 bits (slot rempli = mot consommé)
+        self.grid_hash = 0          # XOR des clés (case, lettre) de la grille
+        self._filled_hash = 0       # XOR des clés des slots remplis (contexte de disponibilité)
+
+        # NOUVEAU : Décomposition en sous-problèmes indépendants (choisie à chaque start)
+        # Format: {(slots de la composante, slots remplis, lettres du contexte): offsets expliquant l'échec} en ordre LRU
+        self.decompose = False
+        self.component_failures = OrderedDict()
+        self._mrv_scores = [0.0] * len(self.slots)  # Dernier score MRV de chaque slot ouvert
+
+        # NOUVEAU : Mots imposés, pré-placés avant la recherche (jamais remis en cause)
+        self.forced_words = []  # [(slot, mot), ...] dans l'ordre de placement
+        self._fc_threshold = None  # Seuil du FC strict de la recherche en cours (voir _init_fc_threshold)
+
+        # NOUVEAU : Cases verrouillées (régénération partielle), jamais modifiées par la recherche
+        self.locked_cells = {}  # offset -> octet de la lettre
+        self._locked_slots = frozenset()  # Indices des slots contenant une case verrouillée
         
         # MÉTRIQUES de performance
         self.metrics = {
             'candidates_tested': 0,      # Nombre total de mots testés
             'fc_skips': 0,               # Combien de mots éliminés par FC
             'fc_checks': 0,              # Combien de fois FC a été appelé
-            'recursive_calls': 0,        # Nombre d'appels récursifs
+            'recursive_calls': 0,        # Nombre de nœuds ouverts (ex-appels récursifs)
             'backtracks': 0,             # Nombre de backtracks
             'cache_hits': 0,             # Nombre de cache hits
             'cache_misses': 0,           # Nombre de cache misses
+            'mrv_rescores': 0,           # Scores MRV recalculés (slots sales)
+            'mrv_rescores_saved': 0,     # Scores MRV réutilisés (vs rescan complet)
+            'ac_revisions': 0,           # Révisions d'arcs (mode 'ac3')
+            'ac_pruned': 0,              # Mots retirés des domaines par AC-3
+            'ac_wipeouts': 0,            # Domaines vidés (dead-ends détectés par AC-3)
+            'backjumps': 0,              # Niveaux sautés par le backjumping (CBJ)
+            'nogoods_learned': 0,        # Nogoods appris
+            'nogood_hits': 0,            # Candidats rejetés par un nogood appris
+            'nogoods_evicted': 0,        # Nogoods évincés (LRU)
+            'shared_nogoods_loaded': 0,  # Nogoods préchargés depuis le store partagé (résolutions précédentes)
+            'shared_nogood_hits': 0,     # Candidats rejetés par un nogood préchargé
+            'shared_nogoods_stored': 0,  # Nouveaux nogoods versés au store partagé après la résolution
+            'restarts': 0,               # Redémarrages (politique Luby / géométrique)
+            'best_partial_filled': 0,    # Cases remplies de la meilleure grille partielle
+            'tt_hits': 0,                # Candidats écartés par la table de transposition
+            'tt_stores': 0,              # États en échec mémorisés
+            'compat_rejections': 0,      # Candidats écartés par les tables de compatibilité
+            'component_splits': 0,       # Nœuds où les slots ouverts forment plusieurs composantes
+            'component_hits': 0,         # Composantes écartées d'office (échec déjà prouvé)
+            'component_stores': 0,       # Échecs de composantes mémorisés
+            'forced_placements': 0,      # Positions essayées pour les mots imposés
+            'forced_pruned': 0,          # Mots retirés du lexique par la propagation initiale (mots imposés)
+            'lexicon_before': 0,         # Mots disponibles avant le pré-élagage du lexique (prune_lexicon)
+            'lexicon_after': 0,          # Mots disponibles après le pré-élagage
         }
 
-    def solve(self) -> bool:
-        """Point d'entrée principal pour lancer la résolution (démarre la récursion MRV)."""
-        logging.info("Début de la résolution de la grille (Heuristique MRV)...")
-        self.start_time = time.time()
+    def solve(self, propagation: str = 'fc', backjumping: bool = True,
+              restarts: str | None = None, keep_nogoods: bool = True,
+              time_budget_ms: float | None = None, node_budget: int | None = None,
+              value_order: str = 'score', transpositions: bool = False,
+              decompose: bool = False, cancel_token=None) -> bool:
+        """
+        Point d'entrée principal pour lancer la résolution (recherche MRV menée à son terme).
+
+        Args:
+            propagation (str): 'fc' (forward checking strict, défaut) ou 'ac3'
+                (domaines explicites + arc-consistance après chaque placement).
+            backjumping (bool): Saute directement au slot responsable d'un échec
+                (CBJ) au lieu de revenir au slot précédent. Les nogoods sont
+                appris dans les deux cas.
+            restarts (str | None): Politique de redémarrage ('luby', 'geometric')
+                ou None (aucun). La recherche repart de zéro dès que le nombre
+                d'échecs dépasse la coupure courante, avec un nouveau mélange
+                des meilleurs candidats.
+            keep_nogoods (bool): Conserver les nogoods appris d'un redémarrage à l'autre.
+            time_budget_ms (float | None): Durée maximale de la recherche.
+            node_budget (int | None): Nombre maximal de nœuds ouverts.
+                Budget épuisé : la recherche s'arrête, la meilleure grille partielle
+                vue est restituée dans la grille et self.status vaut 'incomplete'.
+            value_order (str): Ordre des candidats : 'score' (LETTER_SCORES, défaut)
+                ou 'lcv' (d'abord les mots qui laissent le plus d'options aux croisements).
+            transpositions (bool): Mémorise les états (grille + mots consommés) en
+                échec pour écarter immédiatement un candidat qui y ramène. En
+                profondeur d'abord, deux branches diffèrent toujours d'au moins un
+                mot : les revisites exactes viennent des redémarrages (surtout
+                sans keep_nogoods), d'où l'option désactivée par défaut.
+            decompose (bool): Dès que les slots ouverts forment plusieurs
+                composantes indépendantes (aucune case vide en commun), les
+                résout l'une après l'autre : l'échec d'une composante ne
+                revient pas sur les choix faits dans les autres, et son
+                contexte en échec est mémorisé pour ne pas la refaire.
+            cancel_token (CancellationToken | None): Annulation coopérative
+                (client déconnecté, échéance) consultée tous les
+                CANCEL_CHECK_NODES nœuds ; même issue qu'un budget épuisé,
+                raison relevée dans self.cancel_reason.
+
+        Returns:
+            bool: True seulement si la grille est entièrement remplie.
+        """
+        if propagation not in self.PROPAGATION_MODES:
+            raise ValueError(f"Mode de propagation inconnu : {propagation!r} (attendu : {self.PROPAGATION_MODES})")
+        logging.info(f"Début de la résolution de la grille (Heuristique MRV, propagation {propagation})...")
         
         try:
-            result = self._solve_recursive() # <-- SANS INDEX
-            return result
+            # Moteur itératif exécuté d'une traite (voir start/step pour la pause)
+            self.start(propagation, backjumping, restarts, keep_nogoods, value_order, transpositions, decompose)
+            if self.step(max_nodes=node_budget, max_ms=time_budget_ms, cancel_token=cancel_token) == self.STATUS_RUNNING:
+                if self.cancel_reason is not None:
+                    logging.info(f"ANNULATION ({self.cancel_reason}) : restitution de la meilleure grille partielle.")
+                else:
+                    logging.info("BUDGET ÉPUISÉ : restitution de la meilleure grille partielle.")
+                self._finish(self.STATUS_INCOMPLETE)
+            return self.status == self.STATUS_SOLVED
         finally:
+            self._sync_domain_metrics()
             # Afficher les métriques dans TOUS les cas (succès, échec, timeout)
             self._print_metrics()
     
+    @classmethod
+    def is_word_encodable(cls, word: str) -> bool:
+        """Vérifie qu'un mot tient dans la grille à plat (une lettre = un octet)."""
+        try:
+            return len(word.encode(cls.GRID_ENCODING)) == len(word)
+        except UnicodeEncodeError:
+            return False
+
+    @property
+    def grid(self) -> list[list[str]]:
+        """Vue 2D (liste de lignes) de la grille à plat, pour l'export et le débogage."""
+        text = self.cells.decode(self.GRID_ENCODING)
+        return [list(text[y * self.width:(y + 1) * self.width]) for y in range(self.height)]
+
     def _choose_next_slot(self) -> dict | None:
         """
         Choisit dynamiquement le prochain slot à traiter avec l'heuristique MRV AMÉLIORÉE.
@@ -82,401 +284,1455 @@ class GridSolver:
         - Moins il y a de candidats, plus le slot est contraint (prioritaire)
         - Plus il y a d'intersections, plus le slot contraint les autres (prioritaire)
         
-        On choisit le slot avec le SCORE LE PLUS BAS.
+        On choisit le slot avec le SCORE LE PLUS BAS (à égalité, le premier dans self.slots).
+
+        OPTIMISATION : Les scores sont conservés dans une file de priorité.
+        Seuls les slots marqués "sales" (croisant le dernier mot placé/retiré,
+        ou dont la disponibilité a changé) sont recalculés.
         """
-        best_slot = None
-        best_score = float('inf')
+        if self.domains is not None:
+            # En mode 'ac3', les slots dont la propagation a modifié le domaine sont sales aussi
+            self._dirty_slots.update(self.domains.changed)
+            self.domains.changed.clear()
 
-        for slot in self.slots:
-            # Ignorer les slots déjà remplis
-            if slot.get('is_filled', False):
-                continue
-                
-            pattern = self._get_slot_pattern(slot)
-            nb_unknowns = pattern.count('?')
-            
-            # Si complètement rempli par croisements, ignorer
-            if nb_unknowns == 0:
+        rescored = 0
+        for index in self._dirty_slots:
+            slot = self.slots[index]
+            # Toute entrée précédente de ce slot devient périmée
+            self._mrv_versions[index] += 1
+
+            # Ignorer les slots déjà remplis, ou complètement remplis par croisements
+            if slot['is_filled'] or slot['unknowns'] == 0:
                 continue
 
-            # Récupérer le nombre de candidats pour ce pattern
-            candidates = self.repository.get_candidates(pattern)
-            nb_candidates = len(candidates) if candidates else 0
-            
-            # Si aucun candidat, ce slot est un dead-end immédiat
-            # (sera géré par _solve_recursive qui fera backtrack)
-            if nb_candidates == 0:
-                # Slot impossible : on le choisit pour déclencher le backtrack immédiatement
-                return slot
-            
-            # Compter le nombre d'intersections de ce slot
-            nb_intersections = 0
-            for pos_idx in range(slot['length']):
-                if slot['direction'] == 'across':
-                    x = slot['x'] + pos_idx
-                    y = slot['y']
-                else:
-                    x = slot['x']
-                    y = slot['y'] + pos_idx
-                
-                # Vérifier s'il y a un slot qui croise à cette position
-                if self._find_intersecting_slot_fast(x, y, slot['direction']):
-                    nb_intersections += 1
-            
+            # Récupérer le nombre de candidats pour ce slot
+            # (si aucun candidat, le score 0 le fera choisir pour déclencher le backtrack)
+            nb_candidates = self._count_candidates(slot)
+
             # Calculer le score : on veut MINIMISER ce score
             # Plus de candidats = mauvais (moins contraint)
             # Plus d'intersections = bon (plus contraignant pour les autres)
-            score = nb_candidates / (1 + nb_intersections)
-            
-            # Choisir le slot avec le score le plus bas
-            if score < best_score:
-                best_score = score
-                best_slot = slot
-        
-        return best_slot
-        
-    def _solve_recursive(self) -> bool:
+            score = nb_candidates / (1 + slot['nb_intersections'])
+            self._mrv_scores[index] = score
+            heapq.heappush(self._mrv_heap, (score, index, self._mrv_versions[index]))
+            rescored += 1
+        self._dirty_slots.clear()
+
+        # Retirer les entrées périmées au sommet de la file
+        heap = self._mrv_heap
+        while heap and heap[0][2] != self._mrv_versions[heap[0][1]]:
+            heapq.heappop(heap)
+
+        # Un rescan complet aurait recalculé tous les slots ouverts
+        self.metrics['mrv_rescores'] += rescored
+        self.metrics['mrv_rescores_saved'] += self._open_count - rescored
+
+        return self.slots[heap[0][1]] if heap else None
+
+    def _mark_dirty_slots(self, slot: dict, word: str):
+        """
+        Marque comme "sales" les slots dont le score MRV a pu changer après
+        la consommation (ou la restitution) de `word` dans `slot` :
+        - le slot lui-même et les slots qui le croisent (motif modifié) ;
+        - les slots ouverts de même longueur dont `word` est candidat (disponibilité modifiée).
+        """
+        dirty = self._dirty_slots
+        dirty.add(slot['index'])
+        for _, crossing, _ in slot['crossings']:
+            dirty.add(crossing['index'])
+        for index in self._open_by_length[slot['length']]:
+            if index in dirty:
+                continue
+            other = self.slots[index]
+            if other['unknowns'] == other['length'] \
+                    or all(p == '?' or p == c for p, c in zip(other['pattern'], word)):
+                dirty.add(index)
+
+    def _reset_open_slots(self):
+        """Recalcule les slots ouverts par longueur et leur nombre (état des slots modifié en bloc)."""
+        self._open_by_length = {
+            length: {slot['index'] for slot in slots if not slot['is_filled']}
+            for length, slots in self.slots_by_length.items()
+        }
+        self._open_count = sum(len(indices) for indices in self._open_by_length.values())
+
+    def _mark_all_slots_dirty(self):
+        """Force le recalcul de tous les scores MRV (ex : état de la grille modifié en bloc)."""
+        self._dirty_slots.update(range(len(self.slots)))
+
+    # ===================================================================
+    # NOUVEAU : Moteur itératif (pile de décisions explicite)
+    # ===================================================================
+
+    def start(self, propagation: str = 'fc', backjumping: bool = True,
+              restarts: str | None = None, keep_nogoods: bool = True, value_order: str = 'score',
+              transpositions: bool = False, decompose: bool = False):
+        """
+        Prépare une résolution pas-à-pas : la recherche avance ensuite par
+        appels successifs à step() et peut être mise en pause entre deux appels.
+        Les options sont celles de solve().
         """
-        Implémente l'algorithme de backtracking. Utilise _choose_next_slot() (MRV).
+        if propagation not in self.PROPAGATION_MODES:
+            raise ValueError(f"Mode de propagation inconnu : {propagation!r} (attendu : {self.PROPAGATION_MODES})")
+        if restarts is not None and restarts not in self.RESTART_POLICIES:
+            raise ValueError(f"Politique de redémarrage inconnue : {restarts!r} (attendu : {self.RESTART_POLICIES})")
+        self._init_fc_threshold()
+        self._build_compatibility_tables()
+        self._set_value_order(value_order)
+        self._init_zobrist(transpositions)
+        self.propagation = propagation
+        self.backjumping = backjumping
+        self.restart_policy = restarts
+        self.keep_nogoods = keep_nogoods
+        self.decompose = decompose
+        self._restart_index = 0
+        self._restart_base = self._failure_count()
+        self.start_time = time.time()
+        self._stack = []
+        self.status = self.STATUS_RUNNING
+        if propagation == 'ac3' and not self._init_domains():
+            self.status = self.STATUS_FAILED
+            return
+        self._open_frame()
+
+    def step(self, max_nodes: int | None = None, max_ms: float | None = None, cancel_token=None) -> str:
+        """
+        Fait avancer la recherche jusqu'à sa fin, ou jusqu'à ce que `max_nodes`
+        nœuds aient été ouverts, que `max_ms` millisecondes se soient écoulées
+        ou que `cancel_token` soit annulé (raison dans self.cancel_reason).
+
+        Returns:
+            str: self.status ('running' si la recherche est en pause,
+            'solved' ou 'failed' si elle est terminée).
+        """
+        if self.status != self.STATUS_RUNNING:
+            return self.status
+        node_limit = None if max_nodes is None else self.metrics['recursive_calls'] + max_nodes
+        deadline = None if max_ms is None else time.perf_counter() + max_ms / 1000
+        next_cancel_check = self.metrics['recursive_calls']
+
+        while self.status == self.STATUS_RUNNING:
+            if cancel_token is not None and self.metrics['recursive_calls'] >= next_cancel_check:
+                next_cancel_check = self.metrics['recursive_calls'] + self.CANCEL_CHECK_NODES
+                if cancel_token.cancelled:
+                    self.cancel_reason = cancel_token.reason
+                    break
+            self._advance()
+            if self.restart_policy is not None and self.status == self.STATUS_RUNNING \
+                    and self._failure_count() - self._restart_base >= self._restart_cutoff():
+                self._restart()
+            if node_limit is not None and self.metrics['recursive_calls'] >= node_limit:
+                break
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+        return self.status
+
+    def _open_frame(self):
+        """
+        Ouvre un nœud de recherche (équivalent d'un appel récursif) : choisit
+        le slot le plus contraint (MRV) et empile ses candidats ordonnés.
+        Sans slot ouvert, la grille est résolue ; sans candidat, l'échec est
+        enregistré dans self._last_conflict et traité par le nœud parent.
         """
         self.metrics['recursive_calls'] += 1
-        
+        if self.progress_callback is not None:
+            self._report_progress()
+
         # 1. Choix dynamique du slot le plus contraint
         slot = self._choose_next_slot()
-        
+
         # 2. Condition d'arrêt (Succès : tous les slots sont remplis)
         if not slot:
             logging.info("SUCCÈS : Tous les slots ont été remplis.")
-            return True
+            if self.trace is not None:
+                self.trace.record(SolverTrace.SOLVED, SolverTrace.NO_SLOT, None, len(self._stack))
+            self._finish(self.STATUS_SOLVED)
+            return
 
-        pattern = self._get_slot_pattern(slot)
-        slot_id = slot.get('id', id(slot))
-        
-        logging.info(f"[Slot {slot.get('id', '?')}] {slot['direction']}, L={slot['length']}, Pattern='{pattern}'")
+        # NOUVEAU : Sous-problèmes indépendants - on termine la composante en cours avant d'en ouvrir une autre
+        component = component_key = None
+        is_new = False
+        if self.decompose:
+            component, is_new = self._focus_component(slot)
+            slot = self.slots[min(component, key=lambda index: (self._mrv_scores[index], index))]
+            if is_new:
+                component_key = self._component_key(component)
+                reason = self.component_failures.get(component_key[0])
+                if reason is not None:
+                    if self.trace is not None:
+                        self.trace.record(SolverTrace.FAIL, slot['index'], None, len(self._stack) + 1)
+                    self.component_failures.move_to_end(component_key[0])
+                    self.metrics['component_hits'] += 1
+                    self._last_conflict = set(reason)
+                    self._last_complete = True
+                    self._propagate_failure()
+                    return
+            else:
+                component_key = self._stack[-1]['component_key']
 
-        # NOUVEAU : Vérifier si ce pattern est un nogood connu
-        if self._is_nogood_pattern(slot_id, pattern):
-            logging.debug(f"  Pattern '{pattern}' est un nogood connu, backtrack immédiat !")
-            return False
+        pattern = self._get_slot_pattern(slot)
+        # OPTIMISATION : Plus de log par nœud (f-string évaluée même filtrée) ; trace binaire opt-in
+        if self.trace is not None:
+            self.trace.record(SolverTrace.NODE, slot['index'], None, len(self._stack) + 1)
 
         # 3. Récupération des candidats possibles
-        candidates = self.repository.get_candidates(pattern)
+        # (pré-filtrés lettre par lettre contre les tables de compatibilité des croisements)
+        all_candidates = self._get_candidates(slot, pattern)
+        candidates = self._filter_compatible(slot, all_candidates)
         if not candidates:
-            logging.debug(f"  Aucun candidat pour ce slot, backtrack !")
-            # NOUVEAU : Enregistrer ce pattern comme nogood (aucun mot n'existe dans le dico)
-            self._record_nogood(slot_id, pattern)
-            return False
-        
+            if self.trace is not None:
+                self.trace.record(SolverTrace.FAIL, slot['index'], None, len(self._stack) + 1)
+            self._fail(self._pattern_conflict(slot), self._compat_filter_exact(slot, all_candidates, candidates))
+            self._propagate_failure()
+            return
+
         # Tri des candidats par score (heuristique) - les meilleurs en premier
-        scored_candidates = [(self._score_word(w), w) for w in candidates]
+        scored_candidates = self._score_candidates(slot, candidates)
         scored_candidates.sort(key=lambda x: x[0], reverse=True)
 
         # Limiter le nombre de candidats pour accélérer le backtracking
+        # (les candidats coupés ne sont jamais essayés : l'échec du nœud n'est plus une preuve)
+        complete = len(scored_candidates) <= self.MAX_CANDIDATES_PER_SLOT \
+            and self._compat_filter_exact(slot, all_candidates, candidates)
         scored_candidates = scored_candidates[:self.MAX_CANDIDATES_PER_SLOT]
-        
+
         # OPTIMISATION : Ajouter un peu d'aléatoire uniquement dans le top 20%
-        # pour éviter de toujours essayer les mêmes mots en premier
-        top_20_percent = max(1, len(scored_candidates) // 5)
+        # (1 / SHUFFLE_TOP_DIVISOR) pour éviter de toujours essayer les mêmes mots en premier
+        top_20_percent = max(1, len(scored_candidates) // self.SHUFFLE_TOP_DIVISOR)
         if top_20_percent > 1:
             top_candidates = scored_candidates[:top_20_percent]
-            random.shuffle(top_candidates)
+            self.rng.shuffle(top_candidates)
             scored_candidates = top_candidates + scored_candidates[top_20_percent:]
+        self._push_frame(slot, scored_candidates, self._pattern_conflict(slot), complete=complete,
+                         component=component, component_key=component_key, component_root=is_new)
+
+    def _push_frame(self, slot: dict, scored_candidates: list, conflict: set[int], next_index: int = 0,
+                    component: frozenset | None = None, component_key: tuple | None = None,
+                    component_root: bool = False, complete: bool = True):
+        """
+        Empile un nœud. Ensemble de conflits du slot : cases qui expliquent les
+        mots écartés (au départ, ses lettres déjà posées et les mots déjà consommés).
+        `complete` : faux dès qu'un rejet ne s'explique pas par ces cases
+        (seuil heuristique, candidats coupés) ; voir _fail.
+        Mode decompose : `component` est la composante indépendante en cours,
+        `component_key` sa (clé, cases du contexte) relevée à son ouverture,
+        `component_root` vrai pour le premier nœud de la composante.
+        """
+        self._stack.append({
+            'slot': slot,
+            'candidates': scored_candidates,
+            'next': next_index,
+            'conflict': conflict,
+            'complete': complete,
+            # Cases que ce slot remplit lui-même (celles dont il est "responsable")
+            'new_cells': {offset for offset, char in zip(slot['offsets'], slot['pattern']) if char == '?'},
+            'placed': None,  # (mot, score, original_state, domain_mark) du candidat en cours
+            # Index de slot croisé -> {lettre: nb de candidats} à la case de croisement (forward checking)
+            'crossing_counts': {},
+            'component': component,
+            'component_key': component_key,
+            'component_root': component_root,
+        })
+
+    def _advance(self):
+        """
+        Une étape de la recherche sur le nœud au sommet de la pile :
+        traite l'échec du sous-arbre du candidat en cours (backtrack ou
+        backjump CBJ), puis essaie les candidats suivants jusqu'à en placer
+        un (ouverture d'un nœud enfant) ou à les épuiser (échec du nœud).
+
+        NOUVEAU : Backjumping dirigé par les conflits (CBJ).
+        Chaque échec est expliqué par un ensemble de cases (offsets) dont les
+        lettres actuelles suffisent à le provoquer (self._last_conflict).
+        Si aucune de ces cases n'a été remplie par le slot courant, changer de
+        mot ici ne peut rien résoudre : on remonte directement (backjump).
+        """
+        frame = self._stack[-1]
+        slot = frame['slot']
+        new_cells = frame['new_cells']
+        conflict = frame['conflict']
 
-        logging.debug(f"   {len(scored_candidates)} candidats (limité à {self.MAX_CANDIDATES_PER_SLOT}, top 20% aléatoire).")
+        if frame['placed'] is not None:
+            # Le sous-arbre du candidat en cours a échoué
+            word, _, original_state, domain_mark = frame['placed']
+            frame['placed'] = None
+            self._unplace(slot, word, original_state, domain_mark)
+
+            child_conflict = self._last_conflict
+            if self.backjumping and not (child_conflict & new_cells):
+                # BACKJUMP : ce slot n'est pour rien dans l'échec, on remonte directement
+                self.metrics['backjumps'] += 1
+                if self.trace is not None:
+                    self.trace.record(SolverTrace.BACKJUMP, slot['index'], word, len(self._stack))
+                self._stack.pop()
+                self._record_component_failure(frame, child_conflict, self._last_complete)
+                self._propagate_failure()
+                return
+
+            # ÉCHEC RÉCURSIF (Backtrack)
+            self.metrics['backtracks'] += 1
+            conflict |= child_conflict - new_cells
+            frame['complete'] = frame['complete'] and self._last_complete
+            if self.trace is not None:
+                self.trace.record(SolverTrace.BACKTRACK, slot['index'], word, len(self._stack))
 
         # 4. Boucle de test des candidats
-        for i, (score, word) in enumerate(scored_candidates):
+        candidates = frame['candidates']
+        while frame['next'] < len(candidates):
+            i = frame['next']
+            score, word = candidates[i]
+            frame['next'] = i + 1
             self.metrics['candidates_tested'] += 1
-            
-            logging.debug(f"    Tentative {i+1}/{len(scored_candidates)} : mot '{word}' (Score: {score})")
 
             # Place le mot temporairement et sauvegarde l'état pour le revert
             original_state = self._place_word_on_grid(word, slot)
 
-            # NOUVEAU : Vérifier que ce mot ne crée pas de nogoods pour les slots intersectés
-            if self._would_create_nogoods(word, slot, original_state):
-                logging.debug(f"      -> Mot '{word}' créerait des nogoods connus, skip.")
-                self._revert_grid_state(original_state)
+            # NOUVEAU : État (grille + mots consommés) déjà prouvé en échec par un autre chemin
+            # (correspondance exacte en O(1), testée avant les nogoods qui généralisent)
+            reason = self._transposition_conflict(slot)
+            if reason is not None:
+                if self.trace is not None:
+                    self.trace.record(SolverTrace.REJECT_TT, slot['index'], word, len(self._stack))
+                conflict |= reason - new_cells
+                self._revert_grid_state(original_state, slot)
+                continue
+
+            # NOUVEAU : Vérifier que ce mot ne reconstitue pas un nogood appris
+            reason = self._matching_nogood_conflict(new_cells)
+            if reason is not None:
+                if self.trace is not None:
+                    self.trace.record(SolverTrace.REJECT_NOGOOD, slot['index'], word, len(self._stack))
+                conflict |= reason - new_cells
+                self._revert_grid_state(original_state, slot)
                 continue
 
             # --- MODIFICATION 1 : On passe original_state à la validation ---
-            if not self._is_placement_valid(word, slot, original_state):
-                self._revert_grid_state(original_state)
+            invalid_crossing = self._find_invalid_fragment(word, slot, original_state)
+            if invalid_crossing is not None:
+                if self.trace is not None:
+                    self.trace.record(SolverTrace.REJECT_FRAGMENT, slot['index'], word, len(self._stack))
+                conflict |= self._filled_cells(invalid_crossing) - new_cells
+                # Fragment partiel : d'autres placements pourraient l'allonger en un mot valide
+                frame['complete'] = frame['complete'] and not invalid_crossing['unknowns']
+                self._revert_grid_state(original_state, slot)
                 continue
-            
-            # FORWARD CHECKING : Vérifier que les slots intersectés auront encore des candidats
+
+            # NOUVEAU : Mots des slots croisés complétés par ce placement (consommés eux aussi)
+            reason = self._completion_conflict(word, slot)
+            if reason is not None:
+                if self.trace is not None:
+                    self.trace.record(SolverTrace.REJECT_FRAGMENT, slot['index'], word, len(self._stack))
+                conflict |= reason - new_cells
+                self._revert_grid_state(original_state, slot)
+                continue
+
+            # FORWARD CHECKING (ou AC-3) : Vérifier que les slots intersectés auront encore des candidats
             self.metrics['fc_checks'] += 1
-            if not self._forward_check(word, slot, original_state):
+            domain_mark = self.domains.mark() if self.domains is not None else None
+            rejection = self._propagation_conflict(word, slot, original_state, frame['crossing_counts'])
+            if rejection is not None:
                 self.metrics['fc_skips'] += 1
-                logging.debug(f"      -> Mot '{word}' échoue au FC (dead-end), skip.")
-                self._revert_grid_state(original_state)
+                if self.trace is not None:
+                    self.trace.record(SolverTrace.REJECT_FC, slot['index'], word, len(self._stack))
+                reason, complete = rejection
+                conflict |= reason - new_cells
+                frame['complete'] = frame['complete'] and complete
+                if domain_mark is not None:
+                    self.domains.undo(domain_mark)
+                self._revert_grid_state(original_state, slot)
                 continue
-            
+
             # Si on arrive ici, le mot est valide ET passe le forward checking
             # --- CONSOMMATION ---
-            slot['is_filled'] = True # Marque le slot comme rempli
-            self.repository.remove_word_from_available(word, slot['length']) 
-            logging.info(f"  → Place '{word}'")
-
-            if self._solve_recursive(): # Appel récursif SANS INDEX
-                # SUCCES
-                self.placed_words.insert(0, {
-                    "text": word, "x": slot['x'], "y": slot['y'],
-                    "direction": slot['direction'], "id": slot['id'],
-                    "score": score  # Ajouter le score pour l'historique
-                })
-                return True
+            self._consume(slot, word)
+            frame['placed'] = (word, score, original_state, domain_mark)
+            self._record_partial()
+            self._open_frame()
+            return
+
+        # 5. Échec de tous les candidats
+        if self.trace is not None:
+            self.trace.record(SolverTrace.FAIL, slot['index'], None, len(self._stack))
+        # L'échec est contextuel : on apprend la combinaison de lettres qui l'explique
+        self._stack.pop()
+        self._fail(conflict, frame['complete'])
+        self._record_component_failure(frame, conflict, frame['complete'])
+        self._propagate_failure()
+
+    def _consume(self, slot: dict, word: str):
+        """
+        Marque le slot comme rempli et retire le mot des mots disponibles, ainsi
+        que le mot de chaque slot croisé que ce placement complète : un mot
+        complété par ses croisements est consommé comme un mot placé, la
+        disponibilité des mots ne dépend ainsi que des lettres de la grille.
+        """
+        self._set_filled(slot, word, True)
+        for _, crossing, _ in slot['crossings']:
+            if not crossing['is_filled'] and not crossing['unknowns']:
+                crossing['completed_by'] = slot['index']
+                self._set_filled(crossing, crossing['pattern'], True)
+        if self.trace is not None:
+            self.trace.record(SolverTrace.PLACE, slot['index'], word, len(self._stack))
+
+    def _set_filled(self, slot: dict, word: str, filled: bool):
+        """Consomme (filled) ou restitue le mot d'un slot : disponibilité, hachage des slots remplis, MRV."""
+        if slot['is_filled'] != filled:
+            open_slots = self._open_by_length[slot['length']]
+            if filled:
+                open_slots.discard(slot['index'])
             else:
-                # ÉCHEC RÉCURSIF (Backtrack)
-                self.metrics['backtracks'] += 1
-                # CRITIQUE : Effacer les nogoods des slots intersectés car le contexte change
-                self._invalidate_dependent_nogoods(slot)
-                
-                # Annule la consommation du mot et marque le slot comme vide
-                self.repository.add_word_to_available(word, slot['length']) 
-                slot['is_filled'] = False 
-                logging.debug(f"      <- Retour arrière (Backtrack) pour '{word}'.")
-                
-                # --- REVERT DE LA GRILLE ---
-                self._revert_grid_state(original_state)
+                open_slots.add(slot['index'])
+            self._open_count += -1 if filled else 1
+        slot['is_filled'] = filled
+        if self._slot_keys is not None:
+            self._filled_hash ^= self._slot_keys[slot['index']]
+        if filled:
+            self.repository.remove_word_from_available(word, slot['length'])
+        else:
+            self.repository.add_word_to_available(word, slot['length'])
+        self._mark_dirty_slots(slot, word)
 
-        # 5. Échec de tous les candidats (aligné avec la boucle for)
-        logging.debug(f"  ÉCHEC : Tous les candidats ont échoué pour ce slot.")
-        # NE PAS enregistrer comme nogood ici : l'échec est contextuel, pas absolu
-        # Le pattern pourrait fonctionner avec un autre contexte (autres mots placés)
-        return False
+    def _unplace(self, slot: dict, word: str, original_state: bytes, domain_mark: int | None):
+        """Annule la consommation du mot, puis restaure la grille (et les domaines en mode 'ac3')."""
+        for _, crossing, _ in slot['crossings']:
+            if crossing['completed_by'] == slot['index']:
+                crossing['completed_by'] = None
+                self._set_filled(crossing, crossing['pattern'], False)
+        self._set_filled(slot, word, False)
+        if domain_mark is not None:
+            self.domains.undo(domain_mark)
+        self._revert_grid_state(original_state, slot)
 
-    def _check_grid_integrity(self):
+    def _unwind(self):
+        """Vide la pile de décisions en annulant tous les mots en cours (retour à la grille initiale)."""
+        for frame in reversed(self._stack):
+            if frame['placed'] is not None:
+                word, _, original_state, domain_mark = frame['placed']
+                self._unplace(frame['slot'], word, original_state, domain_mark)
+        self._stack = []
+
+    def _propagate_failure(self):
+        """Un nœud a échoué : la recherche entière échoue s'il s'agissait de la racine."""
+        if not self._stack:
+            self._finish(self.STATUS_FAILED)
+
+    def _finish(self, status: str):
         """
-        Vérifie si des lettres orphelines (non associées à un slot non rempli) existent.
-        ATTENTION : Très coûteux en performance, à utiliser pour le débogage seulement.
+        Termine la recherche. En cas de succès, relève les mots placés (ordre
+        de la pile) ; budget épuisé, restitue la meilleure grille partielle.
         """
-        
-        active_slots_indices = set()
+        self.status = status
+        if status == self.STATUS_SOLVED:
+            self.placed_words = self._stack_placed_words()
+        elif status == self.STATUS_INCOMPLETE:
+            self._apply_best_partial()
+
+    def _stack_placed_words(self) -> list[dict]:
+        """Mots imposés puis mots en cours dans la pile de décisions, de la racine au sommet."""
+        placed = [(slot, word, self._score_word(word)) for slot, word in self.forced_words]
+        placed += [(frame['slot'], frame['placed'][0], frame['placed'][1])
+                   for frame in self._stack if frame['placed'] is not None]
+        return [{
+            "text": word, "x": slot['x'], "y": slot['y'],
+            "direction": slot['direction'], "id": slot['id'],
+            "score": score  # Ajouter le score pour l'historique
+        } for slot, word, score in placed]
+
+    # ===================================================================
+    # NOUVEAU : Résultat "anytime" (meilleure grille partielle)
+    # ===================================================================
+
+    def _record_partial(self):
+        """
+        Mémorise l'affectation courante si elle est la meilleure vue jusqu'ici :
+        classement par cases remplies, puis par slots complets (tous les
+        croisements d'une affectation sont valides par construction).
+        """
+        filled = len(self.cells) - self.cells.count(self._EMPTY_BYTE) - self._black_count
+        best = self.best_partial
+        if best is not None and filled < best['key'][0]:
+            return
+        key = (filled, sum(1 for slot in self.slots if slot['unknowns'] == 0))
+        if best is None or key > best['key']:
+            self.best_partial = {'key': key, 'cells': bytes(self.cells), 'placed_words': self._stack_placed_words()}
+            self.metrics['best_partial_filled'] = filled
+
+    def _apply_best_partial(self):
+        """
+        Abandonne la branche courante et restitue la meilleure grille partielle
+        (cases, motifs des slots et mots placés). La recherche ne peut pas reprendre.
+        """
+        self._unwind()
+        if self.best_partial is None:
+            return
+        self.cells[:] = self.best_partial['cells']
+        self.placed_words = list(self.best_partial['placed_words'])
+        placed_ids = {word['id'] for word in self.placed_words}
         for slot in self.slots:
-            if not slot.get('is_filled', False):
-                active_slots_indices.add(slot.get('id', self.slots.index(slot))) 
+            slot['pattern'] = self._compute_slot_pattern(slot)
+            slot['unknowns'] = slot['pattern'].count('?')
+            slot['is_filled'] = slot['id'] in placed_ids
+        self._reset_open_slots()
+        if self._zobrist is not None:
+            self._init_zobrist(True)
 
-        for y in range(self.height):
-            for x in range(self.width):
-                cell = self.grid[y][x]
-                
-                if cell not in (self.template.BLACK_SQUARE, self.template.EMPTY_CELL, '', ' '):
-                    # Logique de vérification (non implémentée)
-                    pass
-        
-    def _get_slot_pattern(self, slot: dict) -> str:
+    # ===================================================================
+    # NOUVEAU : Progression en direct (flux SSE de la route /grids/generate/stream)
+    # ===================================================================
+
+    def set_progress_callback(self, callback, interval_ms: float = PROGRESS_INTERVAL_MS):
         """
-        Génère le motif du slot (ex : 'A??E?').
-        '?' représente une case vide.
+        Appelle callback(progress) au plus toutes les `interval_ms` pendant la
+        recherche (voir progress()). Sans callback, le chemin critique ne paie
+        qu'un test par nœud.
         """
-        pattern = []
-        placeholder = '?'
+        self.progress_callback = callback
+        self._progress_interval = interval_ms / 1000
+        self._next_progress = 0.0
 
-        logging.debug(f"   Génération du motif pour slot {slot.get('id', 'N/A')} ({slot['direction']}, L={slot['length']})")
+    def _report_progress(self):
+        now = time.perf_counter()
+        if now < self._next_progress:
+            return
+        self._next_progress = now + self._progress_interval
+        self.progress_callback(self.progress())
 
-        for i in range(slot['length']):
-            if slot['direction'] == 'across':
-                x = slot['x'] + i
-                y = slot['y']
-            else:  # down
-                x = slot['x']
-                y = slot['y'] + i
+    def progress(self) -> dict:
+        """Instantané de la recherche : slots remplis, profondeur, échecs, débit et grille partielle."""
+        m = self.metrics
+        elapsed = time.time() - self.start_time if self.start_time else 0.0
+        return {
+            'status': self.status,
+            'filled_slots': sum(1 for slot in self.slots if slot['is_filled']),
+            'total_slots': len(self.slots),
+            'depth': len(self._stack),
+            'nodes': m['recursive_calls'],
+            'backtracks': m['backtracks'],
+            'backjumps': m['backjumps'],
+            'nodes_per_s': round(m['recursive_calls'] / elapsed) if elapsed > 0 else 0,
+            'elapsed_ms': round(elapsed * 1000),
+            'best_partial_filled': m['best_partial_filled'],
+            'grid': [''.join(row) for row in self.grid],
+        }
+
+    # ===================================================================
+    # NOUVEAU : Redémarrages aléatoires (protection contre les queues lourdes)
+    # ===================================================================
+
+    @staticmethod
+    def luby(i: int) -> int:
+        """i-ème terme (i >= 1) de la suite de Luby : 1, 1, 2, 1, 1, 2, 4, 1, 1, 2, ..."""
+        while True:
+            k = i.bit_length()  # 2^(k-1) <= i < 2^k
+            if i == (1 << k) - 1:
+                return 1 << (k - 1)
+            # i est dans la répétition du préfixe : on se ramène à la position équivalente
+            i -= (1 << (k - 1)) - 1
+
+    def _failure_count(self) -> int:
+        """Échecs de sous-arbres depuis le début de la recherche."""
+        return self.metrics['backtracks'] + self.metrics['backjumps']
+
+    def _restart_cutoff(self) -> int:
+        """Nombre d'échecs autorisés avant le prochain redémarrage."""
+        if self.restart_policy == 'luby':
+            return self.luby(self._restart_index + 1) * self.RESTART_UNIT
+        return int(self.RESTART_UNIT * self.RESTART_GEOMETRIC_FACTOR ** self._restart_index)
+
+    def _restart(self):
+        """
+        Abandonne la branche courante (retour à la grille initiale) et rouvre
+        la racine : le mélange du top 20% des candidats est retiré au sort.
+        Les nogoods appris restent valables quel que soit le chemin de recherche,
+        ils sont donc conservés si self.keep_nogoods.
+        """
+        self._unwind()
+        if not self.keep_nogoods:
+            self.nogoods.clear()
+            self._nogood_cells.clear()
+            self._nogood_watch.clear()
+            self.component_failures.clear()
+        self._restart_index += 1
+        self._restart_base = self._failure_count()
+        self.metrics['restarts'] += 1
+        if self.trace is not None:
+            self.trace.record(SolverTrace.RESTART, SolverTrace.NO_SLOT, None, 0)
+        logging.info(f"REDÉMARRAGE #{self._restart_index} (prochaine coupure : {self._restart_cutoff()} échecs)")
+        self._open_frame()
+
+    # ===================================================================
+    # NOUVEAU : Checkpoints (pause / reprise dans un autre processus)
+    # ===================================================================
+
+    def checkpoint(self, include_nogoods: bool = True) -> dict:
+        """
+        Sérialise l'état de la recherche en un dictionnaire compact (JSON).
+
+        Seules les décisions sont conservées : pour chaque nœud de la pile,
+        le slot, le mot en cours, les candidats restant à essayer,
+        l'ensemble de conflits et la composante (mode decompose). La grille,
+        les mots consommés et les domaines sont reconstruits par rejeu à la
+        restauration. Les nogoods appris
+        (ordre LRU) sont inclus si `include_nogoods` : sans eux la reprise
+        reste correcte mais peut réexplorer des impasses déjà connues.
+        """
+        self._sync_domain_metrics()
+        return {
+            'version': self.CHECKPOINT_VERSION,
+            'propagation': self.propagation,
+            'backjumping': self.backjumping,
+            'value_order': self.value_order,
+            'transpositions': self._zobrist is not None,
+            'decompose': self.decompose,
+            'locked': [[offset, bytes([byte]).decode(self.GRID_ENCODING)] for offset, byte in self.locked_cells.items()],
+            'forced': [[slot['index'], word] for slot, word in self.forced_words],
+            'restarts': [self.restart_policy, self.keep_nogoods, self._restart_index, self._restart_base],
+            'status': self.status,
+            'last_conflict': sorted(self._last_conflict),
+            'last_complete': self._last_complete,
+            'metrics': dict(self.metrics),
+            'stack': [
+                [
+                    frame['slot']['index'],
+                    frame['placed'][0] if frame['placed'] is not None else None,
+                    [word for _, word in frame['candidates'][frame['next']:]],
+                    sorted(frame['conflict']),
+                    sorted(frame['component']) if frame['component'] is not None else None,
+                    frame['complete'],
+                ]
+                for frame in self._stack
+            ],
+            'nogoods': [list(map(list, literals)) for literals in self.nogoods.values()] if include_nogoods else [],
+        }
+
+    def restore(self, checkpoint: dict):
+        """
+        Reprend une recherche depuis checkpoint() sur un solveur neuf construit
+        avec le même gabarit et le même dictionnaire. Continuer ensuite avec step().
+        """
+        if checkpoint.get('version') != self.CHECKPOINT_VERSION:
+            raise ValueError(f"Version de checkpoint non supportée : {checkpoint.get('version')!r}")
+        if self.placed_words or any(slot['is_filled'] for slot in self.slots):
+            raise ValueError("Un checkpoint ne peut être restauré que sur un solveur neuf")
+
+        self.propagation = checkpoint['propagation']
+        self.backjumping = checkpoint['backjumping']
+        if checkpoint.get('locked'):
+            self._write_locked_letters({offset: letter.encode(self.GRID_ENCODING)[0]
+                                        for offset, letter in checkpoint['locked']})
+        for slot_index, word in checkpoint.get('forced', []):
+            self._place_forced_word(self.slots[slot_index], word)
+        if self.forced_words:
+            # Même lexique qu'à la pause : propagation initiale rejouée
+            domains = self._forced_domains(word for _, word in self.forced_words)
+            self._forced_domains_consistent(domains)
+            self._restrict_lexicon_to_domains(domains)
+        self._init_fc_threshold()
+        self._build_compatibility_tables()
+        self._set_value_order(checkpoint['value_order'])
+        self._init_zobrist(checkpoint['transpositions'])
+        self.decompose = checkpoint.get('decompose', False)
+        self.restart_policy, self.keep_nogoods, self._restart_index, self._restart_base = checkpoint['restarts']
+        self.start_time = time.time()
+        self.status = checkpoint['status']
+        self.metrics.update(checkpoint['metrics'])
+        self._last_conflict = set(checkpoint['last_conflict'])
+        self._last_complete = checkpoint.get('last_complete', False)
+        self._stack = []
+        if self.propagation == 'ac3':
+            self._init_domains()
+        for literals in checkpoint['nogoods']:
+            self._add_nogood(tuple(
+                (self.slots[slot_index]['offsets'][pos], letter.encode(self.GRID_ENCODING)[0])
+                for slot_index, pos, letter in literals
+            ))
 
-            if y >= self.height or x >= self.width:
-                logging.warning(f"    Coordonnées invalides ({x},{y}) hors grille (max {self.width-1},{self.height-1})")
+        # Rejeu des décisions : chaque mot en cours est replacé dans l'ordre de la pile
+        # (le cache des composantes en échec n'est pas sérialisé : il se reconstitue ;
+        # un nœud sans drapeau 'complete', checkpoint antérieur, est jugé incomplet)
+        for slot_index, word, remaining, conflict, *extra in checkpoint['stack']:
+            slot = self.slots[slot_index]
+            words = ([word] if word is not None else []) + remaining
+            component = frozenset(extra[0]) if extra and extra[0] is not None else None
+            self._push_frame(slot, self._score_candidates(slot, words), set(conflict),
+                             next_index=1 if word is not None else 0, component=component,
+                             complete=len(extra) > 1 and extra[1])
+            if word is None:
                 continue
-                
-            char = self.grid[y][x]
+            original_state = self._place_word_on_grid(word, slot)
+            domain_mark = None
+            if self.domains is not None:
+                domain_mark = self.domains.mark()
+                self._propagation_conflict(word, slot, original_state)  # Mots complétés compris
+            self._consume(slot, word)
+            self._stack[-1]['placed'] = (word, self._stack[-1]['candidates'][0][0], original_state, domain_mark)
 
-            if char in (self.template.BLACK_SQUARE, self.template.EMPTY_CELL,'', ' ', None):
-                pattern.append(placeholder)
-            else:
-                pattern.append(char)
+        if self.domains is not None:
+            # Les compteurs du rejeu ne comptent pas : on repart de ceux du checkpoint
+            self.domains.stats = {'revisions': self.metrics['ac_revisions'],
+                                  'pruned': self.metrics['ac_pruned'],
+                                  'wipeouts': self.metrics['ac_wipeouts']}
+        self._mark_all_slots_dirty()
+        if self.status == self.STATUS_SOLVED:
+            self._finish(self.STATUS_SOLVED)
+
+    def _count_candidates(self, slot: dict) -> int:
+        """Nombre de candidats du slot (taille du domaine en mode 'ac3')."""
+        if self.domains is not None:
+            return self.domains.size(slot['index'])
+        candidates = self.repository.get_candidates(self._get_slot_pattern(slot))
+        return len(candidates) if candidates else 0
+
+    def _get_candidates(self, slot: dict, pattern: str) -> list[str]:
+        """Candidats du slot : domaine courant en mode 'ac3', sinon recherche par motif."""
+        if self.domains is not None:
+            return self.domains.words(slot['index'])
+        return self.repository.get_candidates(pattern)
+
+    def _get_slot_pattern(self, slot: dict) -> str:
+        """
+        Renvoie le motif courant du slot (ex : 'A??E?').
+        '?' représente une case vide.
+        OPTIMISATION : Le motif est maintenu incrémentalement par
+        _place_word_on_grid / _revert_grid_state, aucune lecture de la grille ici.
+        """
+        return slot['pattern']
+
+    def _compute_slot_pattern(self, slot: dict) -> str:
+        """
+        Recalcule le motif du slot depuis la grille à plat
+        (un seul slice, pas de width pour les slots 'down', + translate).
+        Sert à l'initialisation et aux vérifications de cohérence.
+        """
+        return self.cells[slot['cells']].translate(self._PATTERN_TABLE).decode(self.GRID_ENCODING)
 
-        result = ''.join(pattern)
-        logging.debug(f"   → Motif généré : '{result}'")
-        return result
+    def _set_pattern_char(self, slot: dict, pos: int, char: str):
+        """Met à jour une lettre du motif maintenu d'un slot et son nombre d'inconnues."""
+        pattern = slot['pattern']
+        old_char = pattern[pos]
+        if old_char == char:
+            return
+        slot['pattern'] = pattern[:pos] + char + pattern[pos + 1:]
+        slot['unknowns'] += (char == '?') - (old_char == '?')
 
-    def _place_word_on_grid(self, word: str, slot: dict) -> list[tuple[int, int, str]]:
+    def _place_word_on_grid(self, word: str, slot: dict) -> bytes:
         """
-        Place un mot dans la grille et renvoie la liste des états précédents
-        pour chaque case modifiée (coordonnées + ancienne valeur).
+        Place un mot dans la grille et renvoie le contenu précédent des cases
+        du slot (un octet par lettre), à passer à _revert_grid_state.
+        Seuls les motifs du slot et des slots qui le croisent sont mis à jour.
         """
-        original_state = []
-        x, y, length, direction = slot['x'], slot['y'], slot['length'], slot['direction']
+        cells = slot['cells']
+        original_state = bytes(self.cells[cells])
+        new_state = word.encode(self.GRID_ENCODING)
+        self.cells[cells] = new_state
+        if self._zobrist is not None:
+            self._update_grid_hash(slot, original_state, new_state)
 
-        for i, char in enumerate(word):
-            px = x + i if direction == 'across' else x
-            py = y if direction == 'across' else y + i
-            original_state.append((px, py, self.grid[py][px]))
-            self.grid[py][px] = char
+        slot['pattern'] = word
+        slot['unknowns'] = 0
+        for pos, crossing, crossing_pos in slot['crossings']:
+            self._set_pattern_char(crossing, crossing_pos, word[pos])
         return original_state
 
-    def _revert_grid_state(self, original_state: list[tuple[int, int, str]], slot=None):
+    def _revert_grid_state(self, original_state: bytes, slot: dict):
         """
-        Restaure l’état précédent de la grille à partir de la liste d’états sauvegardés.
+        Restaure l’état précédent des cases du slot à partir des octets sauvegardés,
+        ainsi que les motifs du slot et des slots qui le croisent.
         """
-        for (x, y, old_char) in original_state:
-            self.grid[y][x] = old_char
+        if self._zobrist is not None:
+            self._update_grid_hash(slot, bytes(self.cells[slot['cells']]), original_state)
+        self.cells[slot['cells']] = original_state
+
+        pattern = original_state.translate(self._PATTERN_TABLE).decode(self.GRID_ENCODING)
+        slot['pattern'] = pattern
+        slot['unknowns'] = pattern.count('?')
+        for pos, crossing, crossing_pos in slot['crossings']:
+            self._set_pattern_char(crossing, crossing_pos, pattern[pos])
 
     # --- MODIFICATION 2 : MÉTHODE _is_placement_valid ENTIÈREMENT REMPLACÉE ---
-    def _is_placement_valid(self, word: str, slot: dict, original_state: list[tuple[int, int, str]]) -> bool:
+    def _is_placement_valid(self, word: str, slot: dict, original_state: bytes) -> bool:
         """
         Vérifie si le mot crée des fragments valides dans l'autre sens,
         en se basant sur les lettres qui ont réellement changé.
         """
-        
-        # On itère sur le mot zippé avec l'état original
-        # (px, py, old_char) vient de original_state
-        for i, (char, (px, py, old_char)) in enumerate(zip(word, original_state)):
-            
+        return self._find_invalid_fragment(word, slot, original_state) is None
+
+    def _find_invalid_fragment(self, word: str, slot: dict, original_state: bytes) -> dict | None:
+        """
+        Renvoie le slot croisé dont le fragment créé par le mot est invalide
+        (ou None si tous les fragments sont valides).
+        """
+        new_state = self.cells[slot['cells']]
+
+        for pos, crossing, crossing_pos in slot['crossings']:
             # Si la lettre n'a pas changé (ex: la case contenait déjà 'A'
             # et on place un mot avec 'A' au même endroit),
             # alors le fragment croisé est déjà valide. On ignore.
-            if old_char == char:
+            if original_state[pos] == new_state[pos]:
                 continue
 
             # Si la lettre a changé (ex: '?' -> 'A', ou 'B' -> 'A'),
             # on doit impérativement valider le fragment créé dans l'autre sens.
-            
-            fragment = ""
-            if slot['direction'] == 'across':
-                # Le mot est 'across', on vérifie le fragment 'down' (vertical)
-                fragment = self._get_vertical_fragment(px, py)
-            else:
-                # Le mot est 'down', on vérifie le fragment 'across' (horizontal)
-                fragment = self._get_horizontal_fragment(px, py)
+            fragment = self._get_crossing_fragment(crossing, crossing_pos)
 
             # Si le fragment a plus d'une lettre et n'est pas un mot valide...
-            if len(fragment) > 1 and not self.repository.is_word_valid(fragment):
-                logging.debug(f"      -> REJETÉ : Le mot '{word}' crée un fragment invalide : '{fragment}'")
-                return False # Rejeter ce candidat
-                
-        return True # Toutes les lettres ont créé des fragments valides
+            # (sauf slot à cases verrouillées : leurs lettres ne sont pas posées dans
+            # l'ordre de la recherche, le FC sur le motif complet suffit)
+            if len(fragment) > 1 and not self.repository.is_word_valid(fragment) \
+                    and crossing['index'] not in self._locked_slots:
+                return crossing # Rejeter ce candidat
+
+        # Les cases sans slot croisé forment des fragments d'une lettre : toujours valides
+        return None # Toutes les lettres ont créé des fragments valides
     # --- FIN DE LA MÉTHODE REMPLACÉE ---
 
-    def _get_vertical_fragment(self, x: int, y: int) -> str:
-        """Construit le mot vertical complet passant par (x,y)."""
-        fragment = ""
-        cy = y
-        # Remonte pour trouver le début du mot
-        while cy >= 0 and self.grid[cy][x] not in (self.template.BLACK_SQUARE, self.template.EMPTY_CELL, ' ', ''):
-            cy -= 1
-        cy += 1 # Revient à la première lettre
-        
-        # Descend pour construire le mot
-        while cy < self.height and self.grid[cy][x] not in (self.template.BLACK_SQUARE, self.template.EMPTY_CELL, ' ', ''):
-            fragment += self.grid[cy][x]
-            cy += 1
-        return fragment
-
-    def _get_horizontal_fragment(self, x: int, y: int) -> str:
-        """Construit le mot horizontal complet passant par (x,y)."""
-        fragment = ""
-        cx = x
-        # Recule pour trouver le début du mot
-        while cx >= 0 and self.grid[y][cx] not in (self.template.BLACK_SQUARE, self.template.EMPTY_CELL, ' ', ''):
-            cx -= 1
-        cx += 1 # Revient à la première lettre
-        
-        # Avance pour construire le mot
-        while cx < self.width and self.grid[y][cx] not in (self.template.BLACK_SQUARE, self.template.EMPTY_CELL, ' ', ''):
-            fragment += self.grid[y][cx]
-            cx += 1
-        return fragment
-    
+    def _get_crossing_fragment(self, slot: dict, pos: int) -> str:
+        """
+        Construit le fragment de lettres contiguës passant par la position `pos`
+        du slot. Le slot couvre exactement la séquence de cases non noires,
+        donc le fragment s'arrête à la première case vide de chaque côté.
+        """
+        segment = self.cells[slot['cells']]
+        start = segment.rfind(self._EMPTY_BYTE, 0, pos) + 1
+        end = segment.find(self._EMPTY_BYTE, pos)
+        if end == -1:
+            end = len(segment)
+        return segment[start:end].decode(self.GRID_ENCODING)
+
+    def _completion_conflict(self, word: str, slot: dict) -> set[int] | None:
+        """
+        NOUVEAU : Slots croisés que le mot placé complète (plus aucune case
+        vide). Leur mot sera consommé avec lui (voir _consume) : il doit être
+        encore disponible et distinct du mot placé comme des autres mots
+        complétés. Renvoie l'explication d'un doublon (cases des deux slots)
+        ou d'un mot hors du lexique disponible, sinon None.
+        """
+        completed = {word: slot}
+        for _, crossing, _ in slot['crossings']:
+            if crossing['is_filled'] or crossing['unknowns']:
+                continue
+            completed_word = crossing['pattern']
+            owner = completed.get(completed_word)
+            if owner is None:
+                if completed_word in self.repository.words_by_len.get(crossing['length'], ()):
+                    completed[completed_word] = crossing
+                    continue
+                owner = next((other for other in self.slots_by_length[crossing['length']]
+                              if other['is_filled'] and other['pattern'] == completed_word), None)
+            conflict = set(crossing['offsets'])
+            if owner is not None:
+                conflict.update(owner['offsets'])
+            return conflict
+        return None
+
     def _score_word(self, word: str) -> int:
         """Calcule le 'score d'utilité' d'un mot."""
         return sum(self.LETTER_SCORES.get(char, 0) for char in word)
+
+    # ===================================================================
+    # NOUVEAU : Ordre des valeurs (least-constraining-value)
+    # ===================================================================
+
+    def _set_value_order(self, value_order: str):
+        """Choisit l'ordre des candidats ; 'lcv' dérive ses fréquences des tables de compatibilité."""
+        if value_order not in self.VALUE_ORDERS:
+            raise ValueError(f"Ordre des valeurs inconnu : {value_order!r} (attendu : {self.VALUE_ORDERS})")
+        self.value_order = value_order
+        if value_order == 'lcv' and self._letter_log_freq is None:
+            if self._letter_counts is None:
+                self._build_compatibility_tables()
+            self._letter_log_freq = {
+                length: [{char: math.log1p(n) for char, n in position.items()} for position in positions]
+                for length, positions in self._letter_counts.items()
+            }
+
+    # ===================================================================
+    # NOUVEAU : Tables de compatibilité des croisements
+    # ===================================================================
+
+    def _build_compatibility_tables(self):
+        """
+        Pré-calcule, pour chaque longueur de slot et chaque position, le nombre
+        de mots du lexique (échantillon de cette grille) ayant chaque lettre à
+        cette position, et l'ensemble des lettres assez fréquentes pour que le
+        slot garde le nombre de candidats exigé par le FC strict.
+        """
+        threshold = self._min_safe_candidates()
+        self._letter_counts = {}
+        for length in {slot['length'] for slot in self.slots}:
+            counts = [{} for _ in range(length)]
+            for word in self.repository.words_by_len.get(length, ()):
+                for pos, char in enumerate(word):
+                    counts[pos][char] = counts[pos].get(char, 0) + 1
+            self._letter_counts[length] = counts
+        self._compatible_letters = {
+            length: [frozenset(char for char, n in position.items() if n >= threshold)
+                     for position in positions]
+            for length, positions in self._letter_counts.items()
+        }
+
+    def _filter_compatible(self, slot: dict, candidates: list[str]) -> list[str]:
+        """
+        Écarte les candidats dont une lettre, posée sur une case encore vide d'un
+        slot croisé, n'apparaît pas assez souvent (seuil du FC strict) à cette
+        position dans les mots de sa longueur : le forward checking les
+        rejetterait quel que soit le reste de la grille (les mots disponibles ne
+        font que diminuer). Simple test d'appartenance par lettre, sans recherche
+        de motif ; le rejet ne dépend d'aucune autre case (explication vide).
+        """
+        checks = [
+            (pos, self._compatible_letters[crossing['length']][crossing_pos])
+            for pos, crossing, crossing_pos in slot['crossings']
+            if crossing['pattern'][crossing_pos] == '?' and not crossing['is_filled']
+        ]
+        if not checks:
+            return candidates
+        compatible = [w for w in candidates if all(w[pos] in letters for pos, letters in checks)]
+        self.metrics['compat_rejections'] += len(candidates) - len(compatible)
+        return compatible
+
+    def _compat_filter_exact(self, slot: dict, candidates: list[str], compatible: list[str]) -> bool:
+        """
+        Vrai si chaque candidat écarté par _filter_compatible porte une lettre
+        qu'aucun mot de la longueur du croisé n'a à cette position : rejet
+        exact. Une lettre seulement rare (sous le seuil du FC strict) est une
+        heuristique, l'échec du nœud n'en est plus une preuve (voir _fail).
+        """
+        if len(compatible) == len(candidates) or self._min_safe_candidates() <= 1:
+            return True
+        checks = [
+            (pos, self._letter_counts[crossing['length']][crossing_pos])
+            for pos, crossing, crossing_pos in slot['crossings']
+            if crossing['pattern'][crossing_pos] == '?' and not crossing['is_filled']
+        ]
+        kept = set(compatible)
+        return all(any(w[pos] not in counts for pos, counts in checks) for w in candidates if w not in kept)
+
+    def _score_candidates(self, slot: dict, candidates: list[str]) -> list[tuple]:
+        """
+        Associe un score à chaque candidat (plus haut = essayé en premier).
+
+        En mode 'lcv', le score d'un mot estime les options qu'il laisse aux
+        slots croisés encore ouverts : somme, sur ces croisements, de
+        log(1 + nb de mots de la longueur du croisé ayant cette lettre à cette
+        position). Lecture de tables pré-calculées uniquement : coût linéaire
+        en nombre de candidats, sans recherche de motif.
+        """
+        if self.value_order != 'lcv':
+            return [(self._score_word(w), w) for w in candidates]
+        open_crossings = [
+            (pos, self._letter_log_freq[crossing['length']][crossing_pos])
+            for pos, crossing, crossing_pos in slot['crossings']
+            if crossing['pattern'][crossing_pos] == '?'
+        ]
+        return [
+            (round(sum(table.get(w[pos], 0.0) for pos, table in open_crossings), 3), w)
+            for w in candidates
+        ]
     
     # ===================================================================
     # NOUVEAU : Système de Nogoods pour éviter les boucles
     # ===================================================================
     
-    def _record_nogood(self, slot_id, pattern: str):
+    def _filled_cells(self, slot: dict) -> set[int]:
+        """Offsets des cases déjà remplies d'un slot."""
+        return {offset for offset, char in zip(slot['offsets'], slot['pattern']) if char != '?'}
+
+    def _all_filled_cells(self) -> set[int]:
+        """Offsets de toutes les cases remplies (explication conservatrice)."""
+        free = (self._EMPTY_BYTE, self._BLACK_BYTE)
+        return {offset for offset, byte in enumerate(self.cells) if byte not in free}
+
+    def _pattern_conflict(self, slot: dict) -> set[int]:
         """
-        Enregistre un pattern qui a échoué pour un slot donné.
-        Ce pattern devient un 'nogood' qu'on évitera de recréer.
+        Explication des mots écartés d'office pour ce slot :
+        - les cases déjà remplies de son motif ;
+        - les cases des slots de même longueur dont le mot (consommé) respecte ce motif.
+        En mode 'ac3', les domaines dépendent de toute la grille : explication conservatrice.
         """
-        if slot_id not in self.nogoods:
-            self.nogoods[slot_id] = set()
-        self.nogoods[slot_id].add(pattern)
-        logging.debug(f"  [NOGOOD] Enregistré pour slot {slot_id}: '{pattern}'")
-    
-    def _is_nogood_pattern(self, slot_id, pattern: str) -> bool:
+        if self.domains is not None:
+            return self._all_filled_cells()
+        conflict = self._filled_cells(slot)
+        pattern = slot['pattern']
+        for other in self.slots_by_length[slot['length']]:
+            if other['is_filled'] and other is not slot:
+                if all(p == '?' or p == c for p, c in zip(pattern, other['pattern'])):
+                    conflict.update(other['offsets'])
+        return conflict
+
+    def _fail(self, conflict: set[int], complete: bool = True) -> bool:
         """
-        Vérifie si un pattern est un nogood connu pour ce slot.
+        Enregistre l'explication de l'échec courant, apprend le nogood et renvoie False.
+
+        L'explication n'est complète que si chaque rejet du nœud découle des
+        lettres des cases `conflict` quel que soit le reste de la grille :
+        motif, mots consommés (slots remplis ou complétés de même longueur),
+        mot complet invalide, slot croisé sans aucun candidat, nogood appris.
+        Les rejets heuristiques (seuil du FC strict au-dessus d'un candidat,
+        fragment encore partiel, candidats coupés par MAX_CANDIDATES_PER_SLOT)
+        dépendent de l'ordre de la recherche : un tel échec n'est pas appris
+        (nogood, table de transposition, composante), l'explication ne sert
+        qu'au backjump de la branche courante.
         """
-        return slot_id in self.nogoods and pattern in self.nogoods[slot_id]
-    
-    def _clear_nogoods_for_slot(self, slot_id):
+        self._last_conflict = conflict
+        self._last_complete = complete
+        if not complete:
+            return False
+        if conflict:
+            self._learn_nogood(conflict)
+        if self._zobrist is not None:
+            self._store_transposition(conflict)
+        return False
+
+    def _learn_nogood(self, conflict: set[int]):
         """
-        Nettoie les nogoods d'un slot.
+        Mémorise la combinaison de lettres des cases `conflict` comme nogood :
+        un ensemble de contraintes (slot, position, lettre). Le store est borné
+        (MAX_LEARNED_NOGOODS) avec éviction du nogood le moins récemment utilisé.
         """
-        if slot_id in self.nogoods:
-            del self.nogoods[slot_id]
-    
-    def _invalidate_dependent_nogoods(self, slot: dict):
+        if len(conflict) > self.MAX_NOGOOD_SIZE:
+            return
+        self._add_nogood(tuple(sorted((offset, self.cells[offset]) for offset in conflict)))
+        self.metrics['nogoods_learned'] += 1
+
+    def _add_nogood(self, cells: tuple):
+        """Insère un nogood ((offset, octet), ...) dans le store et ses index de surveillance."""
+        nogood_id = self._next_nogood_id
+        self._next_nogood_id += 1
+
+        self.nogoods[nogood_id] = tuple(
+            (*self._cell_owner[offset], bytes([byte]).decode(self.GRID_ENCODING)) for offset, byte in cells
+        )
+        self._nogood_cells[nogood_id] = cells
+        for literal in cells:
+            self._nogood_watch.setdefault(literal, set()).add(nogood_id)
+        # Arguments %s : le message n'est formaté que si le niveau DEBUG est actif
+        logging.debug("  [NOGOOD] Appris : %s", self.nogoods[nogood_id])
+
+        if len(self.nogoods) > self.MAX_LEARNED_NOGOODS:
+            self._evict_nogood(next(iter(self.nogoods)))
+
+    def _evict_nogood(self, nogood_id: int):
+        """Retire un nogood du store et de l'index de surveillance."""
+        del self.nogoods[nogood_id]
+        self._shared_nogood_ids.discard(nogood_id)
+        for literal in self._nogood_cells.pop(nogood_id):
+            self._nogood_watch[literal].discard(nogood_id)
+        self.metrics['nogoods_evicted'] += 1
+
+    def _matching_nogood_conflict(self, new_cells: set[int]) -> set[int] | None:
         """
-        Efface les nogoods de tous les slots qui intersectent avec ce slot.
-        Appelé lors du backtrack car les nogoods sont contextuels.
+        Vérifie si les lettres que le dernier placement vient de poser (new_cells)
+        reconstituent un nogood appris. Renvoie ses cases (explication) ou None.
         """
-        slots_to_clear = set()
-        
-        # Trouver tous les slots qui intersectent avec ce slot
-        for pos_idx in range(slot['length']):
-            if slot['direction'] == 'across':
-                x = slot['x'] + pos_idx
-                y = slot['y']
-            else:
-                x = slot['x']
-                y = slot['y'] + pos_idx
-            
-            # Trouver le slot intersecté (version optimisée)
-            intersected = self._find_intersecting_slot_fast(x, y, slot['direction'])
-            if intersected:
-                intersected_id = intersected.get('id', id(intersected))
-                slots_to_clear.add(intersected_id)
-        
-        # Effacer les nogoods de tous les slots intersectés
-        for slot_id in slots_to_clear:
-            if slot_id in self.nogoods:
-                logging.debug(f"  [NOGOOD] Invalidation des nogoods du slot {slot_id} (backtrack)")
-                del self.nogoods[slot_id]
-    
-    def _would_create_nogoods(self, word: str, slot: dict, original_state: list[tuple[int, int, str]]) -> bool:
+        if not self.nogoods:
+            return None
+        grid = self.cells
+        for offset in new_cells:
+            for nogood_id in self._nogood_watch.get((offset, grid[offset]), ()):
+                cells = self._nogood_cells[nogood_id]
+                if all(grid[cell] == byte for cell, byte in cells):
+                    self.nogoods.move_to_end(nogood_id)
+                    self.metrics['nogood_hits'] += 1
+                    if nogood_id in self._shared_nogood_ids:
+                        self.metrics['shared_nogood_hits'] += 1
+                    return {cell for cell, _ in cells}
+        return None
+
+    def preload_nogoods(self, nogoods: list[tuple]) -> int:
         """
-        Vérifie si placer ce mot créerait un pattern nogood dans un slot intersecté.
-        C'est ici qu'on implémente la logique clé : éviter de placer une lettre
-        qui créerait un pattern déjà connu comme impossible.
+        Charge des nogoods appris par de précédentes résolutions du même gabarit
+        et du même lexique (voir engine/nogood_store.py), au format
+        ((offset, lettre), ...). Ils entrent dans le store borné comme des
+        nogoods appris ; leurs rejets sont aussi comptés dans 'shared_nogood_hits'.
+        Renvoie le nombre de nogoods chargés.
         """
-        # Pour chaque lettre du mot placé, on vérifie les slots intersectés
-        for i, (char, (px, py, old_char)) in enumerate(zip(word, original_state)):
-            # Si la lettre n'a pas changé, pas de problème
-            if old_char == char:
+        loaded = 0
+        for literals in nogoods:
+            if not all(offset in self._cell_owner for offset, _ in literals):
+                continue  # Gabarit différent (store corrompu) : ignoré
+            self._add_nogood(tuple((offset, letter.encode(self.GRID_ENCODING)[0]) for offset, letter in literals))
+            self._shared_nogood_ids.add(self._next_nogood_id - 1)
+            loaded += 1
+        self.metrics['shared_nogoods_loaded'] += loaded
+        return loaded
+
+    def export_nogoods(self) -> list[tuple]:
+        """Nogoods appris par cette résolution (hors nogoods préchargés), au format de preload_nogoods()."""
+        return [
+            tuple((offset, bytes([byte]).decode(self.GRID_ENCODING)) for offset, byte in cells)
+            for nogood_id, cells in self._nogood_cells.items() if nogood_id not in self._shared_nogood_ids
+        ]
+
+    # ===================================================================
+    # NOUVEAU : Hachage de Zobrist et table de transposition
+    # ===================================================================
+
+    def _init_zobrist(self, enabled: bool):
+        """
+        Tire (une fois) les clés de Zobrist : une clé 64 bits par (case, octet),
+        nulle pour les cases vides et noires, et une clé par slot rempli.
+        Recalcule ensuite les hachages depuis l'état courant.
+        """
+        if not enabled:
+            self._zobrist = self._slot_keys = None
+            return
+        if self._zobrist is None:
+            rng = random.Random(self.ZOBRIST_SEED)
+            self._zobrist = []
+            for _ in range(len(self.cells)):
+                keys = [rng.getrandbits(64) for _ in range(256)]
+                keys[self._EMPTY_BYTE] = keys[self._BLACK_BYTE] = 0
+                self._zobrist.append(keys)
+            self._slot_keys = [rng.getrandbits(64) for _ in self.slots]
+        self.grid_hash = 0
+        for offset, byte in enumerate(self.cells):
+            self.grid_hash ^= self._zobrist[offset][byte]
+        self._filled_hash = 0
+        for slot in self.slots:
+            if slot['is_filled']:
+                self._filled_hash ^= self._slot_keys[slot['index']]
+
+    def _update_grid_hash(self, slot: dict, old_state: bytes, new_state: bytes):
+        """Mise à jour incrémentale du hachage : seules les cases modifiées du slot comptent."""
+        grid_hash = self.grid_hash
+        for offset, old, new in zip(slot['offsets'], old_state, new_state):
+            if old != new:
+                keys = self._zobrist[offset]
+                grid_hash ^= keys[old] ^ keys[new]
+        self.grid_hash = grid_hash
+
+    def _store_transposition(self, conflict: set[int]):
+        """Mémorise l'état courant (nœud en échec) avec l'explication de son échec (LRU borné)."""
+        key = self.grid_hash ^ self._filled_hash
+        self.transpositions[key] = frozenset(conflict)
+        self.transpositions.move_to_end(key)
+        self.metrics['tt_stores'] += 1
+        if len(self.transpositions) > self.MAX_TRANSPOSITIONS:
+            self.transpositions.popitem(last=False)
+
+    def _transposition_conflict(self, slot: dict) -> frozenset | None:
+        """
+        Explication de l'échec déjà prouvé de l'état atteint en consommant le mot
+        placé dans `slot`, ou None si cet état n'est pas dans la table.
+        """
+        if self._zobrist is None:
+            return None
+        key = self.grid_hash ^ self._filled_hash ^ self._slot_keys[slot['index']]
+        reason = self.transpositions.get(key)
+        if reason is not None:
+            self.transpositions.move_to_end(key)
+            self.metrics['tt_hits'] += 1
+        return reason
+
+    # ===================================================================
+    # NOUVEAU : Pré-élagage du lexique selon le gabarit
+    # ===================================================================
+
+    def prune_lexicon(self) -> bool:
+        """
+        Réduit les mots disponibles à ceux qui peuvent figurer dans une grille
+        remplie : longueurs présentes dans le gabarit seulement, puis point
+        fixe d'arc-consistance sur les croisements (SlotDomains, motifs
+        courants) qui retire les mots dont une lettre n'a aucun support dans
+        le slot croisé. Un mot est gardé s'il reste dans le domaine d'au moins
+        un slot de sa longueur. Le Trie (validation des mots et fragments) est
+        inchangé ; seuls les candidats, les tables de compatibilité et les
+        comptes du MRV en profitent.
+
+        Renvoie False (lexique laissé intact) si un slot n'a aucun mot possible.
+        """
+        words_by_len = self.repository.words_by_len
+        before = {length: len(words) for length, words in words_by_len.items()}
+        domains = SlotDomains(self.slots, words_by_len)
+        if not domains.initialize():
+            logging.info("PRÉ-ÉLAGAGE : un slot n'a aucun mot possible, lexique inchangé.")
+            return False
+
+        kept = {}
+        for slot in self.slots:
+            kept.setdefault(slot['length'], set()).update(domains.words(slot['index']))
+        self.repository.words_by_len = kept
+        self.repository._candidate_cache.clear()
+
+        self.metrics['lexicon_before'] = sum(before.values())
+        self.metrics['lexicon_after'] = sum(len(words) for words in kept.values())
+        sizes = ', '.join(f"{length}: {before.get(length, 0)} -> {len(kept[length])}" for length in sorted(kept))
+        logging.info(f"PRÉ-ÉLAGAGE : {self.metrics['lexicon_before']} -> {self.metrics['lexicon_after']} mots "
+                     f"(par longueur {sizes} ; {domains.stats['revisions']} révisions)")
+        return True
+
+    # ===================================================================
+    # NOUVEAU : Mots imposés (story B1) - placement et propagation initiale
+    # ===================================================================
+
+    def place_forced_words(self, words: list[str]) -> bool:
+        """
+        Pré-place les mots imposés par l'utilisateur, avant la recherche.
+
+        Une petite recherche en profondeur attribue à chaque mot un slot de sa
+        longueur (les mots ayant le moins de slots possibles d'abord) : lettres
+        compatibles avec les mots déjà posés, fragments croisés valides et au
+        moins un candidat pour chaque slot croisé. Chaque affectation complète
+        est ensuite validée par une propagation AC-3 sur toute la grille :
+        elle n'est retenue que si aucun domaine ne se vide. Les mots retenus
+        restent en place pendant toute la recherche (redémarrages compris), et
+        les mots qui ne restent dans le domaine d'aucun slot ouvert sont
+        retirés du lexique disponible (voir _restrict_lexicon_to_domains).
+
+        Args:
+            words (list[str]): 1 à MAX_FORCED_WORDS mots distincts, normalisés,
+                présents dans le dictionnaire de la grille.
+
+        Returns:
+            bool: False si aucune position compatible n'a été trouvée.
+        """
+        if len(words) > self.MAX_FORCED_WORDS:
+            raise ValueError(f"Au plus {self.MAX_FORCED_WORDS} mots imposés (reçu : {len(words)})")
+        if len(set(words)) != len(words):
+            raise ValueError("Les mots imposés doivent être distincts")
+        for word in words:
+            if not self.repository.is_word_valid(word) or not self.is_word_encodable(word):
+                raise ValueError(f"Mot imposé absent du dictionnaire de la grille : {word!r}")
+
+        domains = self._forced_domains(words)
+        order = sorted(words, key=lambda w: (len(self.slots_by_length.get(len(w), [])), -len(w)))
+        if not self._search_forced_placement(order, domains):
+            logging.info(f"MOTS IMPOSÉS : aucune position compatible pour {words}")
+            return False
+        self.metrics['forced_pruned'] = self._restrict_lexicon_to_domains(domains)
+        self.placed_words = self._stack_placed_words()
+        logging.info(f"MOTS IMPOSÉS : {len(words)} mots placés ({self.metrics['forced_placements']} positions essayées, "
+                     f"{self.metrics['forced_pruned']} mots retirés du lexique)")
+        return True
+
+    def _forced_domains(self, words) -> SlotDomains:
+        """Domaines de la propagation initiale : lexique disponible, mots imposés compris."""
+        words_by_len = {length: set(available) for length, available in self.repository.words_by_len.items()}
+        for word in words:
+            words_by_len.setdefault(len(word), set()).add(word)
+        return SlotDomains(self.slots, words_by_len)
+
+    def _search_forced_placement(self, words: list[str], domains: SlotDomains) -> bool:
+        """Place words[0] puis le reste, en profondeur ; annule ses placements en cas d'échec."""
+        if not words:
+            return self._forced_domains_consistent(domains)
+        word = words[0]
+        for slot in self.slots_by_length.get(len(word), []):
+            if slot['is_filled'] or self.metrics['forced_placements'] >= self.MAX_FORCED_PLACEMENTS:
                 continue
-            
-            # Trouver le slot intersecté à cette position (version optimisée)
-            intersected_slot = self._find_intersecting_slot_fast(px, py, slot['direction'])
-            if not intersected_slot:
+            if not all(p == '?' or p == c for p, c in zip(slot['pattern'], word)):
                 continue
-            
-            # Ne vérifier que les slots non encore remplis
-            if intersected_slot.get('is_filled', False):
+            self.metrics['forced_placements'] += 1
+            original_state = self._place_word_on_grid(word, slot)
+            if self._find_invalid_fragment(word, slot, original_state) is not None \
+                    or self._completion_conflict(word, slot) is not None or any(
+                    crossing['unknowns'] and not self._count_candidates(crossing)
+                    for _, crossing, _ in slot['crossings']):
+                self._revert_grid_state(original_state, slot)
                 continue
-            
-            # Calculer le pattern que ce placement créerait pour le slot intersecté
-            future_pattern = self._calculate_future_pattern(intersected_slot)
-            intersected_slot_id = intersected_slot.get('id', id(intersected_slot))
-            
-            # Si ce pattern est un nogood connu, rejeter ce mot
-            if self._is_nogood_pattern(intersected_slot_id, future_pattern):
-                logging.debug(f"        Placer '{word}' créerait nogood '{future_pattern}' pour slot {intersected_slot_id}")
+            self._consume(slot, word)
+            self.forced_words.append((slot, word))
+            if self._search_forced_placement(words[1:], domains):
                 return True
-        
+            self.forced_words.pop()
+            self._unplace(slot, word, original_state, None)
         return False
-    
+
+    def _forced_domains_consistent(self, domains: SlotDomains) -> bool:
+        """
+        Propagation initiale : domaines de tous les slots depuis leurs motifs,
+        mots imposés affectés (retirés des autres slots), puis AC-3.
+        """
+        domains.stats['pruned'] = 0  # Ne compter que l'affectation finalement retenue
+        if not domains.initialize():
+            return False
+        return all(domains.assign_and_propagate(slot['index'], word) for slot, word in self.forced_words)
+
+    def _restrict_lexicon_to_domains(self, domains: SlotDomains) -> int:
+        """
+        Après la propagation initiale des mots imposés : ne garde disponibles
+        que les mots encore dans le domaine d'au moins un slot ouvert. Les
+        candidats du FC, les tables de compatibilité et les comptes du MRV
+        profitent ainsi de l'élagage AC-3 (comme pour prune_lexicon, le Trie
+        est inchangé). Renvoie le nombre de mots retirés.
+        """
+        supported = {}
+        for slot in self.slots:
+            if not slot['is_filled']:
+                supported.setdefault(slot['length'], set()).update(domains.words(slot['index']))
+        removed = 0
+        for length, words in supported.items():
+            available = self.repository.words_by_len.get(length, set())
+            kept = available & words
+            removed += len(available) - len(kept)
+            self.repository.words_by_len[length] = kept
+        self.repository._candidate_cache.clear()
+        return removed
+
+    def _place_forced_word(self, slot: dict, word: str):
+        """Pose et consomme un mot imposé déjà validé (reprise d'un checkpoint)."""
+        self._place_word_on_grid(word, slot)
+        self._consume(slot, word)
+        self.forced_words.append((slot, word))
+
+    # ===================================================================
+    # NOUVEAU : Régénération partielle - cases verrouillées
+    # ===================================================================
+
+    def lock_cells(self, letters: dict[tuple[int, int], str]) -> bool:
+        """
+        Fixe des lettres avant la recherche, pour ne régénérer que le reste
+        d'une grille existante. Chaque case (x, y) verrouillée garde sa lettre
+        pendant toute la recherche. Les slots entièrement verrouillés sont
+        traités comme des mots imposés (consommés, listés dans placed_words) ;
+        les autres gardent ces lettres dans leur motif, la recherche ne
+        remplissant que les cases libres. À appeler sur un solveur neuf,
+        avant place_forced_words().
+
+        Args:
+            letters (dict): {(x, y): lettre} des cases à conserver.
+
+        Returns:
+            bool: False (solveur inchangé) si un slot verrouillé n'est pas un mot
+                du dictionnaire, si un mot y figure deux fois, ou si un slot
+                libre n'a plus aucun candidat.
+        """
+        if self.locked_cells or any(slot['is_filled'] for slot in self.slots):
+            raise ValueError("Les cases se verrouillent sur un solveur neuf")
+        locked = {}
+        for (x, y), letter in letters.items():
+            if not (0 <= x < self.width and 0 <= y < self.height):
+                raise ValueError(f"Case verrouillée hors de la grille : ({x}, {y})")
+            offset = y * self.width + x
+            if self.cells[offset] == self._BLACK_BYTE:
+                raise ValueError(f"Case verrouillée noire : ({x}, {y})")
+            if len(letter) != 1 or not letter.isalpha() or not self.is_word_encodable(letter):
+                raise ValueError(f"Lettre verrouillée invalide en ({x}, {y}) : {letter!r}")
+            locked[offset] = letter.encode(self.GRID_ENCODING)[0]
+
+        original = bytes(self.cells)
+        self._write_locked_letters(locked)
+        complete = [slot for slot in self.slots if slot['unknowns'] == 0]
+        words = [slot['pattern'] for slot in complete]
+        if len(set(words)) == len(words) and all(self.repository.is_word_valid(w) for w in words):
+            for slot in complete:
+                if not slot['is_filled']:  # Sinon déjà consommé en complétant un slot verrouillé croisé
+                    self._consume(slot, slot['pattern'])
+                self.forced_words.append((slot, slot['pattern']))
+            if all(slot['is_filled'] or self._count_candidates(slot) for slot in self.slots):
+                self.placed_words = self._stack_placed_words()
+                logging.info(f"RÉGÉNÉRATION : {len(locked)} cases verrouillées, {len(complete)} mots conservés")
+                return True
+            for slot in complete:
+                self._set_filled(slot, slot['pattern'], False)
+                slot['completed_by'] = None
+            self.forced_words.clear()
+
+        logging.info("RÉGÉNÉRATION : les cases verrouillées ne laissent aucune solution")
+        self.cells[:] = original
+        self._write_locked_letters({})
+        return False
+
+    def _write_locked_letters(self, locked: dict[int, int]):
+        """Écrit les lettres verrouillées (offset -> octet) et recalcule tous les motifs."""
+        self.locked_cells = locked
+        for offset, byte in locked.items():
+            self.cells[offset] = byte
+        self._locked_slots = frozenset(
+            slot['index'] for slot in self.slots if any(offset in locked for offset in slot['offsets']))
+        for slot in self.slots:
+            slot['pattern'] = self._compute_slot_pattern(slot)
+            slot['unknowns'] = slot['pattern'].count('?')
+        self._mark_all_slots_dirty()
+
+    # ===================================================================
+    # NOUVEAU : Décomposition en composantes indépendantes
+    # ===================================================================
+
+    def _open_components(self) -> list[frozenset]:
+        """
+        Composantes connexes du graphe de contraintes restant : les slots
+        ouverts, reliés lorsqu'ils partagent une case encore vide. Deux
+        composantes ne se contraignent plus que par l'unicité des mots.
+        """
+        components = []
+        seen = set()
+        for slot in self.slots:
+            if slot['is_filled'] or not slot['unknowns'] or slot['index'] in seen:
+                continue
+            seen.add(slot['index'])
+            component = []
+            pending = [slot]
+            while pending:
+                current = pending.pop()
+                component.append(current['index'])
+                pattern = current['pattern']
+                for pos, crossing, _ in current['crossings']:
+                    if pattern[pos] == '?' and crossing['index'] not in seen:
+                        seen.add(crossing['index'])
+                        pending.append(crossing)
+            components.append(frozenset(component))
+        return components
+
+    def _focus_component(self, slot: dict) -> tuple[frozenset, bool]:
+        """
+        Composante à traiter au prochain nœud : celle du nœud parent tant
+        qu'elle n'est pas terminée, sinon celle du slot choisi par MRV (`slot`).
+        Renvoie (composante, nouvelle) : nouvelle si la composante n'est pas
+        la simple suite de celle du parent (début, ou scission en plusieurs).
+        """
+        components = self._open_components()
+        if len(components) > 1:
+            self.metrics['component_splits'] += 1
+        parent = self._stack[-1]['component'] if self._stack else None
+        if parent is not None:
+            inside = [component for component in components if not component.isdisjoint(parent)]
+            if inside:
+                best = min(inside, key=lambda c: min((self._mrv_scores[index], index) for index in c))
+                return best, len(inside) > 1
+        return next(component for component in components if slot['index'] in component), True
+
+    def _component_key(self, component: frozenset) -> tuple:
+        """
+        Contexte complet d'une composante : ses cases déjà remplies et les
+        slots remplis de mêmes longueurs (mots consommés). Renvoie
+        (clé, offsets du contexte) ; deux états de même clé posent exactement
+        le même sous-problème.
+        """
+        cells = set()
+        lengths = set()
+        for index in component:
+            cells |= self._filled_cells(self.slots[index])
+            lengths.add(self.slots[index]['length'])
+        filled = []
+        for length in lengths:
+            for other in self.slots_by_length[length]:
+                if other['is_filled']:
+                    filled.append(other['index'])
+                    cells.update(other['offsets'])
+        context = tuple((offset, self.cells[offset]) for offset in sorted(cells))
+        return (component, tuple(sorted(filled)), context), cells
+
+    def _record_component_failure(self, frame: dict, conflict: set[int], complete: bool):
+        """
+        Le premier nœud d'une composante vient d'échouer : si l'explication
+        (complète, voir _fail) tient entièrement dans le contexte de la
+        composante, cet échec vaut pour tout état de même clé. Une explication
+        assez courte est déjà apprise comme nogood (testé dès le placement
+        précédent) : seules les plus longues (> MAX_NOGOOD_SIZE) sont mémorisées ici.
+        """
+        component_key = frame['component_key']
+        if not complete or not frame['component_root'] or len(conflict) <= self.MAX_NOGOOD_SIZE \
+                or not conflict <= component_key[1]:
+            return
+        key = component_key[0]
+        self.component_failures[key] = frozenset(conflict)
+        self.component_failures.move_to_end(key)
+        self.metrics['component_stores'] += 1
+        if len(self.component_failures) > self.MAX_COMPONENT_FAILURES:
+            self.component_failures.popitem(last=False)
+
     def _find_intersecting_slot(self, x: int, y: int, current_direction: str) -> dict | None:
         """
         Trouve un slot qui passe par la position (x, y) dans la direction opposée.
@@ -497,13 +1753,6 @@ class GridSolver:
         
         return None
     
-    def _calculate_future_pattern(self, slot: dict) -> str:
-        """
-        Calcule le pattern actuel d'un slot (ce qu'il serait maintenant,
-        avec les lettres déjà placées sur la grille).
-        """
-        return self._get_slot_pattern(slot)
-    
     # ===================================================================
     # OPTIMISATION : Pré-calcul des intersections
     # ===================================================================
@@ -536,6 +1785,48 @@ class GridSolver:
         
         logging.debug(f"Pré-calcul de {len(self.intersection_map)} positions de slots")
     
+    def _precompute_slot_offsets(self):
+        """
+        Pré-calcule, pour chaque slot, sa position dans la grille à plat :
+        - 'cells'     : slice(début, fin, pas) (pas = 1 en 'across', width en 'down')
+        - 'offsets'   : offsets de chaque lettre du slot
+        - 'crossings' : [(position, slot_croisé, position_dans_slot_croisé), ...]
+        - 'pattern' / 'unknowns' : motif courant et nombre de cases vides
+        - 'nb_intersections' : nombre de slots croisés (statique)
+        """
+        for slot in self.slots:
+            step = 1 if slot['direction'] == 'across' else self.width
+            start = slot['y'] * self.width + slot['x']
+            stop = start + step * (slot['length'] - 1) + 1
+            if slot['x'] >= self.width or slot['y'] >= self.height or stop > len(self.cells):
+                raise ValueError(f"Slot {slot.get('id', '?')} hors grille ({self.width}x{self.height})")
+            slot['cells'] = slice(start, stop, step)
+            slot['offsets'] = tuple(range(start, stop, step))
+            # Motif maintenu incrémentalement (voir _place_word_on_grid)
+            slot['pattern'] = self._compute_slot_pattern(slot)
+            slot['unknowns'] = slot['pattern'].count('?')
+
+        # Slot de référence de chaque case (premier slot qui la couvre) : (slot_index, position)
+        self._cell_owner = {}
+        for slot in self.slots:
+            for pos, offset in enumerate(slot['offsets']):
+                self._cell_owner.setdefault(offset, (slot['index'], pos))
+
+        for slot in self.slots:
+            crossings = []
+            for pos_idx in range(slot['length']):
+                if slot['direction'] == 'across':
+                    x, y = slot['x'] + pos_idx, slot['y']
+                else:
+                    x, y = slot['x'], slot['y'] + pos_idx
+                crossing = self._find_intersecting_slot_fast(x, y, slot['direction'])
+                if crossing:
+                    crossing_pos = x - crossing['x'] if crossing['direction'] == 'across' else y - crossing['y']
+                    crossings.append((pos_idx, crossing, crossing_pos))
+            slot['crossings'] = crossings
+            # Nombre d'intersections statique, calculé une seule fois (heuristique MRV)
+            slot['nb_intersections'] = len(crossings)
+
     def _find_intersecting_slot_fast(self, x: int, y: int, current_direction: str) -> dict | None:
         """
         Version optimisée de _find_intersecting_slot utilisant le pré-calcul.
@@ -548,8 +1839,69 @@ class GridSolver:
     # ===================================================================
     # FORWARD CHECKING : Détection précoce des branches mortes
     # ===================================================================
+
+    def _propagation_conflict(self, word: str, slot: dict, original_state: bytes,
+                              crossing_counts: dict | None = None) -> tuple[set[int], bool] | None:
+        """
+        Propagation après placement, selon le mode choisi dans solve() :
+        - 'fc'  : forward checking strict sur les slots croisés ;
+        - 'ac3' : domaine du slot réduit au mot (et ceux des slots croisés
+                  complétés au leur), AC-3 le long des croisements, puis même
+                  seuil MIN_SAFE_CANDIDATES sur les slots croisés.
+        Renvoie None si le placement passe, sinon (explication (offsets), complète) :
+        seul un slot croisé sans aucun candidat prouve l'impasse, le seuil strict
+        au-dessus d'un candidat reste une heuristique (voir _fail).
+        `crossing_counts` : tables de lettres des slots croisés propres au nœud (voir _find_starved_crossing).
+        """
+        if self.domains is None:
+            starved = self._starved_crossing(word, slot, original_state, crossing_counts)
+            if starved is None:
+                return None
+            crossing, nb_candidates = starved
+            if nb_candidates:
+                return self._filled_cells(crossing), False
+            # Aucun candidat : motif futur du slot croisé et mots consommés qui le respectent
+            return self._pattern_conflict(crossing), True
+
+        # La propagation dépend de toute la grille : explication conservatrice
+        if not self.domains.assign_and_propagate(slot['index'], word) or not all(
+                self.domains.assign_and_propagate(crossing['index'], crossing['pattern'])
+                for _, crossing, _ in slot['crossings'] if not crossing['is_filled'] and not crossing['unknowns']):
+            return self._all_filled_cells(), True
+        for _, crossing, _ in slot['crossings']:
+            if not crossing['is_filled'] and self.domains.size(crossing['index']) < self._min_safe_candidates():
+                return self._all_filled_cells(), False
+        return None
+
+    def _init_domains(self) -> bool:
+        """
+        Construit les domaines explicites (mode 'ac3') et établit l'arc-consistance initiale.
+        Les slots déjà remplis avant la recherche (mots imposés) gardent leur mot :
+        il est réindexé puis affecté, ce qui le retire des autres slots.
+        """
+        words_by_len = self.repository.words_by_len
+        filled = [slot for slot in self.slots if slot['is_filled']]
+        if filled:
+            words_by_len = {length: set(available) for length, available in words_by_len.items()}
+            for slot in filled:
+                words_by_len.setdefault(slot['length'], set()).add(slot['pattern'])
+        self.domains = SlotDomains(self.slots, words_by_len)
+        self._mark_all_slots_dirty()
+        if not self.domains.initialize() or not all(
+                self.domains.assign_and_propagate(slot['index'], slot['pattern']) for slot in filled):
+            logging.info("AC-3 : un slot n'a aucun candidat avant la recherche.")
+            return False
+        return True
+
+    def _sync_domain_metrics(self):
+        """Reporte les compteurs des domaines dans les métriques du solveur."""
+        if self.domains is None:
+            return
+        self.metrics['ac_revisions'] = self.domains.stats['revisions']
+        self.metrics['ac_pruned'] = self.domains.stats['pruned']
+        self.metrics['ac_wipeouts'] = self.domains.stats['wipeouts']
     
-    def _forward_check(self, word: str, slot: dict, original_state: list[tuple[int, int, str]]) -> bool:
+    def _forward_check(self, word: str, slot: dict, original_state: bytes) -> bool:
         """
         Forward Checking STRICT : Vérifie que placer ce mot ne crée pas de dead-end.
         Pour chaque slot intersecté non rempli, vérifie qu'il aura encore
@@ -558,46 +1910,72 @@ class GridSolver:
         Logique : Exiger au moins 5 candidats (au lieu de 1) donne une marge de sécurité
         et évite d'explorer des branches qui mènent presque toujours à des impasses.
         """
-        # Collecter tous les slots intersectés uniques
-        intersected_slots = set()
-        
-        for i, (char, (px, py, old_char)) in enumerate(zip(word, original_state)):
-            # Trouver le slot intersecté
-            intersected_slot = self._find_intersecting_slot_fast(px, py, slot['direction'])
-            
-            if not intersected_slot:
-                continue
-            
+        return self._find_starved_crossing(word, slot, original_state) is None
+
+    def _init_fc_threshold(self):
+        """
+        Seuil du FC strict pour la recherche qui démarre. MIN_SAFE_CANDIDATES
+        est calibré pour une grille vide ; si des mots sont déjà posés (mots
+        imposés, cases verrouillées), les slots qui les croisent n'ont souvent
+        plus que quelques candidats, tous légitimes, et le seuil strict
+        rejetterait tout mot qui les croise : le FC revient alors au test
+        simple (un candidat).
+        """
+        prefilled = bool(self.locked_cells) or any(slot['is_filled'] for slot in self.slots)
+        self._fc_threshold = 1 if prefilled else self.MIN_SAFE_CANDIDATES
+
+    def _min_safe_candidates(self) -> int:
+        """Nombre minimum de candidats exigé des slots croisés par le FC strict."""
+        return self.MIN_SAFE_CANDIDATES if self._fc_threshold is None else self._fc_threshold
+
+    def _find_starved_crossing(self, word: str, slot: dict, original_state: bytes,
+                               crossing_counts: dict | None = None) -> dict | None:
+        """Renvoie le premier slot croisé qui n'aurait plus assez de candidats (ou None)."""
+        starved = self._starved_crossing(word, slot, original_state, crossing_counts)
+        return None if starved is None else starved[0]
+
+    def _starved_crossing(self, word: str, slot: dict, original_state: bytes,
+                          crossing_counts: dict | None = None) -> tuple[dict, int] | None:
+        """
+        Premier slot croisé qui n'aurait plus assez de candidats, avec son nombre
+        de candidats (ou None).
+
+        OPTIMISATION : avec `crossing_counts` (un dict par nœud de recherche),
+        le motif d'un slot croisé avant placement n'est interrogé qu'une fois
+        par nœud : on en tire le nombre de candidats par lettre à la case de
+        croisement. Chaque candidat suivant se vérifie alors en O(1) par
+        croisement, avec exactement le même résultat que la recherche du motif futur.
+        """
+        # Pour chaque slot intersecté non rempli, vérifier qu'il a encore des candidats
+        # (deux slots se croisent au plus une fois : pas de doublon possible)
+        for pos, intersected_slot, crossing_pos in slot['crossings']:
             # Ignorer les slots déjà remplis
             if intersected_slot.get('is_filled', False):
                 continue
-            
-            # Ajouter à la liste des slots à vérifier
-            slot_id = intersected_slot.get('id', id(intersected_slot))
-            intersected_slots.add(slot_id)
-        
-        # Pour chaque slot intersecté, vérifier qu'il a encore des candidats
-        for slot_id in intersected_slots:
-            # Retrouver le slot complet
-            intersected_slot = next((s for s in self.slots if s.get('id', id(s)) == slot_id), None)
-            
-            if not intersected_slot:
-                continue
-            
+
             # Calculer le pattern que ce slot aurait après le placement
             future_pattern = self._get_slot_pattern(intersected_slot)
+
+            if crossing_counts is not None and original_state[pos] == self._EMPTY_BYTE:
+                # Case remplie par ce mot : table de lettres du motif d'avant placement
+                counts = crossing_counts.get(intersected_slot['index'])
+                if counts is None:
+                    base_pattern = future_pattern[:crossing_pos] + '?' + future_pattern[crossing_pos + 1:]
+                    counts = Counter(w[crossing_pos] for w in self.repository.get_candidates(base_pattern) or ())
+                    crossing_counts[intersected_slot['index']] = counts
+                nb_candidates = counts[word[pos]]
+            else:
+                # Vérifier s'il reste assez de candidats pour ce pattern
+                candidates = self.repository.get_candidates(future_pattern)
+                nb_candidates = len(candidates) if candidates else 0
             
-            # Vérifier s'il reste assez de candidats pour ce pattern
-            candidates = self.repository.get_candidates(future_pattern)
-            nb_candidates = len(candidates) if candidates else 0
-            
-            if nb_candidates < self.MIN_SAFE_CANDIDATES:
+            threshold = self._min_safe_candidates()
+            if nb_candidates < threshold:
                 # DEAD-END détecté : ce placement laisse trop peu de candidats
-                logging.debug(f"        FC STRICT: Slot {slot_id} n'aurait que {nb_candidates} candidat(s) (min: {self.MIN_SAFE_CANDIDATES}, pattern: '{future_pattern}')")
-                return False
+                return intersected_slot, nb_candidates
         
         # Tous les slots intersectés ont encore des candidats
-        return True
+        return None
     
     def _print_metrics(self):
         """
@@ -620,6 +1998,33 @@ class GridSolver:
             fc_efficiency = (m['fc_skips'] / m['fc_checks']) * 100
             logging.info(f"  - Efficacité FC       : {fc_efficiency:.1f}% (mots éliminés)")
         logging.info(f"")
+        if self.domains is not None:
+            logging.info(f"ARC-CONSISTANCE (AC-3):")
+            logging.info(f"  - Révisions d'arcs    : {m['ac_revisions']}")
+            logging.info(f"  - Mots retirés        : {m['ac_pruned']}")
+            logging.info(f"  - Domaines vidés      : {m['ac_wipeouts']}")
+            logging.info(f"")
+        logging.info(f"BACKJUMPING / NOGOODS:")
+        logging.info(f"  - Niveaux sautés      : {m['backjumps']}")
+        logging.info(f"  - Nogoods appris      : {m['nogoods_learned']} (évincés : {m['nogoods_evicted']})")
+        logging.info(f"  - Rejets par nogood   : {m['nogood_hits']}")
+        if m['shared_nogoods_loaded']:
+            logging.info(f"  - Nogoods partagés    : {m['shared_nogoods_loaded']} préchargés, {m['shared_nogood_hits']} rejets")
+        logging.info(f"")
+        if m['lexicon_before']:
+            logging.info(f"PRÉ-ÉLAGAGE DU LEXIQUE : {m['lexicon_before']} -> {m['lexicon_after']} mots")
+        logging.info(f"TABLES DE COMPATIBILITÉ : {m['compat_rejections']} candidats écartés avant toute recherche de motif")
+        logging.info(f"TABLE DE TRANSPOSITION : {m['tt_hits']} rejets / {m['tt_stores']} états en échec")
+        if self.decompose:
+            logging.info(f"COMPOSANTES INDÉPENDANTES : {m['component_splits']} scissions, "
+                         f"{m['component_hits']} rejets / {m['component_stores']} échecs mémorisés")
+        if self.restart_policy is not None:
+            logging.info(f"REDÉMARRAGES ({self.restart_policy}) : {m['restarts']}")
+            logging.info(f"")
+        logging.info(f"MRV (file de priorité):")
+        logging.info(f"  - Scores recalculés   : {m['mrv_rescores']}")
+        logging.info(f"  - Scores économisés   : {m['mrv_rescores_saved']}")
+        logging.info(f"")
         logging.info(f"CACHE get_candidates:")
         total_cache = cache_stats['hits'] + cache_stats['misses']
         if total_cache > 0:
@@ -651,8 +2056,22 @@ class GridSolver:
                 'order': idx + 1
             })
         
-        return {
+        stats = {
             'metrics': self.metrics.copy(),
             'cache_stats': cache_stats.copy(),
             'placement_history': final_placement_history,
-        }
\ No newline at end of file
+        }
+        if self.cancel_reason is not None:
+            stats['cancel_reason'] = self.cancel_reason
+        if self.trace is not None:
+            stats['trace'] = self.trace.export(self.slots)
+        return stats
+
+    def enable_trace(self, capacity: int = SolverTrace.DEFAULT_CAPACITY) -> SolverTrace:
+        """
+        Active la trace binaire de la recherche (nœuds, placements, rejets,
+        retours arrière), exportée par get_solve_statistics()['trace'].
+        Désactivée par défaut : le chemin critique ne paie alors qu'un test.
+        """
+        self.trace = SolverTrace(capacity)
+        return self.trace
\ No newline at end of file
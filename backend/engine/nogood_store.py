@@ -0,0 +1,146 @@
+# DANS backend/engine/nogood_store.py
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+
+class NogoodStore:
+    """
+    Cache des nogoods partagé entre les requêtes (un par processus, sur disque
+    en option) : les combinaisons de lettres (offset, lettre) prouvées sans
+    solution par une résolution sont préchargées dans les solveurs suivants
+    (GridSolver.preload_nogoods) au lieu d'être réapprises.
+
+    Un nogood n'est valable que pour le même problème : la clé réunit le
+    gabarit, l'identifiant du lexique et la politique de recherche (seuil du
+    forward checking, plafond de candidats). Le cache ne sert donc qu'aux
+    listes de mots qui se répètent d'une requête à l'autre : échantillon du
+    DELA tiré d'un seed, dictionnaire personnel, liste fixe (test_harness).
+    Un échantillon aléatoire sans seed ne se répète jamais : l'appelant n'a
+    pas d'identifiant à fournir et le cache est ignoré (GridGenerator).
+
+    Les clés portent FORMAT_VERSION : les nogoods d'un format antérieur
+    (appris avant que l'apprentissage ne retienne que les explications
+    complètes) sont écartés au chargement au lieu d'être préchargés.
+
+    Mémoire bornée : au plus `max_keys` clés (LRU) et `max_nogoods_per_key`
+    nogoods par clé (les plus anciens sont évincés).
+    """
+
+    DEFAULT_MAX_KEYS = 64
+    DEFAULT_MAX_NOGOODS_PER_KEY = 5000
+    AUTOSAVE_EVERY = 10  # Sauvegarde sur disque tous les N ajouts
+    FORMAT_VERSION = 2   # À incrémenter si le sens des nogoods stockés change
+
+    def __init__(self, path: str | None = None, max_keys: int = DEFAULT_MAX_KEYS,
+                 max_nogoods_per_key: int = DEFAULT_MAX_NOGOODS_PER_KEY):
+        self.path = path
+        self.max_keys = max_keys
+        self.max_nogoods_per_key = max_nogoods_per_key
+        self._entries = OrderedDict()  # clé -> OrderedDict(nogood -> None), du plus ancien au plus récent
+        self._lock = threading.Lock()
+        self._pending_adds = 0
+        self.stats = {'lookups': 0, 'hits': 0, 'stored': 0, 'evicted': 0}
+        if path and os.path.exists(path):
+            self.load()
+
+    @classmethod
+    def make_key(cls, template_id: str, lexicon_id: str, search_policy: str) -> str:
+        """Clé d'un problème : format, gabarit, lexique et politique de recherche."""
+        return f"v{cls.FORMAT_VERSION}|{template_id}|{lexicon_id}|{search_policy}"
+
+    @staticmethod
+    def lexicon_version(words) -> str:
+        """Empreinte exacte (SHA-1) d'une liste de mots, indépendante de l'ordre."""
+        digest = hashlib.sha1()
+        for word in sorted(set(words)):
+            digest.update(word.encode('utf-8'))
+            digest.update(b'\n')
+        return digest.hexdigest()[:16]
+
+    def get(self, key: str) -> list[tuple]:
+        """Nogoods connus pour `key` (liste vide si aucun)."""
+        with self._lock:
+            self.stats['lookups'] += 1
+            entry = self._entries.get(key)
+            if entry is None:
+                return []
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return list(entry)
+
+    def add(self, key: str, nogoods: list[tuple]) -> int:
+        """Ajoute des nogoods ((offset, lettre), ...) sous `key`. Renvoie le nombre de nouveaux."""
+        if not nogoods:
+            return 0
+        with self._lock:
+            added = self._insert(key, nogoods)
+            self.stats['stored'] += added
+            self._pending_adds += 1
+            autosave = self.path and self._pending_adds >= self.AUTOSAVE_EVERY
+        if autosave:
+            self.save()
+        return added
+
+    def _insert(self, key: str, nogoods) -> int:
+        """Insère sous `key` en respectant les bornes (appelant : self._lock tenu)."""
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = OrderedDict()
+            if len(self._entries) > self.max_keys:
+                _, dropped = self._entries.popitem(last=False)
+                self.stats['evicted'] += len(dropped)
+        self._entries.move_to_end(key)
+
+        added = 0
+        for nogood in nogoods:
+            nogood = tuple(tuple(literal) for literal in nogood)
+            if nogood not in entry:
+                entry[nogood] = None
+                added += 1
+        while len(entry) > self.max_nogoods_per_key:
+            entry.popitem(last=False)
+            self.stats['evicted'] += 1
+        return added
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(entry) for entry in self._entries.values())
+
+    # ---------------------------------------------------------
+    # Persistance (JSON)
+    # ---------------------------------------------------------
+    def save(self):
+        """Écrit le store dans self.path (fichier temporaire puis remplacement atomique)."""
+        if not self.path:
+            return
+        with self._lock:
+            data = {key: [[list(literal) for literal in nogood] for nogood in entry]
+                    for key, entry in self._entries.items()}
+            self._pending_adds = 0
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def load(self):
+        """Recharge le store depuis self.path (fichier illisible : store vide)."""
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Store de nogoods illisible ({self.path}) : {e}")
+            return
+        prefix = f"v{self.FORMAT_VERSION}|"
+        current = {key: nogoods for key, nogoods in data.items() if key.startswith(prefix)}
+        with self._lock:
+            self._entries.clear()
+            for key, nogoods in current.items():
+                self._insert(key, nogoods)
+        if len(current) < len(data):
+            logging.info(f"Store de nogoods : {len(data) - len(current)} clés d'un format antérieur écartées.")
+        logging.info(f"Store de nogoods chargé : {len(self)} nogoods, {len(current)} gabarits/lexiques.")
@@ -0,0 +1,204 @@
+# DANS backend/engine/slot_domains.py
+
+import logging
+from collections import deque
+
+
+class SlotDomains:
+    """
+    Domaines explicites des slots pour la propagation par arc-consistance (AC-3).
+
+    Représentation compacte : pour chaque longueur L, les mots disponibles sont
+    numérotés (lexique trié) et un domaine est un entier Python utilisé comme
+    bitset (bit i = i-ème mot de longueur L). Des masques pré-calculés par
+    (longueur, position, lettre) rendent chaque révision d'arc bit-à-bit.
+
+    Toute modification de domaine est enregistrée dans une "trail" pour
+    être annulée en O(modifications) lors du backtrack.
+    """
+
+    def __init__(self, slots: list[dict], words_by_len: dict[int, set[str]]):
+        self.slots = slots
+        self.lexicon = {}       # longueur -> [mot, ...] (ordre trié)
+        self.word_index = {}    # longueur -> {mot: indice}
+        self.letter_masks = {}  # longueur -> [ {lettre: bitset}, ... ] (une entrée par position)
+        self.full_masks = {}    # longueur -> bitset de tous les mots
+
+        for length in sorted({slot['length'] for slot in slots}):
+            self._index_length(length, words_by_len.get(length, set()))
+
+        self.domains = [0] * len(slots)
+        self.trail = []         # [(indice_slot, ancien_domaine), ...]
+        self.changed = set()    # Slots modifiés depuis la dernière lecture (MRV)
+        self.stats = {'revisions': 0, 'pruned': 0, 'wipeouts': 0}
+
+    def _index_length(self, length: int, words: set[str]):
+        """Numérote les mots d'une longueur et construit leurs masques positionnels."""
+        lexicon = sorted(words)
+        self.lexicon[length] = lexicon
+        self.word_index[length] = {word: i for i, word in enumerate(lexicon)}
+        self.full_masks[length] = (1 << len(lexicon)) - 1
+
+        # Construction via des chaînes de '0'/'1' : O(n) par (position, lettre)
+        positions = []
+        for pos in range(length):
+            by_letter = {}
+            for i, word in enumerate(lexicon):
+                by_letter.setdefault(word[pos], []).append(i)
+            masks = {}
+            for letter, indices in by_letter.items():
+                bits = bytearray(b'0' * len(lexicon))
+                for i in indices:
+                    bits[i] = 0x31  # '1'
+                masks[letter] = int(bits[::-1], 2)
+            positions.append(masks)
+        self.letter_masks[length] = positions
+        logging.debug(f"Domaines : {len(lexicon)} mots de longueur {length} indexés")
+
+    # ------------------------------------------------------------------
+    # Lecture des domaines
+    # ------------------------------------------------------------------
+
+    def size(self, index: int) -> int:
+        """Nombre de mots encore possibles pour le slot."""
+        return self.domains[index].bit_count()
+
+    def words(self, index: int) -> list[str]:
+        """Liste des mots du domaine (ordre du lexique)."""
+        lexicon = self.lexicon[self.slots[index]['length']]
+        domain = self.domains[index]
+        words = []
+        while domain:
+            low = domain & -domain
+            words.append(lexicon[low.bit_length() - 1])
+            domain ^= low
+        return words
+
+    def pattern_mask(self, length: int, pattern: str) -> int:
+        """Bitset des mots de longueur `length` compatibles avec le motif."""
+        mask = self.full_masks.get(length, 0)
+        for pos, char in enumerate(pattern):
+            if char != '?':
+                mask &= self.letter_masks[length][pos].get(char, 0)
+        return mask
+
+    # ------------------------------------------------------------------
+    # Modification avec trail (annulable)
+    # ------------------------------------------------------------------
+
+    def mark(self) -> int:
+        """Point de retour pour undo()."""
+        return len(self.trail)
+
+    def undo(self, mark: int):
+        """Restaure tous les domaines modifiés depuis `mark`."""
+        trail = self.trail
+        while len(trail) > mark:
+            index, old_domain = trail.pop()
+            self.domains[index] = old_domain
+            self.changed.add(index)
+
+    def _set(self, index: int, domain: int):
+        self.trail.append((index, self.domains[index]))
+        self.domains[index] = domain
+        self.changed.add(index)
+
+    def initialize(self) -> bool:
+        """
+        Construit les domaines initiaux depuis les motifs courants des slots,
+        puis établit l'arc-consistance. Renvoie False si un domaine est vide.
+        """
+        self.trail.clear()
+        for slot in self.slots:
+            self.domains[slot['index']] = self.pattern_mask(slot['length'], slot['pattern'])
+        self.changed.update(range(len(self.slots)))
+        if any(domain == 0 for domain in self.domains):
+            self.stats['wipeouts'] += 1
+            return False
+        return self.propagate(range(len(self.slots)))
+
+    def assign(self, index: int, word: str) -> bool:
+        """
+        Réduit le domaine du slot au seul `word` et retire ce mot des autres
+        slots de même longueur (un mot n'est utilisé qu'une fois).
+        Renvoie False si un domaine devient vide.
+        """
+        length = self.slots[index]['length']
+        bit = 1 << self.word_index[length][word]
+        if self.domains[index] != bit:
+            self._set(index, bit)
+
+        for slot in self.slots:
+            other = slot['index']
+            if other != index and slot['length'] == length and self.domains[other] & bit:
+                self._set(other, self.domains[other] & ~bit)
+                if not self.domains[other]:
+                    self.stats['wipeouts'] += 1
+                    return False
+        return True
+
+    def assign_and_propagate(self, index: int, word: str) -> bool:
+        """assign() puis AC-3 depuis tous les slots dont le domaine a changé."""
+        mark = self.mark()
+        if not self.assign(index, word):
+            return False
+        return self.propagate({changed for changed, _ in self.trail[mark:]})
+
+    # ------------------------------------------------------------------
+    # AC-3 (révisions bit-à-bit le long des croisements)
+    # ------------------------------------------------------------------
+
+    def _revise(self, x: int, x_pos: int, y: int, y_pos: int) -> bool:
+        """
+        Retire du domaine de x les mots dont la lettre en x_pos n'a aucun
+        support dans le domaine de y (lettre en y_pos). Renvoie True si modifié.
+        """
+        self.stats['revisions'] += 1
+        domain_y = self.domains[y]
+        masks_x = self.letter_masks[self.slots[x]['length']][x_pos]
+        supported = 0
+        for letter, mask_y in self.letter_masks[self.slots[y]['length']][y_pos].items():
+            if domain_y & mask_y:
+                supported |= masks_x.get(letter, 0)
+
+        domain_x = self.domains[x]
+        revised = domain_x & supported
+        if revised == domain_x:
+            return False
+        self.stats['pruned'] += domain_x.bit_count() - revised.bit_count()
+        self._set(x, revised)
+        return True
+
+    def propagate(self, sources) -> bool:
+        """
+        Établit l'arc-consistance à partir des slots `sources` dont le domaine
+        a changé : tous les arcs (voisin -> source) sont révisés, puis les
+        arcs des slots révisés en cascade. Renvoie False en cas de domaine vide.
+        """
+        queue = deque()
+        queued = set()
+        for y in sources:
+            for y_pos, crossing, x_pos in self.slots[y]['crossings']:
+                arc = (crossing['index'], x_pos, y, y_pos)
+                if arc not in queued:
+                    queued.add(arc)
+                    queue.append(arc)
+
+        while queue:
+            arc = queue.popleft()
+            queued.discard(arc)
+            x, x_pos, y, _ = arc
+            if not self._revise(*arc):
+                continue
+            if not self.domains[x]:
+                self.stats['wipeouts'] += 1
+                return False
+            for pos_in_x, crossing, pos_in_z in self.slots[x]['crossings']:
+                z = crossing['index']
+                if z == y:
+                    continue
+                next_arc = (z, pos_in_z, x, pos_in_x)
+                if next_arc not in queued:
+                    queued.add(next_arc)
+                    queue.append(next_arc)
+        return True
@@ -0,0 +1,115 @@
+# DANS backend/engine/solver_trace.py
+
+import struct
+import time
+
+
+class SolverTrace:
+    """
+    Trace binaire de la recherche (opt-in, voir GridSolver.enable_trace) :
+    anneau de taille fixe d'événements (type, slot, mot, profondeur,
+    horodatage), remplace les logs du chemin critique du solveur.
+
+    Chaque événement occupe RECORD.size octets dans un bytearray préalloué ;
+    une fois plein, les plus anciens sont écrasés (self.dropped). Les mots
+    sont numérotés à la volée (self.words), l'horodatage est en
+    microsecondes depuis la création de la trace.
+    """
+
+    DEFAULT_CAPACITY = 1 << 16
+    RECORD = struct.Struct('<BHIHI')  # événement, indice du slot, id du mot, profondeur, t (µs)
+    NO_WORD = 0xFFFFFFFF
+    NO_SLOT = 0xFFFF
+
+    # Types d'événements (indices dans EVENTS)
+    EVENTS = ('node', 'place', 'reject_tt', 'reject_nogood', 'reject_fragment', 'reject_fc',
+              'backtrack', 'backjump', 'fail', 'restart', 'solved')
+    NODE, PLACE, REJECT_TT, REJECT_NOGOOD, REJECT_FRAGMENT, REJECT_FC, \
+        BACKTRACK, BACKJUMP, FAIL, RESTART, SOLVED = range(len(EVENTS))
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        if capacity < 1:
+            raise ValueError(f"Capacité de trace invalide : {capacity}")
+        self.capacity = capacity
+        self.buffer = bytearray(capacity * self.RECORD.size)
+        self.count = 0      # Événements enregistrés depuis le début (écrasés compris)
+        self.words = []     # id -> mot
+        self._word_ids = {}
+        self._origin = time.perf_counter_ns()
+
+    @property
+    def dropped(self) -> int:
+        """Événements écrasés par le tourniquet."""
+        return max(0, self.count - self.capacity)
+
+    def record(self, event: int, slot_index: int, word: str | None, depth: int):
+        """Ajoute un événement (écrase le plus ancien si l'anneau est plein)."""
+        if word is None:
+            word_id = self.NO_WORD
+        else:
+            word_id = self._word_ids.get(word)
+            if word_id is None:
+                word_id = self._word_ids[word] = len(self.words)
+                self.words.append(word)
+        elapsed_us = ((time.perf_counter_ns() - self._origin) // 1000) & 0xFFFFFFFF
+        self.RECORD.pack_into(self.buffer, (self.count % self.capacity) * self.RECORD.size,
+                              event, slot_index, word_id, depth, elapsed_us)
+        self.count += 1
+
+    def events(self) -> list[tuple]:
+        """Événements conservés, du plus ancien au plus récent : (type, indice slot, mot, profondeur, t_us)."""
+        kept = min(self.count, self.capacity)
+        first = self.count - kept
+        events = []
+        for n in range(first, self.count):
+            event, slot_index, word_id, depth, elapsed_us = self.RECORD.unpack_from(
+                self.buffer, (n % self.capacity) * self.RECORD.size)
+            word = None if word_id == self.NO_WORD else self.words[word_id]
+            events.append((self.EVENTS[event], slot_index, word, depth, elapsed_us))
+        return events
+
+    def export(self, slots: list[dict]) -> dict:
+        """Trace sérialisable (JSON) pour les statistiques de résolution ; slots désignés par leur id."""
+        return {
+            'capacity': self.capacity,
+            'recorded': self.count,
+            'dropped': self.dropped,
+            'events': [[event, None if slot_index == self.NO_SLOT else slots[slot_index].get('id', slot_index),
+                        word, depth, elapsed_us]
+                       for event, slot_index, word, depth, elapsed_us in self.events()],
+        }
+
+
+def find_blowups(events: list, top: int = 5) -> list[dict]:
+    """
+    Repère où l'arbre de recherche a explosé : pour chaque mot placé puis
+    défait (backtrack / backjump), taille du sous-arbre exploré sous lui
+    (nœuds ouverts entre le placement et son retrait). Renvoie les `top`
+    plus gros sous-arbres en échec, du plus gros au plus petit.
+
+    `events` : liste [type, slot, mot, profondeur, t_us] (SolverTrace.export()).
+    Les événements écrasés par l'anneau sont ignorés (fenêtre partielle).
+    """
+    nodes = 0
+    open_placements = []  # [(slot, mot, profondeur, nœuds au placement, t_us), ...]
+    failed = []
+    for event, slot, word, depth, elapsed_us in events:
+        if event == 'node':
+            nodes += 1
+        elif event == 'place':
+            open_placements.append((slot, word, depth, nodes, elapsed_us))
+        elif event in ('backtrack', 'backjump'):
+            # Retrait du dernier mot placé sur ce slot (les placements plus profonds sont déjà défaits)
+            while open_placements and open_placements[-1][0] != slot:
+                open_placements.pop()
+            if not open_placements:
+                continue
+            placed_slot, placed_word, placed_depth, nodes_before, started_us = open_placements.pop()
+            failed.append({
+                'slot': placed_slot, 'word': placed_word, 'depth': placed_depth,
+                'subtree_nodes': nodes - nodes_before, 'elapsed_ms': (elapsed_us - started_us) / 1000,
+            })
+        elif event == 'restart':
+            open_placements.clear()
+    failed.sort(key=lambda blowup: (-blowup['subtree_nodes'], blowup['depth']))
+    return failed[:top]
@@ -7,6 +7,9 @@ class WordRepository:
     """
     Charge et indexe tous les mots du dictionnaire pour une recherche efficace.
     """
+
+    PATTERN_CACHE_MAX = 200000  # Motifs gardés par le cache des recherches dans le Trie (vidé au-delà)
+
     def __init__(self, dela_file_path: str):
         self.trie = DictionnaireTrie()
         self._load_and_index(dela_file_path)
@@ -22,6 +25,9 @@ class WordRepository:
         # OPTIMISATION : Cache pour get_candidates
         self._candidate_cache = {}  # pattern -> list[str]
         self._cache_stats = {'hits': 0, 'misses': 0}  # Statistiques
+        # OPTIMISATION : Résultats bruts du Trie par motif, jamais invalidés (le Trie ne change
+        # pas pendant la recherche) ; peut être partagé entre les grilles d'un lot (generate_batch)
+        self._pattern_matches = {}
             
         logging.info(f"{len(self.get_all_words())} mots uniques indexés par longueur.")
 
@@ -61,8 +67,14 @@ class WordRepository:
             self._cache_stats['hits'] += 1
             return self._candidate_cache[cache_key]
         
-        # 1. Utilise le Trie pour la recherche par motif (rapide)
-        all_matching_words = self.trie.search_pattern(pattern)
+        # 1. Utilise le Trie pour la recherche par motif (mise en cache : la consommation
+        #    de mots invalide _candidate_cache, pas les mots du Trie qui suivent le motif)
+        all_matching_words = self._pattern_matches.get(pattern)
+        if all_matching_words is None:
+            all_matching_words = self.trie.search_pattern(pattern)
+            if len(self._pattern_matches) >= self.PATTERN_CACHE_MAX:
+                self._pattern_matches.clear()
+            self._pattern_matches[pattern] = all_matching_words
         
         # 2. Utilise la longueur du pattern pour trouver le SET des mots disponibles
         available_set = self.words_by_len.get(length, set())
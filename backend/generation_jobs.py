@@ -0,0 +1,169 @@
+# DANS backend/generation_jobs.py
+
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from models import db, GenerationJob
+
+DEFAULT_JOB_WORKERS = 2          # Résolutions simultanées, threads du processus web (config : GENERATION_JOB_WORKERS)
+DEFAULT_MAX_PENDING_JOBS = 32    # Jobs en file + en cours au-delà desquels on répond 503 (GENERATION_JOB_QUEUE)
+DEFAULT_JOB_TIME_BUDGET_MS = 30000  # Budget par défaut et plafond d'un job (GENERATION_JOB_TIME_BUDGET_MS)
+DEFAULT_JOB_TTL_S = 86400        # Jobs terminés gardés en base (config : GENERATION_JOB_TTL_S)
+ORPHANED_JOB_ERROR = "Job interrompu : le serveur qui l'exécutait s'est arrêté."
+
+
+class GenerationJobRunner:
+    """
+    Pool borné de workers qui résout les jobs de génération hors des threads
+    de requête : POST /grids/jobs répond tout de suite, la grille est écrite
+    dans la table generation_job (état lisible par GET /grids/jobs/<id>).
+
+    Threads plutôt que processus : la liste de mots et son Trie, construits
+    dans la requête (dictionnaire personnel en base), sont passés tels quels,
+    et les générations en flux publient leurs événements dans la file de la
+    requête. Limite : la résolution garde le GIL. Chaque worker occupé prend
+    sa part du CPU de l'interpréteur aux threads des requêtes, dont le temps
+    de calcul est multiplié par (1 + workers occupés) environ ; les requêtes
+    légères restent rapides. Le budget de temps par job borne l'occupation de
+    chaque worker et la file bornée protège le serveur ; pour isoler l'API
+    des rafales, garder GENERATION_JOB_WORKERS bas et multiplier les
+    processus WSGI.
+
+    Les générations en flux (/grids/generate/stream, /grids/batch) passent
+    par le même pool (submit_task) : pas de thread par requête, et la même
+    borne de file s'applique à toutes les résolutions en arrière-plan.
+
+    Seul le processus qui a accepté un job peut le résoudre. sweep() (au
+    démarrage et à chaque soumission) passe en 'failed' les jobs 'queued' /
+    'running' qu'aucun processus vivant ne peut encore terminer (plus anciens
+    que orphan_after(), délai maximal d'attente et de résolution d'un job),
+    et supprime les jobs terminés depuis plus de `ttl_s`.
+    """
+
+    def __init__(self, app, max_workers: int = DEFAULT_JOB_WORKERS,
+                 max_pending: int = DEFAULT_MAX_PENDING_JOBS,
+                 time_budget_ms: float = DEFAULT_JOB_TIME_BUDGET_MS, ttl_s: float = DEFAULT_JOB_TTL_S):
+        self.app = app
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.time_budget_ms = time_budget_ms
+        self.ttl_s = ttl_s
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='generation-job')
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def job_time_budget(self, requested_ms: float | None) -> float:
+        """Budget de temps effectif d'un job : celui demandé, plafonné (défaut : le plafond)."""
+        if requested_ms is None:
+            return self.time_budget_ms
+        return min(requested_ms, self.time_budget_ms)
+
+    def has_capacity(self) -> bool:
+        with self._lock:
+            return self._pending < self.max_pending
+
+    def submit(self, job_id: str, fn, *args) -> bool:
+        """
+        Planifie fn(*args) -> (corps JSON, code HTTP) pour le job `job_id`
+        (ligne déjà créée, status 'queued'). Renvoie False si la file est pleine.
+        """
+        if not self._reserve():
+            return False
+        self._executor.submit(self._run, job_id, fn, args)
+        return True
+
+    def submit_task(self, fn, *args) -> bool:
+        """
+        Planifie fn(*args) sans job en base (génération en flux ou par lot, qui
+        publie elle-même son résultat). Renvoie False si la file est pleine.
+        """
+        if not self._reserve():
+            return False
+        self._executor.submit(self._run_task, fn, args)
+        return True
+
+    def _reserve(self) -> bool:
+        """Réserve une place dans la file bornée (False si elle est pleine)."""
+        with self._lock:
+            if self._pending >= self.max_pending:
+                return False
+            self._pending += 1
+            return True
+
+    def _run_task(self, fn, args):
+        try:
+            fn(*args)
+        except Exception:
+            logging.error("Génération en arrière-plan : erreur inattendue", exc_info=True)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def _run(self, job_id: str, fn, args):
+        try:
+            with self.app.app_context():
+                job = db.session.get(GenerationJob, job_id)
+                if job is None:
+                    return
+                job.status = 'running'
+                job.started_at = datetime.utcnow()
+                db.session.commit()
+                try:
+                    payload, status = fn(*args)
+                except Exception as e:
+                    logging.error(f"Job de génération {job_id} : erreur inattendue", exc_info=True)
+                    payload, status = {"error": f"Erreur interne : {e}"[:255]}, 500
+                if status == 200:
+                    job.status = 'done'
+                    job.result = json.dumps(payload['grid'], ensure_ascii=False)
+                else:
+                    job.status = 'failed'
+                    job.error = payload.get('error', 'Échec de la génération.')
+                job.finished_at = datetime.utcnow()
+                db.session.commit()
+                logging.info(f"Job de génération {job_id} : {job.status}")
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def orphan_after(self) -> timedelta:
+        """
+        Âge au-delà duquel un job 'queued' / 'running' ne peut plus être en cours
+        dans un processus vivant : toute la file passée devant lui, puis sa propre
+        résolution, chacune bornée par le budget de temps (plus une marge).
+        """
+        rounds = -(-self.max_pending // max(self.max_workers, 1)) + 1
+        return timedelta(milliseconds=self.time_budget_ms * rounds) + timedelta(minutes=1)
+
+    def is_orphaned(self, job: GenerationJob) -> bool:
+        """Vrai si `job` est encore 'queued' / 'running' au-delà de orphan_after()."""
+        since = job.started_at if job.status == 'running' else job.created_at
+        return job.status in ('queued', 'running') and since is not None \
+            and since < datetime.utcnow() - self.orphan_after()
+
+    def sweep(self) -> dict:
+        """
+        Marque 'failed' les jobs orphelins (processus arrêté ou planté) et purge
+        les jobs terminés depuis plus de `ttl_s`. Appelant : contexte d'application.
+        Renvoie les nombres de jobs touchés.
+        """
+        now = datetime.utcnow()
+        stale = now - self.orphan_after()
+        orphaned = GenerationJob.query.filter(
+            db.or_(db.and_(GenerationJob.status == 'queued', GenerationJob.created_at < stale),
+                   db.and_(GenerationJob.status == 'running', GenerationJob.started_at < stale))
+        ).update({'status': 'failed', 'error': ORPHANED_JOB_ERROR, 'finished_at': now}, synchronize_session=False)
+        purged = GenerationJob.query.filter(
+            GenerationJob.status.in_(('done', 'failed')),
+            GenerationJob.finished_at < now - timedelta(seconds=self.ttl_s),
+        ).delete(synchronize_session=False)
+        db.session.commit()
+        if orphaned or purged:
+            logging.info(f"Jobs de génération : {orphaned} orphelin(s) marqué(s) en échec, {purged} purgé(s)")
+        return {'orphaned': orphaned, 'purged': purged}
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
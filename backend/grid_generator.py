@@ -1,6 +1,8 @@
 # DANS backend/grid_generator.py
 
+import hashlib
 import logging
+import multiprocessing
 import os
 import random
 
@@ -8,17 +10,43 @@ from engine.grid_template import GridTemplate
 from engine.slot_finder import SlotFinder
 from engine.word_repository import WordRepository
 from engine.grid_solver import GridSolver
+from engine.beam_solver import BeamSolver
+from engine.nogood_store import NogoodStore
+from engine.cancellation import CancellationToken
 from trie_engine import DictionnaireTrie # NÉCESSAIRE
 
 logger = logging.getLogger(__name__)
 
+# NOUVEAU : Portfolio parallèle - variantes du solveur réparties entre les workers
+# (la variante i est associée au seed base_seed + i)
+PORTFOLIO_VARIANTS = [
+    {'min_safe_candidates': 3, 'shuffle_top_divisor': 5, 'restarts': None},
+    {'min_safe_candidates': 3, 'shuffle_top_divisor': 5, 'restarts': 'luby'},
+    {'min_safe_candidates': 2, 'shuffle_top_divisor': 3, 'restarts': 'geometric'},
+    {'min_safe_candidates': 4, 'shuffle_top_divisor': 10, 'restarts': None},
+]
+MAX_PORTFOLIO_WORKERS = 8
+BATCH_POLL_SECONDS = 0.2  # Lot multi-processus : intervalle de vérification du jeton d'annulation
+
+# NOUVEAU : Moteurs de remplissage disponibles (même interface que GridSolver)
+SOLVER_ENGINES = ('backtracking', 'beam')
+
+# Données partagées avec les workers du portfolio (cf. _init_portfolio_worker)
+_portfolio_context = {}
+# Idem pour les workers d'un lot (cf. _init_batch_worker) : chaque worker garde son plan de lot
+_batch_context = {}
+
 class GridGenerator:
     """
     Chef d'orchestre qui pilote la création d'une grille de A à Z.
     """
     
     # 1. MODIFICATION DE LA SIGNATURE DE __init__
-    def __init__(self, width: int, height: int, valid_words: list[str], prebuilt_trie: DictionnaireTrie, seed: int = None):
+    def __init__(self, width: int, height: int, valid_words: list[str], prebuilt_trie: DictionnaireTrie, seed: int = None,
+                 template: GridTemplate | None = None, engine: str = 'backtracking',
+                 beam_width: int = BeamSolver.DEFAULT_BEAM_WIDTH,
+                 nogood_store: NogoodStore | None = None, lexicon_id: str | None = None,
+                 batch_plan: dict | None = None, finder: SlotFinder | None = None):
         """
         Initialise le générateur.
         
@@ -28,50 +56,108 @@ class GridGenerator:
             valid_words (list[str]): Liste de mots DÉJÀ FILTRÉS pour la taille de la grille.
             prebuilt_trie (DictionnaireTrie): Un Trie DÉJÀ CONSTRUIT avec les valid_words.
             seed (int, optional): Seed pour la reproductibilité.
+            template (GridTemplate, optional): Gabarit déjà construit (régénération
+                d'une grille existante) ; sinon un template est tiré au hasard.
+            engine (str): Moteur de remplissage : 'backtracking' (MRV exhaustif,
+                défaut) ou 'beam' (beam search, rapide mais incomplet).
+            beam_width (int): Largeur du faisceau du moteur 'beam'.
+            nogood_store (NogoodStore, optional): Cache de nogoods partagé entre
+                les requêtes : préchargé avant generate(), enrichi après.
+            lexicon_id (str, optional): Identifiant de la liste de mots, stable
+                d'une requête à l'autre (clé du cache de nogoods, ex. échantillon
+                du DELA tiré d'un seed). None : liste non reproductible, cache ignoré.
+            batch_plan (dict, optional): Préparation partagée par les grilles d'un
+                lot (new_batch_plan) ; remplace `valid_words` et n'est complétée
+                qu'à la première grille de chaque gabarit.
+            finder (SlotFinder, optional): Slots déjà trouvés de `template`
+                (gabarit compilé une fois, cf. compile_layout).
         """
+        if engine not in SOLVER_ENGINES:
+            raise ValueError(f"Moteur inconnu : {engine!r} (attendu : {SOLVER_ENGINES})")
         self.width = width
         self.height = height
         self.seed = seed
-        if seed is not None:
-            random.seed(seed)
-            
+        # Aléa propre à la grille (et non random.seed global, partagé entre les threads du
+        # serveur) : même seed -> même gabarit, même grille, quelles que soient les requêtes concurrentes
+        self.rng = random.Random(seed)
+
         # NOUVELLE LIGNE : On stocke le Trie pré-construit
         self.prebuilt_trie = prebuilt_trie
 
         # 1. Charger le template
-        template_path = self._find_template_path(width, height)
-        if not template_path:
-            raise RuntimeError(f"Aucun template trouvé pour la taille {width}x{height}.")
-        self.template = GridTemplate(width, height, template_path)
+        template_path = None
+        if template is None:
+            template_path = self._find_template_path(width, height, self.rng)
+            if not template_path:
+                raise RuntimeError(f"Aucun template trouvé pour la taille {width}x{height}.")
+            if batch_plan is not None and template_path in batch_plan['templates']:
+                template, finder = batch_plan['templates'][template_path]
+            else:
+                template = GridTemplate(width, height, template_path)
+        self.template = template
 
         # 2. Préparer le dictionnaire (utilise maintenant le Trie et les mots pré-filtrés)
-        self.repository = self._create_repository(valid_words)
+        self.repository = self._create_repository(valid_words, batch_plan)
 
-        # 3. Trouver les slots
-        finder = SlotFinder(self.template)
-        finder.find_all_slots()
+        # 3. Trouver les slots (lot : une fois par gabarit, le solveur copie les slots)
+        if finder is None:
+            finder = SlotFinder(self.template)
+            finder.find_all_slots()
+            if batch_plan is not None and template_path is not None:
+                batch_plan['templates'][template_path] = (self.template, finder)
 
         # 4. Initialiser le solveur
-        self.solver = GridSolver(self.template, self.repository, finder)
+        if engine == 'beam':
+            self.solver = BeamSolver(self.template, self.repository, finder, beam_width=beam_width)
+        else:
+            self.solver = GridSolver(self.template, self.repository, finder)
+        self.solver.rng = self.rng
+
+        # 5. Pré-élaguer le lexique selon le gabarit (longueurs des slots, croisements)
+        if batch_plan is None:
+            self.solver.prune_lexicon()
+        else:
+            self._apply_batch_pruning(batch_plan)
         
         self.placed_words = []
+        self.nogood_store = nogood_store
+        self.lexicon_id = lexicon_id
 
-    def _find_template_path(self, width: int, height: int) -> str | None:
-        """Trouve un fichier template au hasard pour la taille donnée."""
+    @staticmethod
+    def _find_template_path(width: int, height: int, rng=random) -> str | None:
+        """Trouve un fichier template au hasard (tiré par `rng`) pour la taille donnée."""
         template_dir = f"templates/{width}x{height}"
         if not os.path.isdir(template_dir):
             return None
-        templates = [f for f in os.listdir(template_dir) if f.endswith('.txt')]
-        return os.path.join(template_dir, random.choice(templates)) if templates else None
+        templates = sorted(f for f in os.listdir(template_dir) if f.endswith('.txt'))
+        return os.path.join(template_dir, rng.choice(templates)) if templates else None
+
+    @classmethod
+    def template_for_seed(cls, width: int, height: int, seed) -> GridTemplate | None:
+        """Gabarit que tirera GridGenerator(width, height, ..., seed=seed) (None si aucun)."""
+        template_path = cls._find_template_path(width, height, random.Random(seed))
+        return GridTemplate(width, height, template_path) if template_path else None
+
+    @staticmethod
+    def template_id(template: GridTemplate) -> str:
+        """Identifiant d'un gabarit : taille et empreinte de sa disposition (cases noires)."""
+        layout = '\n'.join(''.join(row) for row in template.grid)
+        return f"{template.width}x{template.height}-{hashlib.sha1(layout.encode('utf-8')).hexdigest()[:12]}"
 
     # 2. FONCTION _create_repository ENTIÈREMENT REMPLACÉE
-    def _create_repository(self, valid_words: list[str]) -> WordRepository:
+    def _create_repository(self, valid_words: list[str], batch_plan: dict | None = None) -> WordRepository:
         """
         Crée un repository en RÉUTILISANT le Trie pré-construit
-        et une liste de mots DÉJÀ FILTRÉS.
+        et une liste de mots DÉJÀ FILTRÉS (lot : ceux du plan, et son cache de motifs).
         """
         repo = object.__new__(WordRepository)
 
+        # Le solveur stocke une lettre par octet : on écarte les mots non encodables
+        if batch_plan is None:
+            valid_words = [w for w in valid_words if GridSolver.is_word_encodable(w)]
+        else:
+            valid_words = batch_plan['valid_words']
+
         # Réutilise le Trie au lieu d'en créer un
         repo.trie = self.prebuilt_trie 
 
@@ -91,18 +177,337 @@ class GridGenerator:
         # Initialiser le cache vide pour get_candidates
         repo._candidate_cache = {}
         repo._cache_stats = {'hits': 0, 'misses': 0}
+        repo._pattern_matches = {} if batch_plan is None else batch_plan['pattern_matches']
 
         logging.info(f"{len(valid_words)} mots pertinents indexés pour cette grille.")
         return repo
 
-    def generate(self) -> bool:
-        """Lance le solveur et récupère les résultats."""
-        success = self.solver.solve()
-        if success:
+    def _apply_batch_pruning(self, batch_plan: dict):
+        """Pré-élagage du lot : calculé à la première grille d'un gabarit, recopié ensuite."""
+        template_id = self.template_id(self.template)
+        pruned = batch_plan['pruned'].get(template_id)
+        if pruned is None:
+            self.solver.prune_lexicon()
+            batch_plan['pruned'][template_id] = (
+                {length: frozenset(words) for length, words in self.repository.words_by_len.items()},
+                {key: self.solver.metrics[key] for key in ('lexicon_before', 'lexicon_after')},
+            )
+            return
+        words_by_len, metrics = pruned
+        self.repository.words_by_len = {length: set(words) for length, words in words_by_len.items()}
+        self.solver.metrics.update(metrics)
+
+    def generate(self, propagation: str = 'fc', backjumping: bool = True,
+                 restarts: str | None = None, keep_nogoods: bool = True,
+                 time_budget_ms: float | None = None, node_budget: int | None = None,
+                 value_order: str = 'score', transpositions: bool = False,
+                 decompose: bool = False, cancel_token=None) -> bool:
+        """
+        Lance le solveur et récupère les résultats. Le moteur 'beam' n'utilise
+        que les budgets (les autres options concernent le backtracking).
+
+        Args:
+            propagation (str): Mode de propagation du solveur ('fc' ou 'ac3').
+            backjumping (bool): Active le backjumping dirigé par les conflits.
+            restarts (str | None): Politique de redémarrage ('luby', 'geometric') ou None.
+            keep_nogoods (bool): Conserver les nogoods appris entre deux redémarrages.
+            time_budget_ms (float | None): Durée maximale de la résolution.
+            node_budget (int | None): Nombre maximal de nœuds explorés.
+                Budget épuisé : la meilleure grille partielle est conservée
+                (get_grid_data()['complete'] vaut False) et generate() renvoie False.
+            value_order (str): Ordre des candidats ('score' ou 'lcv').
+            transpositions (bool): Table de transposition des états en échec.
+            decompose (bool): Résout séparément les composantes indépendantes de slots ouverts.
+            cancel_token (CancellationToken | None): Annulation coopérative (client
+                déconnecté, échéance) : arrêt comme un budget épuisé, grille partielle conservée.
+        """
+        nogood_key = self._nogood_store_key() if backjumping else None
+        if nogood_key is not None:
+            self.solver.preload_nogoods(self.nogood_store.get(nogood_key))
+
+        success = self.solver.solve(propagation=propagation, backjumping=backjumping,
+                                    restarts=restarts, keep_nogoods=keep_nogoods,
+                                    time_budget_ms=time_budget_ms, node_budget=node_budget,
+                                    value_order=value_order, transpositions=transpositions,
+                                    decompose=decompose, cancel_token=cancel_token)
+        if nogood_key is not None:
+            exported = self.solver.export_nogoods()
+            self.solver.metrics['shared_nogoods_stored'] = self.nogood_store.add(nogood_key, exported)
+        if success or self.is_incomplete:
             # On trie les mots dans l'ordre de leur slot pour un affichage cohérent
             self.placed_words = sorted(self.solver.placed_words, key=lambda p: p['id'])
         return success
 
+    def _nogood_store_key(self) -> str | None:
+        """
+        Clé du cache de nogoods pour ce problème, ou None si le cache est sans
+        objet : pas de store, liste de mots sans identifiant (échantillon
+        aléatoire, jamais revu), moteur beam (aucun nogood appris) ou grille
+        pré-remplie (mots imposés, cases verrouillées), dont les nogoods
+        dépendent des lettres imposées et du forward checking assoupli.
+        """
+        solver = self.solver
+        if self.nogood_store is None or self.lexicon_id is None or isinstance(solver, BeamSolver) \
+                or solver.forced_words or solver.locked_cells:
+            return None
+        search_policy = f"safe{solver.MIN_SAFE_CANDIDATES}-cap{solver.MAX_CANDIDATES_PER_SLOT}"
+        return NogoodStore.make_key(self.template_id(self.template), self.lexicon_id, search_policy)
+
+    def place_forced_words(self, words: list[str]) -> bool:
+        """
+        Pré-place les mots imposés (story B1) avant generate() : positions
+        compatibles trouvées par une recherche de faisabilité, puis propagation
+        initiale sur toute la grille. Renvoie False si aucune position ne convient.
+        Lève ValueError si un mot est absent du dictionnaire de la grille.
+        """
+        return self.solver.place_forced_words(words)
+
+    # ---------------------------------------------------------
+    # NOUVEAU : Régénération partielle d'une grille existante
+    # ---------------------------------------------------------
+    @staticmethod
+    def grid_layout(grid_data: dict) -> tuple[int, int, tuple[str, ...]]:
+        """
+        Taille et disposition (lignes, '#' pour une case noire) d'une grille
+        exportée par get_grid_data(), clé de son gabarit compilé.
+        Lève ValueError si la grille est mal formée (case manquante, en double,
+        hors grille ou incomplète).
+        """
+        if not isinstance(grid_data, dict):
+            raise ValueError("Grille mal formée.")
+        width, height, cells = grid_data.get('width'), grid_data.get('height'), grid_data.get('cells')
+        if not all(isinstance(v, int) and not isinstance(v, bool) and v > 0 for v in (width, height)) \
+                or not isinstance(cells, list) or len(cells) != width * height:
+            raise ValueError("Grille mal formée : taille ou nombre de cases incorrect.")
+        layout = [[None] * width for _ in range(height)]
+        for cell in cells:
+            if not isinstance(cell, dict) or not isinstance(cell.get('is_black'), bool) \
+                    or not isinstance(cell.get('char'), str):
+                raise ValueError(f"Case mal formée : {cell!r}")
+            x, y = cell.get('x'), cell.get('y')
+            if not (isinstance(x, int) and isinstance(y, int) and 0 <= x < width and 0 <= y < height) \
+                    or isinstance(x, bool) or isinstance(y, bool) or layout[y][x] is not None:
+                raise ValueError(f"Case hors grille ou en double : {cell!r}")
+            layout[y][x] = GridTemplate.BLACK_SQUARE if cell['is_black'] else GridTemplate.EMPTY_CELL
+        return width, height, tuple(''.join(row) for row in layout)
+
+    @staticmethod
+    def compile_layout(width: int, height: int, rows: tuple[str, ...]) -> tuple[GridTemplate, SlotFinder]:
+        """Gabarit et slots d'une disposition (grid_layout()), réutilisables d'une génération à l'autre."""
+        template = GridTemplate(width, height)
+        template.grid = [list(row) for row in rows]
+        finder = SlotFinder(template)
+        finder.find_all_slots()
+        return template, finder
+
+    @classmethod
+    def from_grid_data(cls, grid_data: dict, valid_words: list[str], prebuilt_trie: DictionnaireTrie,
+                       seed: int | None = None, compiled: tuple[GridTemplate, SlotFinder] | None = None
+                       ) -> 'GridGenerator':
+        """
+        Générateur sur le gabarit d'une grille exportée par get_grid_data()
+        (mêmes cases noires, donc mêmes slots et mêmes identifiants de slots).
+        `compiled` : gabarit déjà compilé (compile_layout()), sinon compilé ici.
+        Les lettres ne sont pas reprises : voir lock_region().
+        Lève ValueError si la grille est mal formée.
+        """
+        layout = cls.grid_layout(grid_data)
+        template, finder = compiled if compiled is not None else cls.compile_layout(*layout)
+        return cls(layout[0], layout[1], valid_words, prebuilt_trie, seed=seed, template=template, finder=finder)
+
+    def lock_region(self, grid_data: dict, locked_slots=(), locked_cells=()) -> bool:
+        """
+        Verrouille les lettres de `grid_data` sur les slots `locked_slots`
+        (identifiants des mots de grid_data['words']) et les cases
+        `locked_cells` ((x, y)) ; generate() ne remplit ensuite que le reste.
+        Renvoie False si les cases verrouillées ne laissent aucune solution.
+        Lève ValueError pour un slot inconnu ou une case vide, noire ou hors grille.
+        """
+        letters = {(cell['x'], cell['y']): cell['char'] for cell in grid_data['cells']}
+        slots_by_id = {slot['id']: slot for slot in self.solver.slots}
+        positions = set()
+        for position in locked_cells:
+            if not isinstance(position, (list, tuple)) or len(position) != 2 \
+                    or not all(isinstance(v, int) for v in position):
+                raise ValueError(f"Case verrouillée mal formée : {position!r}")
+            positions.add(tuple(position))
+        for slot_id in locked_slots:
+            slot = slots_by_id.get(slot_id) if isinstance(slot_id, int) else None
+            if slot is None:
+                raise ValueError(f"Slot verrouillé inconnu : {slot_id!r}")
+            positions.update((offset % self.width, offset // self.width) for offset in slot['offsets'])
+        for position in positions:
+            if not letters.get(position):
+                raise ValueError(f"Case verrouillée sans lettre : {position}")
+        return self.solver.lock_cells({position: letters[position] for position in positions})
+
+    @property
+    def is_incomplete(self) -> bool:
+        """Vrai si le budget a expiré : la grille exportée est une solution partielle."""
+        return self.solver.status == GridSolver.STATUS_INCOMPLETE
+
+    # ---------------------------------------------------------
+    # NOUVEAU : Portfolio parallèle (plusieurs cœurs pour une grille)
+    # ---------------------------------------------------------
+    @staticmethod
+    def portfolio_configs(workers: int, base_seed: int | None = None) -> list[dict]:
+        """
+        Construit `workers` configurations diversifiées : seeds consécutifs,
+        seuil de forward checking, part du top mélangée et politique de redémarrage.
+        """
+        if base_seed is None:
+            base_seed = random.randrange(2 ** 31)
+        return [
+            {'seed': base_seed + i, **PORTFOLIO_VARIANTS[i % len(PORTFOLIO_VARIANTS)]}
+            for i in range(workers)
+        ]
+
+    @classmethod
+    def run_config(cls, width: int, height: int, valid_words: list[str],
+                   prebuilt_trie: DictionnaireTrie, config: dict,
+                   time_budget_ms: float | None = None,
+                   forced_words: list[str] | None = None) -> dict | None:
+        """
+        Génère une grille avec une configuration du portfolio et renvoie ses
+        données (ou None en cas d'échec). Rejouer la configuration gagnante
+        (config['seed'] compris) redonne la même grille.
+        Budget épuisé : renvoie la grille partielle (data['complete'] False).
+        """
+        generator = cls(width, height, valid_words, prebuilt_trie=prebuilt_trie, seed=config['seed'])
+        generator.solver.MIN_SAFE_CANDIDATES = config['min_safe_candidates']
+        generator.solver.SHUFFLE_TOP_DIVISOR = config['shuffle_top_divisor']
+        if forced_words and not generator.place_forced_words(forced_words):
+            return None
+        if not generator.generate(restarts=config['restarts'], time_budget_ms=time_budget_ms) \
+                and not generator.is_incomplete:
+            return None
+        return generator.get_grid_data()
+
+    @classmethod
+    def generate_portfolio(cls, width: int, height: int, valid_words: list[str],
+                           prebuilt_trie: DictionnaireTrie, workers: int = 4,
+                           seed: int | None = None, time_budget_ms: float | None = None,
+                           forced_words: list[str] | None = None) -> dict | None:
+        """
+        Lance `workers` configurations diversifiées en parallèle (un processus
+        chacune) et renvoie les données de la première grille réussie ; les
+        autres processus sont alors arrêtés. Renvoie None si toutes échouent.
+
+        Les données contiennent le seed gagnant ('seed') et sa configuration
+        complète ('portfolio'), pour rejouer la grille avec run_config().
+
+        Avec `time_budget_ms`, si aucune configuration n'aboutit dans le budget,
+        la grille partielle la plus remplie est renvoyée (data['complete'] False).
+        Les `forced_words` sont pré-placés par chaque configuration.
+        """
+        workers = max(1, min(workers, MAX_PORTFOLIO_WORKERS))
+        configs = cls.portfolio_configs(workers, seed)
+        logging.info(f"Portfolio : {workers} configurations lancées en parallèle ({width}x{height})")
+
+        trie_words = prebuilt_trie.get_words_in_trie_order()
+        pool = _worker_context().Pool(workers, initializer=_init_portfolio_worker,
+                                      initargs=(cls, width, height, valid_words, trie_words, time_budget_ms, forced_words))
+        try:
+            best_partial = None
+            for config, grid_data in pool.imap_unordered(_run_portfolio_config, configs):
+                if grid_data is None:
+                    continue
+                grid_data['portfolio'] = {'workers': workers, 'winner': config}
+                if grid_data['complete']:
+                    logging.info(f"Portfolio : grille trouvée par la configuration {config}")
+                    return grid_data
+                if best_partial is None or grid_data['fill_ratio'] > best_partial['fill_ratio']:
+                    best_partial = grid_data
+            if best_partial is None:
+                logging.info("Portfolio : toutes les configurations ont échoué.")
+            return best_partial
+        finally:
+            # Annule les configurations encore en cours
+            pool.terminate()
+            pool.join()
+
+    # ---------------------------------------------------------
+    # NOUVEAU : Génération par lots
+    # ---------------------------------------------------------
+    @staticmethod
+    def new_batch_plan(valid_words: list[str]) -> dict:
+        """
+        Préparation partagée par les grilles d'un lot (même taille, même liste
+        de mots) : mots encodables filtrés une fois, gabarits chargés et slots
+        trouvés, lexique pré-élagué par gabarit, et cache des recherches de
+        motifs dans le Trie (WordRepository._pattern_matches).
+        """
+        return {
+            'valid_words': [w for w in valid_words if GridSolver.is_word_encodable(w)],
+            'templates': {},        # chemin -> (GridTemplate, SlotFinder)
+            'pruned': {},           # id du gabarit -> (mots par longueur, métriques de l'élagage)
+            'pattern_matches': {},  # motif -> mots du Trie
+        }
+
+    @classmethod
+    def run_batch_grid(cls, width: int, height: int, prebuilt_trie: DictionnaireTrie, batch_plan: dict,
+                       seed: int, time_budget_ms: float | None = None, cancel_token=None) -> dict | None:
+        """Génère une grille d'un lot ; grille partielle si le budget est épuisé, None en cas d'échec."""
+        generator = cls(width, height, batch_plan['valid_words'], prebuilt_trie=prebuilt_trie, seed=seed,
+                        batch_plan=batch_plan)
+        if not generator.generate(time_budget_ms=time_budget_ms, cancel_token=cancel_token) \
+                and not generator.is_incomplete:
+            return None
+        return generator.get_grid_data()
+
+    @classmethod
+    def generate_batch(cls, width: int, height: int, valid_words: list[str],
+                       prebuilt_trie: DictionnaireTrie, count: int, seed: int | None = None,
+                       workers: int = 1, time_budget_ms: float | None = None, cancel_token=None):
+        """
+        Génère `count` grilles de la même taille (seeds seed, seed + 1, ...) et
+        les rend au fil de l'eau : générateur de (indice, données de la grille
+        ou None en cas d'échec), dans l'ordre d'achèvement.
+
+        Le travail commun (new_batch_plan) est fait une fois par processus ;
+        avec `workers` > 1, un seul pool de processus sert tout le lot.
+        Fermer le générateur (close()) arrête les grilles encore en cours.
+        `time_budget_ms` est le budget de chaque grille ; `cancel_token`
+        interrompt les grilles en cours (avec plusieurs workers, son échéance
+        et son annulation sont relayées aux processus par un Event partagé).
+        """
+        if seed is None:
+            seed = random.randrange(2 ** 31)
+        jobs = [(index, seed + index) for index in range(count)]
+        workers = max(1, min(workers, count, MAX_PORTFOLIO_WORKERS))
+        logging.info(f"Lot : {count} grilles {width}x{height}, {workers} worker(s), seeds {seed}..{seed + count - 1}")
+
+        if workers == 1:
+            batch_plan = cls.new_batch_plan(valid_words)
+            for index, grid_seed in jobs:
+                yield index, cls.run_batch_grid(width, height, prebuilt_trie, batch_plan, grid_seed,
+                                                time_budget_ms, cancel_token)
+            return
+
+        context = _worker_context()
+        stop_event = context.Event()
+        deadline = cancel_token.deadline if cancel_token is not None else None
+        trie_words = prebuilt_trie.get_words_in_trie_order()
+        pool = context.Pool(workers, initializer=_init_batch_worker,
+                            initargs=(cls, width, height, valid_words, trie_words, time_budget_ms, deadline, stop_event))
+        try:
+            results = pool.imap_unordered(_run_batch_grid, jobs)
+            for _ in jobs:
+                while True:
+                    # Annulation côté requête (client parti) : relayée aux workers, qui
+                    # rendent aussitôt leur grille partielle
+                    if cancel_token is not None and cancel_token.cancelled:
+                        stop_event.set()
+                    try:
+                        item = results.next(timeout=BATCH_POLL_SECONDS)
+                        break
+                    except multiprocessing.TimeoutError:
+                        continue
+                yield item
+        finally:
+            pool.terminate()
+            pool.join()
+
 
     # ---------------------------------------------------------
     # 2. Données de sortie (INCHANGÉ)
@@ -146,7 +551,67 @@ class GridGenerator:
             "width": self.width,
             "height": self.height,
             "fill_ratio": round(fill_ratio, 3),
+            "complete": self.solver.status == GridSolver.STATUS_SOLVED,
             "cells": cells,
             "words": self.placed_words,
             "statistics": stats,  # Ajout des statistiques
-        }
\ No newline at end of file
+        }
+
+
+def _worker_context():
+    """
+    Contexte des pools du portfolio et des lots : 'forkserver' (sinon 'spawn'),
+    jamais 'fork'. Ces pools sont créés depuis les threads des requêtes : un
+    fork copierait les verrous tenus à cet instant par les autres threads
+    (logging, base, caches) et le worker pourrait s'y bloquer. Les données
+    sont donc sérialisées : les mots du Trie, dans son ordre, plutôt que le
+    Trie, reconstruit par chaque worker (plus rapide que de désérialiser ses nœuds).
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+
+def _build_trie(words: list[str]) -> DictionnaireTrie:
+    """Reconstruit dans un worker le Trie de la génération à partir de ses mots."""
+    trie = DictionnaireTrie()
+    for word in words:
+        trie.insert(word)
+    return trie
+
+
+def _init_portfolio_worker(generator_cls, width, height, valid_words, trie_words, time_budget_ms,
+                           forced_words=None):
+    """Initialise un worker du portfolio avec les données communes à toutes les configurations."""
+    _portfolio_context.update(generator_cls=generator_cls, width=width, height=height,
+                              valid_words=valid_words, prebuilt_trie=_build_trie(trie_words),
+                              time_budget_ms=time_budget_ms, forced_words=forced_words)
+
+
+def _run_portfolio_config(config: dict) -> tuple[dict, dict | None]:
+    """Exécute une configuration dans un worker (fonction de module : sérialisable)."""
+    ctx = _portfolio_context
+    grid_data = ctx['generator_cls'].run_config(ctx['width'], ctx['height'], ctx['valid_words'],
+                                                ctx['prebuilt_trie'], config, ctx['time_budget_ms'],
+                                                ctx['forced_words'])
+    return config, grid_data
+
+
+def _init_batch_worker(generator_cls, width, height, valid_words, trie_words, time_budget_ms,
+                       deadline=None, stop_event=None):
+    """
+    Initialise un worker de lot : son plan (new_batch_plan) sert à toutes ses
+    grilles ; son jeton d'annulation suit l'échéance et l'Event du lot.
+    """
+    _batch_context.update(generator_cls=generator_cls, width=width, height=height,
+                          prebuilt_trie=_build_trie(trie_words), time_budget_ms=time_budget_ms,
+                          batch_plan=generator_cls.new_batch_plan(valid_words),
+                          cancel_token=CancellationToken(deadline, event=stop_event))
+
+
+def _run_batch_grid(job: tuple[int, int]) -> tuple[int, dict | None]:
+    """Génère la grille (indice, seed) d'un lot dans un worker (fonction de module : sérialisable)."""
+    index, seed = job
+    ctx = _batch_context
+    return index, ctx['generator_cls'].run_batch_grid(ctx['width'], ctx['height'], ctx['prebuilt_trie'],
+                                                      ctx['batch_plan'], seed, ctx['time_budget_ms'],
+                                                      ctx['cancel_token'])
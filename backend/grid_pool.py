@@ -0,0 +1,216 @@
+# DANS backend/grid_pool.py
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+from engine.cancellation import CancellationToken
+
+DEFAULT_POOL_TARGET = 4          # Grilles prêtes par taille (GridPool ; config : GRID_POOL_TARGET, réserve désactivée sans)
+DEFAULT_POOL_IDLE_MS = 500       # Calme exigé avant un remplissage (config : GRID_POOL_IDLE_MS)
+POOL_POLL_SECONDS = 0.25         # Réveil du thread de remplissage quand il n'a rien à faire
+DEFAULT_POOL_BACKOFF_MS = 5000   # Attente après un échec, doublée à chaque échec suivant (config : GRID_POOL_BACKOFF_MS)
+POOL_BACKOFF_MAX_MS = 600000     # Plafond de cette attente
+
+
+def template_sizes(template_root: str = 'templates') -> list[tuple[int, int]]:
+    """Tailles (largeur, hauteur) pour lesquelles un gabarit existe (dossiers templates/<L>x<H>)."""
+    if not os.path.isdir(template_root):
+        return []
+    sizes = []
+    for name in sorted(os.listdir(template_root)):
+        width, _, height = name.partition('x')
+        if width.isdigit() and height.isdigit():
+            sizes.append((int(width), int(height)))
+    return sizes
+
+
+class GridPool:
+    """
+    Réserve bornée de grilles déjà générées, par (taille, version du lexique),
+    servies sans résolution par /grids/generate aux requêtes sans seed ni
+    contrainte personnelle (DELA seul, pas de mots imposés, moteur par défaut).
+
+    Un thread de fond la remplit pendant les périodes calmes : aucune
+    génération en cours (busy()) depuis `idle_ms`. Un remplissage déjà lancé
+    quand une génération commence est annulé (jeton d'annulation) pour lui
+    rendre le CPU. Chaque grille garde son gabarit (tiré au hasard par
+    GridGenerator) ; une grille dont la version du lexique n'est plus la
+    version courante n'est jamais servie.
+
+    Les tailles les plus en retard sont servies à tour de rôle ; une taille
+    dont le remplissage échoue est mise de côté `backoff_ms`, durée doublée
+    à chaque nouvel échec (plafond POOL_BACKOFF_MAX_MS), pour ne pas
+    relancer sans fin une résolution vouée à l'échec.
+
+    `generate_fn(width, height, cancel_token)` renvoie les données d'une
+    grille complète (GridGenerator.get_grid_data()) ou None.
+
+    Chaque processus a sa propre réserve : create_app ne la lance que si
+    GRID_POOL_TARGET est défini, à réserver à un seul processus.
+    """
+
+    def __init__(self, generate_fn, sizes, lexicon_version: str,
+                 target: int = DEFAULT_POOL_TARGET, idle_ms: float = DEFAULT_POOL_IDLE_MS,
+                 backoff_ms: float = DEFAULT_POOL_BACKOFF_MS):
+        self.generate_fn = generate_fn
+        self.sizes = list(sizes)
+        self.lexicon_version = lexicon_version
+        self.target = target
+        self.idle_ms = idle_ms
+        self.backoff_ms = backoff_ms
+        self._grids = {}           # (largeur, hauteur, version du lexique) -> deque de grilles
+        self._deficit_since = {}   # clé -> instant (monotonic) où la réserve est passée sous la cible
+        self._busy = 0
+        self._last_activity = 0.0
+        self._refill_token = None   # Jeton du remplissage en cours (annulé par busy())
+        self._failures = {}         # clé -> échecs consécutifs
+        self._retry_at = {}         # clé -> instant (monotonic) avant lequel la taille est mise de côté
+        self._last_size = None      # Dernière taille remplie (tour de rôle entre tailles à égalité)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.stats = {'hits': 0, 'misses': 0, 'refills': 0, 'refill_failures': 0, 'refill_cancellations': 0,
+                      'refill_lag_ms_last': None, 'refill_lag_ms_max': 0.0}
+        now = time.monotonic()
+        for width, height in self.sizes:
+            self._deficit_since[self._key(width, height)] = now
+
+    def _key(self, width: int, height: int) -> tuple:
+        return (width, height, self.lexicon_version)
+
+    # ---------------------------------------------------------
+    # Côté requêtes
+    # ---------------------------------------------------------
+    def take(self, width: int, height: int) -> dict | None:
+        """Retire une grille prête de cette taille (None si la réserve est vide : miss)."""
+        key = self._key(width, height)
+        with self._lock:
+            grids = self._grids.get(key)
+            if not grids:
+                self.stats['misses'] += 1
+                return None
+            grid = grids.popleft()
+            self.stats['hits'] += 1
+            self._deficit_since.setdefault(key, time.monotonic())
+        return grid
+
+    @contextmanager
+    def busy(self):
+        """
+        Marque une génération en cours (requête, flux, lot ou job) : le
+        remplissage en cours est annulé et le suivant attend la fin.
+        """
+        with self._lock:
+            self._busy += 1
+            if self._refill_token is not None:
+                self._refill_token.cancel()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._busy -= 1
+                self._last_activity = time.monotonic()
+
+    def is_idle(self) -> bool:
+        with self._lock:
+            return self._busy == 0 and (time.monotonic() - self._last_activity) * 1000 >= self.idle_ms
+
+    def snapshot(self) -> dict:
+        """
+        Métriques (hits / misses, remplissages, retard de remplissage), grilles
+        prêtes par taille et tailles mises de côté après un échec.
+        """
+        now = time.monotonic()
+        with self._lock:
+            ready = {f"{width}x{height}": len(self._grids.get(self._key(width, height), ()))
+                     for width, height in self.sizes}
+            backing_off = [f"{width}x{height}" for width, height in self.sizes
+                           if self._retry_at.get(self._key(width, height), 0) > now]
+            return {**self.stats, 'target': self.target, 'ready': ready, 'backing_off': backing_off}
+
+    # ---------------------------------------------------------
+    # Remplissage
+    # ---------------------------------------------------------
+    def _next_size(self) -> tuple[int, int] | None:
+        """
+        Taille la plus en retard sur la cible, hors tailles mises de côté après
+        un échec ; à égalité, la suivante de la dernière remplie (tour de rôle).
+        None si la réserve est pleine ou si toutes les tailles en retard attendent.
+        """
+        now = time.monotonic()
+        with self._lock:
+            start = self.sizes.index(self._last_size) + 1 if self._last_size in self.sizes else 0
+            rotation = self.sizes[start:] + self.sizes[:start]
+            missing = [(len(self._grids.get(self._key(w, h), ())), rank, (w, h))
+                       for rank, (w, h) in enumerate(rotation)
+                       if self._retry_at.get(self._key(w, h), 0) <= now]
+        missing = [item for item in missing if item[0] < self.target]
+        return min(missing)[2] if missing else None
+
+    def refill_once(self) -> bool:
+        """Génère une grille pour la taille la plus en retard. Renvoie False si rien à faire ou échec."""
+        size = self._next_size()
+        if size is None:
+            return False
+        width, height = size
+        token = CancellationToken()
+        with self._lock:
+            self._refill_token = token
+            if self._busy:  # Génération arrivée depuis is_idle()
+                token.cancel()
+        try:
+            grid = self.generate_fn(width, height, token)
+        except Exception:
+            logging.error(f"Réserve de grilles : échec du remplissage {width}x{height}", exc_info=True)
+            grid = None
+        key = self._key(width, height)
+        with self._lock:
+            self._refill_token = None
+            self._last_size = size
+            if token.cancelled:
+                self.stats['refill_cancellations'] += 1
+                return False
+            if grid is None:
+                # Échec : taille mise de côté, de plus en plus longtemps si elle échoue encore
+                failures = self._failures[key] = self._failures.get(key, 0) + 1
+                delay_ms = min(self.backoff_ms * 2 ** (failures - 1), POOL_BACKOFF_MAX_MS)
+                self._retry_at[key] = time.monotonic() + delay_ms / 1000
+                self.stats['refill_failures'] += 1
+                logging.info(f"Réserve de grilles : {width}x{height} mise de côté {delay_ms / 1000:.0f} s "
+                             f"({failures} échec(s) consécutif(s))")
+                return False
+            self._failures.pop(key, None)
+            self._retry_at.pop(key, None)
+            grids = self._grids.setdefault(key, deque())
+            grids.append(grid)
+            self.stats['refills'] += 1
+            if len(grids) >= self.target and key in self._deficit_since:
+                lag_ms = (time.monotonic() - self._deficit_since.pop(key)) * 1000
+                self.stats['refill_lag_ms_last'] = round(lag_ms, 1)
+                self.stats['refill_lag_ms_max'] = round(max(self.stats['refill_lag_ms_max'], lag_ms), 1)
+        return True
+
+    def _run(self):
+        while not self._stop.is_set():
+            if not self.is_idle() or not self.refill_once():
+                self._stop.wait(POOL_POLL_SECONDS)
+
+    def start(self):
+        """Lance le thread de remplissage (démon)."""
+        if self._thread is None and self.sizes:
+            self._thread = threading.Thread(target=self._run, name='grid-pool', daemon=True)
+            self._thread.start()
+            logging.info(f"Réserve de grilles : {self.target} par taille pour "
+                         f"{', '.join(f'{w}x{h}' for w, h in self.sizes)}.")
+
+    def stop(self):
+        self._stop.set()
+
+
+def pool_busy(pool: GridPool | None):
+    """pool.busy(), ou un contexte neutre sans réserve."""
+    return pool.busy() if pool is not None else nullcontext()
@@ -1,5 +1,6 @@
 # DANS backend/models.py
 
+import json
 from datetime import datetime
 from extensions import db # MODIFICATION ICI : On importe 'db' depuis notre fichier central
 
@@ -58,4 +59,48 @@ class PersonalWord(db.Model):
             'definition': self.definition,
             'source': 'PERSONNEL',
             'date_ajout': self.date_ajout.isoformat() if self.date_ajout else None
-        }
\ No newline at end of file
+        }
+
+# NOUVEAU : Génération asynchrone (POST /grids/jobs), exécutée par generation_jobs.GenerationJobRunner
+class GenerationJob(db.Model):
+    __tablename__ = 'generation_job'
+    id = db.Column(db.String(32), primary_key=True)  # uuid4 hex
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)  # None = job anonyme
+    status = db.Column(db.String(16), nullable=False, default='queued')  # queued, running, done, failed
+    params = db.Column(db.Text, nullable=False)  # Paramètres validés (JSON)
+    result = db.Column(db.Text, nullable=True)   # Grille (JSON) si status == 'done'
+    error = db.Column(db.String(255), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<GenerationJob {self.id} ({self.status})>"
+
+    def to_json(self):
+        data = {
+            'job_id': self.id,
+            'status': self.status,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+        }
+        if self.result is not None:
+            data['grid'] = json.loads(self.result)
+        if self.error is not None:
+            data['error'] = self.error
+        return data
+
+# NOUVEAU : Cache des grilles déterministes (result_cache.ResultCache), persistance optionnelle
+class CachedGrid(db.Model):
+    __tablename__ = 'cached_grid'
+    key = db.Column(db.String(40), primary_key=True)  # SHA-1 de ResultCache.make_key()
+    width = db.Column(db.Integer, nullable=False)
+    height = db.Column(db.Integer, nullable=False)
+    rows = db.Column(db.Text, nullable=False)   # Lignes de la grille (JSON), '#' = case noire
+    words = db.Column(db.Text, nullable=False)  # Mots placés (JSON)
+    seed = db.Column(db.String(64), nullable=True)  # Seed (JSON)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<CachedGrid {self.key} ({self.width}x{self.height})>"
@@ -0,0 +1,121 @@
+# DANS backend/result_cache.py
+
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+
+from models import db, CachedGrid
+
+DEFAULT_RESULT_CACHE_SIZE = 512  # Grilles gardées en mémoire (config : RESULT_CACHE_SIZE)
+
+
+class ResultCache:
+    """
+    Cache des grilles reproductibles : une génération avec seed est
+    déterministe (gabarit, échantillon du DELA et mélange des candidats tirés
+    de ce seed), la même requête (lien partagé, rechargement de page) renvoie
+    donc la même grille sans nouvelle résolution.
+
+    Clé : taille, gabarit, seed, version du lexique (DELA), révision du
+    dictionnaire personnel et paramètres de recherche (moteur, mots imposés).
+    Seules les grilles complètes sont gardées, sous forme compacte (lignes +
+    mots placés) dans un LRU borné ; en option (`persist`), aussi dans la
+    table cached_grid, relue après un redémarrage ou depuis un autre processus.
+    Les accès à la base se font dans le contexte de la requête.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_RESULT_CACHE_SIZE, persist: bool = False):
+        self.max_entries = max_entries
+        self.persist = persist
+        self._entries = OrderedDict()  # clé -> grille compacte, du plus ancien au plus récent
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'db_hits': 0, 'misses': 0, 'stored': 0, 'evicted': 0}
+
+    @staticmethod
+    def make_key(width: int, height: int, template_id: str, seed, lexicon_version: str,
+                 dictionary_revision: str, search_policy: str) -> str:
+        """Clé (SHA-1) d'une génération reproductible."""
+        raw = json.dumps([width, height, template_id, seed, lexicon_version, dictionary_revision, search_policy],
+                         ensure_ascii=False)
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def pack(grid_data: dict) -> dict:
+        """Forme compacte d'une grille (GridGenerator.get_grid_data()) : lignes et mots placés."""
+        width = grid_data['width']
+        chars = ['#' if cell['is_black'] else cell['char'] for cell in grid_data['cells']]
+        return {
+            'width': width, 'height': grid_data['height'], 'seed': grid_data.get('seed'),
+            'rows': [''.join(chars[y * width:(y + 1) * width]) for y in range(grid_data['height'])],
+            'words': grid_data['words'],
+        }
+
+    @staticmethod
+    def unpack(entry: dict) -> dict:
+        """Reconstruit les données de la grille (même forme que get_grid_data(), statistiques réduites)."""
+        cells = [{"x": x, "y": y, "char": "" if char == '#' else char, "is_black": char == '#'}
+                 for y, row in enumerate(entry['rows']) for x, char in enumerate(row)]
+        return {
+            "seed": entry['seed'],
+            "width": entry['width'],
+            "height": entry['height'],
+            "fill_ratio": 1.0,
+            "complete": True,
+            "cells": cells,
+            "words": entry['words'],
+            "statistics": {"cached": True},
+        }
+
+    def get(self, key: str) -> dict | None:
+        """Grille en cache pour `key` (mémoire, puis base si `persist`), ou None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.stats['hits'] += 1
+                return self.unpack(entry)
+        if self.persist:
+            row = db.session.get(CachedGrid, key)
+            if row is not None:
+                entry = {'width': row.width, 'height': row.height, 'seed': json.loads(row.seed),
+                         'rows': json.loads(row.rows), 'words': json.loads(row.words)}
+                with self._lock:
+                    self._insert(key, entry)
+                    self.stats['db_hits'] += 1
+                return self.unpack(entry)
+        with self._lock:
+            self.stats['misses'] += 1
+        return None
+
+    def put(self, key: str, grid_data: dict):
+        """Garde une grille complète sous `key` (ignorée sinon)."""
+        if not grid_data.get('complete'):
+            return
+        entry = self.pack(grid_data)
+        with self._lock:
+            self._insert(key, entry)
+            self.stats['stored'] += 1
+        if self.persist and db.session.get(CachedGrid, key) is None:
+            db.session.add(CachedGrid(key=key, width=entry['width'], height=entry['height'],
+                                      rows=json.dumps(entry['rows'], ensure_ascii=False),
+                                      words=json.dumps(entry['words'], ensure_ascii=False),
+                                      seed=json.dumps(entry['seed'])))
+            try:
+                db.session.commit()
+            except Exception as e:  # Même clé écrite entre-temps par un autre processus
+                db.session.rollback()
+                logging.warning(f"Cache de grilles : écriture en base ignorée ({e})")
+
+    def _insert(self, key: str, entry: dict):
+        """Insère en respectant la borne du LRU (appelant : self._lock tenu)."""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats['evicted'] += 1
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
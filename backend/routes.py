@@ -1,18 +1,36 @@
 # DANS backend/routes.py
 
+import functools
+import json
+import logging
+import os
+import queue
 import random
 import unicodedata
-from flask import Blueprint, jsonify, request, current_app
+import uuid
+from flask import Blueprint, Response, jsonify, request, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from sqlalchemy import func
 
 # On importe depuis nos modules centraux
-from models import db, User, Dictionary, PersonalWord
-from grid_generator import GridGenerator
+from models import db, User, Dictionary, PersonalWord, GenerationJob
+from grid_generator import GridGenerator, MAX_PORTFOLIO_WORKERS, SOLVER_ENGINES
+from engine.grid_solver import GridSolver
+from engine.beam_solver import BeamSolver
+from engine.cancellation import CancellationToken
+from engine.nogood_store import NogoodStore
+from trie_engine import DictionnaireTrie
+from grid_pool import pool_busy
 
 # On crée un nouveau Blueprint pour les routes principales
 main_bp = Blueprint('main', __name__, url_prefix='/api')
 
+DELA_SAMPLE_SIZE = 30000  # Mots du DELA tirés au hasard pour chaque génération
+SSE_KEEPALIVE_SECONDS = 15  # Commentaire SSE envoyé si aucun événement (proxys, timeouts)
+DEADLINE_HEADER = 'X-Deadline-Ms'  # Délai accordé par le client à la génération (ms)
+DEFAULT_MAX_SOLVE_MS = 60000  # Plafond serveur d'une génération synchrone (config : GENERATION_MAX_SOLVE_MS)
+MAX_BATCH_GRIDS = 50  # Grilles au plus par lot (POST /grids/batch)
+
 # --- FONCTIONS UTILITAIRES ---
 def normalize_pattern(text):
     if not isinstance(text, str): return ""
@@ -151,37 +169,548 @@ def search_words():
     limit = min(int(data.get("limit", 200)), 500)
     return jsonify({"results": final_results[:limit]}), 200
 
-@main_bp.route('/grids/generate', methods=['POST'])
-@jwt_required(optional=True)
-def generate_grid():
-    user = get_current_user()
+def sample_dela_words(dela_trie, max_len, seed=None):
+    """
+    Échantillon aléatoire du DELA (DELA_SAMPLE_SIZE mots), limité aux longueurs 2..max_len.
+    Avec un seed, l'échantillon est reproductible (même seed -> mêmes mots).
+    """
+    rng = random if seed is None else random.Random(seed)
+    all_dela_words = dela_trie.get_sorted_words()
+    dela_sample = rng.sample(all_dela_words, min(DELA_SAMPLE_SIZE, len(all_dela_words)))
+    return [w for w in dela_sample if len(w) >= 2 and len(w) <= max_len]
+
+def build_generation_words(data, user, width, height, forced_words=()):
+    """
+    Construit la liste de mots d'une génération (échantillon du DELA + dictionnaire
+    personnel actif + mots imposés) et le Trie correspondant, attendu par GridGenerator.
+    Renvoie (mots normalisés, trie).
+    """
     dela_trie = current_app.dela_trie
-    data = request.get_json()
-    size = data.get('size', {})
-    width = min(int(size.get('width', 10)), 20)
-    height = min(int(size.get('height', 10)), 20)
-    seed = data.get('seed')
-    
+    max_len = max(width, height)
     word_list = []
     if data.get('use_global', True) and dela_trie:
-        all_dela_words = list(dela_trie.words)
-        dela_sample = random.sample(all_dela_words, min(30000, len(all_dela_words)))
-        word_list.extend(w for w in dela_sample if len(w) >= 2 and len(w) <= max(width, height))
-    
+        word_list.extend(sample_dela_words(dela_trie, max_len, data.get('seed')))
+
     if user:
       active_dict = Dictionary.query.filter_by(user_id=user.id, is_active=True).first()
       if active_dict:
-          word_list.extend([word.mot for word in active_dict.words if len(word.mot) >= 2 and len(word.mot) <= max(width, height)])
+          word_list.extend([word.mot for word in active_dict.words if len(word.mot) >= 2 and len(word.mot) <= max_len])
+    word_list.extend(forced_words)
 
-    if not word_list: return jsonify({"error": "Aucun mot de taille adéquate disponible."}), 400
+    return compile_lexicon(word_list, max_len)
 
-    unique_words = list(set(word_list))
-    
-    generator = GridGenerator(width, height, unique_words, seed=seed)
-    success = generator.generate()
+def compile_lexicon(word_list, max_len):
+    """Liste de mots (triée, longueurs <= max_len) et Trie de ces mots, attendus par GridGenerator."""
+    # Le Trie de la génération ne contient que ces mots (normalisés comme le DELA)
+    # Ordre trié (et non celui du set) : même seed -> même grille d'un processus à l'autre
+    trie = DictionnaireTrie()
+    for word in sorted(set(word_list)):
+        trie.insert(word)
+    return sorted(w for w in trie.get_all_words() if len(w) <= max_len), trie
+
+def regeneration_words(data, user, width, height, kept_words):
+    """
+    Liste de mots et Trie d'une régénération, compilés une fois puis réutilisés
+    (current_app.regeneration_lexicons) : l'échantillon du DELA (tiré du seed,
+    ou un seul échantillon sans seed) et le dictionnaire personnel ne sont pas
+    retirés à chaque appel. Les mots gardés absents de ce lexique y sont
+    ajoutés dans une entrée à part, propre à ces mots.
+    """
+    max_len = max(width, height)
+    sample = 'none'
+    if data.get('use_global', True) and current_app.dela_trie:
+        sample = f"{generation_sample_policy(data)}@{current_app.dela_version}#{data.get('seed')}"
+    key = (max_len, sample, dictionary_revision(user))
+    cache = current_app.regeneration_lexicons
+    words, trie = cache.get_or_build(key, lambda: build_generation_words(data, user, width, height))
+    missing = tuple(sorted(set(kept_words) - trie.words))
+    if not missing:
+        return words, trie
+    return cache.get_or_build(key + (missing,), lambda: compile_lexicon(words + list(missing), max_len))
+
+def generation_sample_policy(data):
+    """Origine de la liste de mots de build_generation_words() (clés des caches de grilles et de nogoods)."""
+    if data.get('use_global', True) and current_app.dela_trie:
+        return f"dela:{DELA_SAMPLE_SIZE}"
+    return 'personal'
+
+def dictionary_revision(user):
+    """Révision (empreinte) du dictionnaire personnel actif de `user`, 'none' sans dictionnaire actif."""
+    active_dict = Dictionary.query.filter_by(user_id=user.id, is_active=True).first() if user else None
+    return NogoodStore.lexicon_version(w.mot for w in active_dict.words) if active_dict else 'none'
+
+def generation_lexicon_id(params, user):
+    """
+    Identifiant de la liste de mots de build_generation_words(), clé du cache
+    de nogoods : échantillon du DELA (tiré du seed) + révision du dictionnaire
+    personnel. None si la liste ne se répète pas (échantillon du DELA sans
+    seed) ou si le cache est sans objet (mots imposés).
+    """
+    if params['forced_words']:
+        return None
+    sample = 'none'
+    if params['sample_policy'].startswith('dela:'):
+        if params['seed'] is None:
+            return None
+        sample = f"{params['sample_policy']}@{current_app.dela_version}#{params['seed']}"
+    return f"{sample}+{dictionary_revision(user)}"
+
+def generate_pool_grid(dela_trie, width, height, time_budget_ms, cancel_token=None):
+    """
+    Génère une grille pour la réserve (grid_pool.py) : même liste de mots qu'une
+    requête anonyme sur le DELA, sans seed (donc sans cache de nogoods).
+    `cancel_token` : annulé quand une génération démarre (GridPool.busy()).
+    Renvoie la grille si elle est complète.
+    """
+    trie = DictionnaireTrie()
+    for word in set(sample_dela_words(dela_trie, max(width, height))):
+        trie.insert(word)
+    generator = GridGenerator(width, height, trie.get_all_words(), prebuilt_trie=trie)
+    if not generator.generate(time_budget_ms=time_budget_ms, cancel_token=cancel_token):
+        return None
+    return generator.get_grid_data()
+
+def result_cache_key(params, user):
+    """
+    Clé du cache de grilles (result_cache.py) d'une génération, ou None si elle
+    n'est pas reproductible (sans seed, portfolio) ou sans intérêt (trace).
+    """
+    if params['seed'] is None or params['portfolio'] > 1 or params['trace']:
+        return None
+    template = GridGenerator.template_for_seed(params['width'], params['height'], params['seed'])
+    if template is None:
+        return None
+    lexicon_version = f"{params['sample_policy']}@{current_app.dela_version}"
+    search_policy = json.dumps([params['engine'], params['beam_width'], params['forced_words']])
+    return current_app.result_cache.make_key(params['width'], params['height'], GridGenerator.template_id(template),
+                                             params['seed'], lexicon_version, dictionary_revision(user), search_policy)
+
+def pool_eligible(params, user):
+    """
+    Vrai si la requête peut être servie par la réserve de grilles : pas de seed,
+    DELA seul (pas de dictionnaire personnel actif), pas de mots imposés,
+    moteur par défaut sans portfolio ni trace.
+    """
+    if params['seed'] is not None or params['forced_words'] or params['trace']:
+        return False
+    if params['engine'] != 'backtracking' or params['portfolio'] > 1:
+        return False
+    if not params['sample_policy'].startswith('dela:'):
+        return False
+    return user is None or Dictionary.query.filter_by(user_id=user.id, is_active=True).first() is None
+
+def parse_generation_request(data):
+    """
+    Lit et valide les paramètres d'une génération (corps JSON de /grids/generate).
+    Lève ValueError (message pour l'utilisateur) si un paramètre est invalide.
+    """
+    size = data.get('size', {})
+    width = min(int(size.get('width', 10)), 20)
+    height = min(int(size.get('height', 10)), 20)
+    # NOUVEAU : 'portfolio' = nombre de configurations résolues en parallèle (1 = désactivé)
+    portfolio = min(int(data.get('portfolio', 1)), os.cpu_count() or 1, MAX_PORTFOLIO_WORKERS)
+    # NOUVEAU : Budgets de résolution ; épuisés, la meilleure grille partielle est renvoyée ("complete": false)
+    time_budget_ms, node_budget = parse_budgets(data)
+    # NOUVEAU : Mots imposés (story B1), pré-placés avant la recherche
+    forced_words = data.get('forced_words', [])
+    if not isinstance(forced_words, list):
+        raise ValueError("'forced_words' doit être une liste de mots.")
+    forced_words = list(dict.fromkeys(normalize_pattern(w) for w in forced_words))
+    if len(forced_words) > GridSolver.MAX_FORCED_WORDS:
+        raise ValueError(f"Au plus {GridSolver.MAX_FORCED_WORDS} mots imposés.")
+    if any(len(w) < 2 or len(w) > max(width, height) or not GridSolver.is_word_encodable(w) for w in forced_words):
+        raise ValueError("Mot imposé invalide (longueur ou caractères).")
+    # NOUVEAU : Moteur de remplissage ('backtracking' par défaut, 'beam' = beam search)
+    engine = data.get('engine', 'backtracking')
+    beam_width = int(data.get('beam_width', BeamSolver.DEFAULT_BEAM_WIDTH))
+    if engine not in SOLVER_ENGINES:
+        raise ValueError(f"Moteur inconnu (attendu : {', '.join(SOLVER_ENGINES)}).")
+    if not 1 <= beam_width <= BeamSolver.MAX_BEAM_WIDTH:
+        raise ValueError(f"Largeur de faisceau entre 1 et {BeamSolver.MAX_BEAM_WIDTH}.")
+    if engine != 'backtracking' and portfolio > 1:
+        raise ValueError("Le portfolio n'utilise que le moteur 'backtracking'.")
+    return {
+        'width': width, 'height': height, 'seed': data.get('seed'), 'portfolio': portfolio,
+        'time_budget_ms': time_budget_ms, 'node_budget': node_budget, 'forced_words': forced_words,
+        'engine': engine, 'beam_width': beam_width, 'trace': bool(data.get('trace')),
+        'sample_policy': generation_sample_policy(data),
+    }
+
+def parse_budgets(data):
+    """
+    Budgets de résolution (time_budget_ms, node_budget), None si absents.
+    Lève ValueError si un budget n'est pas un nombre strictement positif.
+    """
+    budgets = []
+    for key, cast in (('time_budget_ms', float), ('node_budget', int)):
+        value = data.get(key)
+        if value is not None:
+            try:
+                value = cast(value)
+            except (TypeError, ValueError):
+                value = 0
+            if not value > 0:  # Aussi NaN
+                raise ValueError(f"'{key}' doit être un nombre strictement positif.")
+        budgets.append(value)
+    return tuple(budgets)
+
+def request_cancel_token():
+    """
+    Jeton d'annulation d'une génération synchrone : échéance = le plus court du
+    délai du client (en-tête X-Deadline-Ms) et du plafond serveur
+    (GENERATION_MAX_SOLVE_MS). Lève ValueError si l'en-tête est invalide.
+    """
+    timeout_ms = float(current_app.config.get('GENERATION_MAX_SOLVE_MS', DEFAULT_MAX_SOLVE_MS))
+    header = request.headers.get(DEADLINE_HEADER)
+    if header is not None:
+        try:
+            client_ms = float(header)
+        except ValueError:
+            client_ms = -1
+        if client_ms <= 0:
+            raise ValueError(f"En-tête {DEADLINE_HEADER} invalide (délai en millisecondes attendu).")
+        timeout_ms = min(timeout_ms, client_ms)
+    return CancellationToken.with_timeout(timeout_ms)
+
+def run_generation(params, unique_words, trie, nogood_store, progress=None, progress_interval_ms=None,
+                   cancel_token=None, pool=None):
+    """
+    Génère une grille (params : parse_generation_request()) sur une liste de mots
+    déjà construite. Sans contexte de requête : utilisable par un job en arrière-plan.
+    `progress` (optionnel) reçoit les instantanés de GridSolver.progress() (hors portfolio).
+    `cancel_token` (optionnel) arrête la recherche comme un budget épuisé ; le
+    portfolio, résolu dans d'autres processus, n'en retient que l'échéance.
+    `pool` (optionnel) : réserve de grilles, occupée (busy()) pendant la résolution.
+    Renvoie (corps JSON, code HTTP).
+    """
+    with pool_busy(pool):
+        return _solve_generation(params, unique_words, trie, nogood_store, progress, progress_interval_ms,
+                                 cancel_token)
+
+def _solve_generation(params, unique_words, trie, nogood_store, progress, progress_interval_ms, cancel_token):
+    """Corps de run_generation()."""
+    width, height = params['width'], params['height']
+    if params['portfolio'] > 1:
+        time_budget_ms = params['time_budget_ms']
+        remaining_ms = cancel_token.remaining_ms() if cancel_token is not None else None
+        if remaining_ms is not None:
+            time_budget_ms = remaining_ms if time_budget_ms is None else min(time_budget_ms, remaining_ms)
+        grid_data = GridGenerator.generate_portfolio(width, height, unique_words, trie,
+                                                     workers=params['portfolio'], seed=params['seed'],
+                                                     time_budget_ms=time_budget_ms,
+                                                     forced_words=params['forced_words'])
+        if grid_data is None: return {"error": "Impossible de générer une grille avec les mots fournis."}, 500
+        return {"grid": grid_data}, 200
+
+    generator = GridGenerator(width, height, unique_words, prebuilt_trie=trie, seed=params['seed'],
+                              engine=params['engine'], beam_width=params['beam_width'],
+                              nogood_store=nogood_store, lexicon_id=params.get('lexicon_id'))
+    # NOUVEAU : Trace binaire de la recherche, renvoyée dans grid.statistics.trace (diagnostic)
+    if params['trace']:
+        generator.solver.enable_trace()
+    if progress is not None:
+        generator.solver.set_progress_callback(progress, progress_interval_ms or GridSolver.PROGRESS_INTERVAL_MS)
+    if params['forced_words'] and not generator.place_forced_words(params['forced_words']):
+        return {"error": "Impossible de placer les mots imposés dans la grille."}, 422
+    success = generator.generate(time_budget_ms=params['time_budget_ms'], node_budget=params['node_budget'],
+                                 cancel_token=cancel_token)
+
+    if not success and not generator.is_incomplete: return {"error": "Impossible de générer une grille avec les mots fournis."}, 500
+
+    return {"grid": generator.get_grid_data()}, 200
+
+@main_bp.route('/grids/generate', methods=['POST'])
+@jwt_required(optional=True)
+def generate_grid():
+    user = get_current_user()
+    data = request.get_json()
+    try:
+        params = parse_generation_request(data)
+        cancel_token = request_cancel_token()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    # NOUVEAU : Grille prête dans la réserve (grid_pool.py) : servie sans résolution
+    pool = current_app.grid_pool
+    if pool is not None and pool_eligible(params, user):
+        grid_data = pool.take(params['width'], params['height'])
+        if grid_data is not None:
+            grid_data['statistics']['pooled'] = True
+            return jsonify({"grid": grid_data}), 200
+
+    # NOUVEAU : Génération reproductible (seed) déjà résolue : servie depuis le cache de grilles
+    cache_key = result_cache_key(params, user)
+    if cache_key is not None:
+        grid_data = current_app.result_cache.get(cache_key)
+        if grid_data is not None:
+            return jsonify({"grid": grid_data}), 200
+
+    unique_words, trie = build_generation_words(data, user, params['width'], params['height'], params['forced_words'])
+    if not unique_words: return jsonify({"error": "Aucun mot de taille adéquate disponible."}), 400
+    params['lexicon_id'] = generation_lexicon_id(params, user)
+
+    payload, status = run_generation(params, unique_words, trie, current_app.nogood_store,
+                                     cancel_token=cancel_token, pool=pool)
+    if cache_key is not None and status == 200:
+        current_app.result_cache.put(cache_key, payload['grid'])
+    return jsonify(payload), status
+
+@main_bp.route('/grids/pool', methods=['GET'])
+def grid_pool_status():
+    """Métriques de la réserve de grilles (hits / misses, retard de remplissage, grilles prêtes)."""
+    pool = current_app.grid_pool
+    if pool is None:
+        return jsonify({"enabled": False}), 200
+    return jsonify({"enabled": True, **pool.snapshot()}), 200
+
+# NOUVEAU : Progression en direct (Server-Sent Events)
+@main_bp.route('/grids/generate/stream', methods=['POST'])
+@jwt_required(optional=True)
+def stream_generation():
+    """
+    Même génération que /grids/generate, résolue par le pool de workers des
+    jobs (503 si sa file est pleine) ; la réponse est un flux text/event-stream : événements 'progress' (slots
+    remplis, profondeur, backtracks, nœuds/s, grille partielle) au plus toutes
+    les GENERATION_PROGRESS_INTERVAL_MS, puis un événement 'result'
+    ({"status": code HTTP, "grid" ou "error"}). Le budget de temps est plafonné
+    comme pour les jobs. POST : à lire avec fetch() (pas EventSource).
+    Si le client se déconnecte avant le résultat, la résolution est annulée.
+    """
+    user = get_current_user()
+    data = request.get_json()
+    try:
+        params = parse_generation_request(data)
+        cancel_token = request_cancel_token()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if params['portfolio'] > 1:
+        return jsonify({"error": "Le portfolio ne publie pas de progression."}), 400
+    runner = current_app.generation_jobs
+    params['time_budget_ms'] = runner.job_time_budget(params['time_budget_ms'])
+    runner.sweep()
+    if not runner.has_capacity():
+        return jsonify({"error": "Trop de générations en attente, réessayez plus tard."}), 503
+
+    unique_words, trie = build_generation_words(data, user, params['width'], params['height'], params['forced_words'])
+    if not unique_words: return jsonify({"error": "Aucun mot de taille adéquate disponible."}), 400
+    params['lexicon_id'] = generation_lexicon_id(params, user)
+
+    events = queue.Queue()
+    interval_ms = current_app.config.get('GENERATION_PROGRESS_INTERVAL_MS', GridSolver.PROGRESS_INTERVAL_MS)
+    nogood_store, pool = current_app.nogood_store, current_app.grid_pool
+
+    def solve():
+        try:
+            payload, status = run_generation(params, unique_words, trie, nogood_store,
+                                             progress=lambda snapshot: events.put(('progress', snapshot)),
+                                             progress_interval_ms=interval_ms, cancel_token=cancel_token,
+                                             pool=pool)
+        except Exception as e:
+            logging.error("Erreur pendant une génération en flux", exc_info=True)
+            payload, status = {"error": f"Erreur interne : {e}"}, 500
+        events.put(('result', {"status": status, **payload}))
+
+    def stream():
+        # Client parti (onglet fermé, nouvel essai) : le serveur WSGI ferme le générateur,
+        # le finally annule la résolution au lieu de la laisser consommer le CPU.
+        try:
+            while True:
+                try:
+                    event, payload = events.get(timeout=SSE_KEEPALIVE_SECONDS)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: {event}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+                if event == 'result':
+                    return
+        finally:
+            cancel_token.cancel(CancellationToken.REASON_DISCONNECTED)
+
+    # Résolution dans le pool borné des jobs (pas de thread par requête)
+    if not runner.submit_task(solve):
+        return jsonify({"error": "Trop de générations en attente, réessayez plus tard."}), 503
+    return Response(stream(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+# NOUVEAU : Génération par lots (éditeurs) - préparation partagée, grilles publiées au fil de l'eau
+@main_bp.route('/grids/batch', methods=['POST'])
+@jwt_required(optional=True)
+def generate_grid_batch():
+    """
+    Génère 'count' grilles (au plus MAX_BATCH_GRIDS) d'une même taille avec
+    GridGenerator.generate_batch : une liste de mots, une préparation par
+    gabarit et un pool de 'workers' processus pour tout le lot. Réponse en
+    flux text/event-stream : un événement 'grid' par grille achevée
+    ({"index", "grid"} ou {"index", "error"}), puis 'done'. Le budget de
+    temps de chaque grille est plafonné comme pour les jobs ; le lot est
+    piloté depuis le pool de workers des jobs (503 si sa file est pleine) et
+    s'arrête si le client se déconnecte.
+    """
+    user = get_current_user()
+    data = request.get_json()
+    try:
+        params = parse_generation_request(data)
+        count = int(data.get('count', 10))
+        workers = min(int(data.get('workers', 1)), os.cpu_count() or 1, MAX_PORTFOLIO_WORKERS)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if not 1 <= count <= MAX_BATCH_GRIDS:
+        return jsonify({"error": f"Entre 1 et {MAX_BATCH_GRIDS} grilles par lot."}), 400
+    if params['engine'] != 'backtracking' or params['portfolio'] > 1 or params['forced_words'] or params['trace']:
+        return jsonify({"error": "Le lot n'utilise que le moteur 'backtracking', sans portfolio, mots imposés ni trace."}), 400
+    runner = current_app.generation_jobs
+    time_budget_ms = runner.job_time_budget(params['time_budget_ms'])
+    if not runner.has_capacity():
+        return jsonify({"error": "Trop de générations en attente, réessayez plus tard."}), 503
+
+    unique_words, trie = build_generation_words(data, user, params['width'], params['height'])
+    if not unique_words: return jsonify({"error": "Aucun mot de taille adéquate disponible."}), 400
+
+    events = queue.Queue()
+    cancel_token = CancellationToken()
+    pool = current_app.grid_pool
+
+    def solve():
+        batch = GridGenerator.generate_batch(params['width'], params['height'], unique_words, trie, count,
+                                             seed=params['seed'], workers=max(1, workers),
+                                             time_budget_ms=time_budget_ms, cancel_token=cancel_token)
+        generated = 0
+        try:
+            with pool_busy(pool):
+                for index, grid_data in batch:
+                    if cancel_token.cancelled:
+                        break
+                    if grid_data is None:
+                        events.put(('grid', {"index": index, "error": "Impossible de générer cette grille."}))
+                    else:
+                        generated += 1
+                        events.put(('grid', {"index": index, "grid": grid_data}))
+        except Exception as e:
+            logging.error("Erreur pendant une génération par lot", exc_info=True)
+            events.put(('done', {"count": count, "generated": generated, "error": f"Erreur interne : {e}"}))
+            return
+        finally:
+            batch.close()
+        events.put(('done', {"count": count, "generated": generated}))
+
+    def stream():
+        try:
+            while True:
+                try:
+                    event, payload = events.get(timeout=SSE_KEEPALIVE_SECONDS)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: {event}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+                if event == 'done':
+                    return
+        finally:
+            cancel_token.cancel(CancellationToken.REASON_DISCONNECTED)
+
+    if not runner.submit_task(solve):
+        return jsonify({"error": "Trop de générations en attente, réessayez plus tard."}), 503
+    return Response(stream(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+# NOUVEAU : Génération asynchrone - le job est résolu par le pool de workers (generation_jobs.py)
+@main_bp.route('/grids/jobs', methods=['POST'])
+@jwt_required(optional=True)
+def submit_generation_job():
+    """
+    Soumet une génération (mêmes paramètres que /grids/generate) et répond
+    aussitôt 202 avec l'identifiant du job ; le résultat se lit sur
+    GET /grids/jobs/<job_id>. Le budget de temps est plafonné par job.
+    """
+    user = get_current_user()
+    data = request.get_json()
+    try:
+        params = parse_generation_request(data)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if params['portfolio'] > 1:
+        return jsonify({"error": "Le portfolio n'est pas disponible en génération asynchrone."}), 400
+    runner = current_app.generation_jobs
+    params['time_budget_ms'] = runner.job_time_budget(params['time_budget_ms'])
+    runner.sweep()
+    if not runner.has_capacity():
+        return jsonify({"error": "Trop de générations en attente, réessayez plus tard."}), 503
+
+    unique_words, trie = build_generation_words(data, user, params['width'], params['height'], params['forced_words'])
+    if not unique_words: return jsonify({"error": "Aucun mot de taille adéquate disponible."}), 400
+    params['lexicon_id'] = generation_lexicon_id(params, user)
+
+    job = GenerationJob(id=uuid.uuid4().hex, user_id=user.id if user else None, params=json.dumps(params))
+    db.session.add(job)
+    db.session.commit()
+    if not runner.submit(job.id, functools.partial(run_generation, pool=current_app.grid_pool),
+                         params, unique_words, trie, current_app.nogood_store):
+        db.session.delete(job)
+        db.session.commit()
+        return jsonify({"error": "Trop de générations en attente, réessayez plus tard."}), 503
+    return jsonify({"job_id": job.id, "status": job.status}), 202
+
+@main_bp.route('/grids/jobs/<job_id>', methods=['GET'])
+@jwt_required(optional=True)
+def get_generation_job(job_id):
+    """État d'un job ('queued', 'running', 'done', 'failed') et, une fois terminé, sa grille ou son erreur."""
+    user = get_current_user()
+    job = db.session.get(GenerationJob, job_id)
+    if job is None or (job.user_id is not None and (user is None or job.user_id != user.id)):
+        return jsonify({"error": "Job introuvable."}), 404
+    if current_app.generation_jobs.is_orphaned(job):  # Processus arrêté : le job ne finira jamais
+        current_app.generation_jobs.sweep()
+        db.session.refresh(job)
+    return jsonify(job.to_json()), 200
+
+# NOUVEAU : Régénération d'une zone d'une grille existante (mots / cases verrouillés)
+@main_bp.route('/grids/regenerate', methods=['POST'])
+@jwt_required(optional=True)
+def regenerate_grid():
+    """
+    Reprend une grille renvoyée par /grids/generate ('grid') et ne régénère que
+    ce qui n'est pas verrouillé : 'locked_slots' (identifiants de ses mots)
+    et 'locked_cells' ([x, y]). Le gabarit de la grille est conservé.
+    """
+    user = get_current_user()
+    data = request.get_json()
+    grid = data.get('grid') or {}
+    try:
+        width, height, rows = GridGenerator.grid_layout(grid)
+        grid_words = grid.get('words', [])
+        if not isinstance(grid_words, list) or not all(isinstance(w, dict) and isinstance(w.get('text'), str)
+                                                       for w in grid_words):
+            raise ValueError("Mots de la grille mal formés.")
+    except ValueError:
+        return jsonify({"error": "Grille à régénérer invalide."}), 400
+    if not (width <= 20 and height <= 20):
+        return jsonify({"error": "Grille à régénérer invalide."}), 400
+    seed = data.get('seed')
+    try:
+        time_budget_ms, node_budget = parse_budgets(data)
+        cancel_token = request_cancel_token()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    # Les mots de la grille d'origine restent valides (les mots verrouillés doivent l'être)
+    kept_words = [normalize_pattern(w['text']) for w in grid_words]
+    kept_words = [w for w in kept_words if len(w) >= 2 and GridSolver.is_word_encodable(w)]
+    unique_words, trie = regeneration_words(data, user, width, height, kept_words)
+    if not unique_words: return jsonify({"error": "Aucun mot de taille adéquate disponible."}), 400
+
+    # Gabarit compilé (cases noires -> slots) une fois par disposition
+    compiled = current_app.regeneration_templates.get_or_build(
+        (width, height, rows), lambda: GridGenerator.compile_layout(width, height, rows))
+    generator = GridGenerator.from_grid_data(grid, unique_words, trie, seed=seed, compiled=compiled)
+    try:
+        locked = generator.lock_region(grid, data.get('locked_slots', []), data.get('locked_cells', []))
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+    if not locked:
+        return jsonify({"error": "Les mots verrouillés ne laissent aucune solution."}), 422
+    success = generator.generate(time_budget_ms=time_budget_ms, node_budget=node_budget, cancel_token=cancel_token)
+
+    if not success and not generator.is_incomplete: return jsonify({"error": "Impossible de régénérer la grille avec les mots fournis."}), 500
 
-    if not success: return jsonify({"error": "Impossible de générer une grille avec les mots fournis."}), 500
-        
     return jsonify({"grid": generator.get_grid_data()}), 200
 
 # NOUVELLE ROUTE POUR LE RGPD
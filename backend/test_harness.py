@@ -8,17 +8,40 @@ import sys
 import os
 from datetime import datetime
 import logging
+import random
 import grid_generator
 
 print(f"[DEBUG] Fichier grid_generator importé depuis : {grid_generator.__file__}")
 
 # On importe le chef d'orchestre et le Trie (pour charger les mots)
 from grid_generator import GridGenerator
+from engine.nogood_store import NogoodStore
 from trie_engine import DictionnaireTrie 
 
 # --- CONFIGURATION ---
+# 'label' / 'options' (optionnels) : variante du solveur, options passées à GridGenerator.generate()
+# 'forced_words' (optionnel) : nombre de mots imposés tirés au hasard (story B1), placés avant la recherche
+# 'generator' (optionnel) : options passées au constructeur de GridGenerator (ex : moteur 'beam')
+# 'shared_nogoods' (optionnel) : un NogoodStore partagé entre les grilles du batch (nogoods préchargés)
 TEST_CONFIGS = [
     {'width': 11, 'height': 6, 'count': 4},  # Template plus petit pour tests rapides
+    {'width': 11, 'height': 6, 'count': 4, 'label': 'AC-3', 'options': {'propagation': 'ac3'}},
+    {'width': 11, 'height': 6, 'count': 4, 'label': 'Sans backjumping', 'options': {'backjumping': False}},
+    {'width': 11, 'height': 6, 'count': 4, 'label': 'Composantes indépendantes', 'options': {'decompose': True}},
+    {'width': 6, 'height': 7, 'count': 10},
+    {'width': 6, 'height': 7, 'count': 10, 'label': 'Redémarrages Luby', 'options': {'restarts': 'luby'}},
+    {'width': 6, 'height': 7, 'count': 10, 'label': 'Luby + transpositions (sans nogoods conservés)',
+     'options': {'restarts': 'luby', 'keep_nogoods': False, 'transpositions': True}},
+    {'width': 6, 'height': 7, 'count': 10, 'label': 'Ordre LCV', 'options': {'value_order': 'lcv'}},
+    {'width': 11, 'height': 6, 'count': 4, 'label': '3 mots imposés', 'forced_words': 3},
+    {'width': 6, 'height': 7, 'count': 10, 'label': '2 mots imposés', 'forced_words': 2},
+    # Beam search face au backtracking MRV (mêmes tailles, même nombre de grilles)
+    {'width': 11, 'height': 6, 'count': 4, 'label': 'Beam search (largeur 8)', 'generator': {'engine': 'beam'}},
+    {'width': 6, 'height': 7, 'count': 10, 'label': 'Beam search (largeur 8)', 'generator': {'engine': 'beam'}},
+    {'width': 6, 'height': 7, 'count': 10, 'label': 'Beam search (largeur 32)',
+     'generator': {'engine': 'beam', 'beam_width': 32}},
+    {'width': 11, 'height': 6, 'count': 4, 'label': 'Nogoods partagés', 'shared_nogoods': True},
+    {'width': 6, 'height': 7, 'count': 10, 'label': 'Nogoods partagés', 'shared_nogoods': True},
 ]
 SINGLE_GRID_TIMEOUT_SECONDS = 60  # Réduit pour les petites grilles 
 DELA_FILE = 'dela_clean.csv'
@@ -54,11 +77,27 @@ def load_all_words():
         print(f"ERREUR: Le fichier '{DELA_FILE}' n'a pas été trouvé.")
         return []
 
+def place_random_forced_words(words, generator, count, seed, attempts=20):
+    """
+    Tire `count` mots distincts dont la longueur correspond à un slot du template
+    (reproductible) et les impose à la grille. Un tirage aléatoire est souvent
+    impossible à placer (peu de slots par longueur) : on retire jusqu'à `attempts` fois.
+    """
+    lengths = {slot['length'] for slot in generator.solver.slots}
+    pool = sorted(w for w in words if len(w) in lengths and len(w) >= 3)
+    rng = random.Random(seed)
+    for _ in range(attempts):
+        if generator.place_forced_words(rng.sample(pool, count)):
+            return True
+    return False
+
 def run_test_batch(words, config):
     """Génère un lot de grilles et collecte les données complètes."""
     results = { "config": config, "generated_grids": [], "failures": 0, "timeouts": 0 }
     width, height, count = config['width'], config['height'], config['count']
-    print(f"\n--- Lancement du batch : {count} grilles de {width}x{height} ---")
+    options = config.get('options', {})
+    forced_count = config.get('forced_words', 0)
+    print(f"\n--- Lancement du batch : {count} grilles de {width}x{height} ({config_label(config)}) ---")
 
     # --- BLOC D'OPTIMISATION (AJOUTÉ) ---
     # On pré-filtre les mots et construit le Trie UNE SEULE FOIS pour ce batch.
@@ -77,6 +116,9 @@ def run_test_batch(words, config):
         shared_trie.insert(word)
         
     logging.info("Trie partagé construit. Démarrage des générations...")
+    nogood_store = NogoodStore() if config.get('shared_nogoods') else None
+    # Liste fixe pour tout le batch : une seule empreinte, clé du cache de nogoods
+    lexicon_id = NogoodStore.lexicon_version(valid_words_for_batch) if nogood_store is not None else None
     # --- FIN DU BLOC D'OPTIMISATION ---
 
     for i in range(count):
@@ -91,8 +133,14 @@ def run_test_batch(words, config):
                 generator = GridGenerator(width, height, 
                                           valid_words_for_batch,   # Mots pré-filtrés
                                           prebuilt_trie=shared_trie, # Trie pré-construit
-                                          seed=i)
-                success = generator.generate()
+                                          seed=i,
+                                          nogood_store=nogood_store, lexicon_id=lexicon_id,
+                                          **config.get('generator', {}))
+                # Mots imposés : le temps de placement (faisabilité + propagation) est compté
+                if forced_count and not place_random_forced_words(valid_words_for_batch, generator, forced_count, i):
+                    success = False
+                else:
+                    success = generator.generate(**options)
             end_time = time.time()
 
             if success:
@@ -111,6 +159,7 @@ def run_test_batch(words, config):
         
         except TimeoutException as e:
             results['timeouts'] += 1
+            results.setdefault('timeout_times', []).append(time.time() - start_time)
             print(f" Échec ({e})")
         except Exception as e:
             results['failures'] += 1
@@ -119,6 +168,47 @@ def run_test_batch(words, config):
             
     return results
 
+def config_label(config):
+    """Nom lisible d'une configuration de batch (variante du solveur)."""
+    return config.get('label', 'Forward Checking')
+
+def percentile(values, p):
+    """Percentile par rang le plus proche (p entre 0 et 100) d'une liste non vide."""
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * p // 100))  # ceil(n * p / 100)
+    return ordered[int(rank) - 1]
+
+def generate_comparison_table(all_results):
+    """
+    Tableau comparatif des variantes : succès, distribution des temps et nœuds explorés.
+    Les timeouts comptent dans P50/P95/max (temps minorés, marqués '≥') :
+    c'est la queue de distribution que les redémarrages doivent couper.
+    """
+    html = "<h2>Comparaison des variantes</h2><table class='comparison'><thead><tr>"
+    html += "<th>Taille</th><th>Variante</th><th>Succès</th><th>P50</th><th>P95</th><th>Temps max</th><th>Nœuds moyens</th>"
+    html += "</tr></thead><tbody>"
+    for batch_result in all_results:
+        config = batch_result['config']
+        grids = batch_result['generated_grids']
+        html += f"<tr><td>{config['width']}x{config['height']}</td><td>{config_label(config)}</td>"
+        html += f"<td>{len(grids)} / {config['count']}</td>"
+        times = [(g['generation_time'] * 1000, '') for g in grids]
+        times += [(t * 1000, '≥ ') for t in batch_result.get('timeout_times', [])]
+        if times:
+            for p in (50, 95, 100):
+                value, mark = percentile(times, p)
+                html += f"<td>{mark}{value:.0f} ms</td>"
+        else:
+            html += "<td>-</td><td>-</td><td>-</td>"
+        if grids:
+            nodes = [g.get('statistics', {}).get('metrics', {}).get('recursive_calls', 0) for g in grids]
+            html += f"<td>{statistics.mean(nodes):,.0f}</td>"
+        else:
+            html += "<td>-</td>"
+        html += "</tr>"
+    html += "</tbody></table>"
+    return html
+
 def generate_html_report(all_results):
     """Génère un fichier report.html."""
     html = """
@@ -135,19 +225,21 @@ def generate_html_report(all_results):
             table { border-collapse: collapse; }
             td { border: 1px solid #ccc; width: 25px; height: 25px; text-align: center; vertical-align: middle; font-weight: bold; font-size: 12px; }
             .black { background-color: #343a40; }
+            table.comparison td, table.comparison th { width: auto; padding: 4px 10px; font-weight: normal; }
         </style>
     </head>
     <body>
         <h1>Rapport de Génération de Grilles</h1>
         <p>Généré le: """ + datetime.now().strftime("%Y-%m-%d %H:%M:%S") + """</p>
     """
+    html += generate_comparison_table(all_results)
 
     for batch_result in all_results:
         config = batch_result['config']
         grids = batch_result['generated_grids']
         width, height, count = config['width'], config['height'], config['count']
         
-        html += f"<h2>Batch: {len(grids)} / {count} Grilles de {width}x{height}</h2>"
+        html += f"<h2>Batch: {len(grids)} / {count} Grilles de {width}x{height} ({config_label(config)})</h2>"
         
         if grids:
             times = [g['generation_time'] for g in grids]
@@ -196,6 +288,26 @@ def generate_html_report(all_results):
                 html += f"<li>Appels récursifs: {metrics.get('recursive_calls', 0):,}</li>"
                 html += f"<li>Candidats testés: {metrics.get('candidates_tested', 0):,}</li>"
                 html += f"<li>Backtracks: {metrics.get('backtracks', 0):,}</li>"
+                if metrics.get('nogoods_learned', 0) > 0 or metrics.get('backjumps', 0) > 0:
+                    html += f"<li>Backjumps: {metrics.get('backjumps', 0):,} | Nogoods appris: {metrics.get('nogoods_learned', 0):,} ({metrics.get('nogood_hits', 0):,} rejets)</li>"
+                if metrics.get('compat_rejections', 0) > 0:
+                    html += f"<li>Rejets par tables de compatibilité: {metrics['compat_rejections']:,}</li>"
+                if metrics.get('tt_stores', 0) > 0:
+                    html += f"<li>Transpositions: {metrics['tt_hits']:,} rejets / {metrics['tt_stores']:,} états en échec</li>"
+                if metrics.get('forced_placements', 0) > 0:
+                    html += f"<li>Mots imposés: {metrics['forced_placements']} positions essayées, {metrics.get('forced_pruned', 0):,} mots retirés par la propagation initiale</li>"
+                if metrics.get('lexicon_before', 0) > 0:
+                    html += f"<li>Pré-élagage du lexique: {metrics['lexicon_before']:,} → {metrics.get('lexicon_after', 0):,} mots</li>"
+                if metrics.get('shared_nogoods_loaded', 0) > 0:
+                    html += f"<li>Nogoods partagés: {metrics['shared_nogoods_loaded']:,} préchargés ({metrics.get('shared_nogood_hits', 0):,} rejets, {metrics.get('shared_nogoods_stored', 0):,} nouveaux versés)</li>"
+                if metrics.get('beam_levels', 0) > 0:
+                    html += f"<li>Beam search: {metrics['beam_levels']} niveaux, {metrics.get('beam_children', 0):,} affectations proposées, {metrics.get('beam_dropped', 0):,} écartées</li>"
+                if metrics.get('component_splits', 0) > 0:
+                    html += f"<li>Composantes indépendantes: {metrics['component_splits']:,} scissions, {metrics.get('component_hits', 0):,} rejets / {metrics.get('component_stores', 0):,} échecs mémorisés</li>"
+                if metrics.get('restarts', 0) > 0:
+                    html += f"<li>Redémarrages: {metrics['restarts']}</li>"
+                if metrics.get('ac_revisions', 0) > 0:
+                    html += f"<li>AC-3: {metrics['ac_revisions']:,} révisions, {metrics.get('ac_pruned', 0):,} mots retirés, {metrics.get('ac_wipeouts', 0):,} domaines vidés</li>"
                 
                 fc_checks = metrics.get('fc_checks', 0)
                 fc_skips = metrics.get('fc_skips', 0)
@@ -203,6 +315,11 @@ def generate_html_report(all_results):
                     fc_eff = (fc_skips / fc_checks) * 100
                     html += f"<li>Forward Checking: {fc_skips:,}/{fc_checks:,} ({fc_eff:.1f}% éliminés)</li>"
                 
+                mrv_rescores = metrics.get('mrv_rescores', 0)
+                mrv_saved = metrics.get('mrv_rescores_saved', 0)
+                if mrv_rescores + mrv_saved > 0:
+                    html += f"<li>MRV: {mrv_rescores:,} scores recalculés, {mrv_saved:,} économisés</li>"
+                
                 total_cache = cache_stats.get('hits', 0) + cache_stats.get('misses', 0)
                 if total_cache > 0:
                     hit_rate = (cache_stats.get('hits', 0) / total_cache) * 100
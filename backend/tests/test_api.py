@@ -1,4 +1,11 @@
 import json
+import time
+from datetime import datetime, timedelta
+
+from generation_jobs import ORPHANED_JOB_ERROR
+from grid_pool import GridPool
+from models import db, GenerationJob
+from trie_engine import DictionnaireTrie
 
 def get_auth_headers(client, email='test@example.com', password='password123'):
     """Fonction utilitaire pour s'inscrire, se connecter et retourner les en-têtes d'authentification."""
@@ -82,3 +89,237 @@ def test_add_word_to_dictionary(client):
     assert len(data) == 1
     assert data[0]['mot'] == 'TEST'
 
+
+def test_generation_job_runs_in_background(client):
+    """Un job de génération répond 202 tout de suite ; son état final se lit par GET (propriétaire seulement)."""
+    headers = get_auth_headers(client, email='jobuser@example.com')
+    dict_id = client.get('/api/dictionaries', headers=headers).get_json()[0]['id']
+    for mot in ('ARBRE', 'TOIT', 'MUR'):
+        client.post(f'/api/dictionaries/{dict_id}/words', headers=headers,
+                    data=json.dumps({'mot': mot}), content_type='application/json')
+
+    response = client.post('/api/grids/jobs', headers=headers, content_type='application/json',
+                           data=json.dumps({'size': {'width': 6, 'height': 7}, 'use_global': False, 'seed': 1}))
+    assert response.status_code == 202
+    job_id = response.get_json()['job_id']
+
+    deadline = time.time() + 10
+    job = client.get(f'/api/grids/jobs/{job_id}', headers=headers).get_json()
+    while job['status'] in ('queued', 'running') and time.time() < deadline:
+        time.sleep(0.05)
+        job = client.get(f'/api/grids/jobs/{job_id}', headers=headers).get_json()
+    # Trois mots ne remplissent pas une grille 6x7 : le job échoue proprement
+    assert job['status'] == 'failed' and job['error'] and job['finished_at']
+
+    other = get_auth_headers(client, email='otheruser@example.com')
+    assert client.get(f'/api/grids/jobs/{job_id}', headers=other).status_code == 404
+    response = client.post('/api/grids/jobs', headers=headers, content_type='application/json',
+                           data=json.dumps({'size': {'width': 6, 'height': 7}, 'engine': 'inconnu'}))
+    assert response.status_code == 400
+
+def test_orphaned_generation_jobs_are_marked_failed(client):
+    """Job 'queued' / 'running' d'un processus arrêté : passé en échec (sweep et GET), les jobs récents restent."""
+
+    runner = client.application.generation_jobs
+    old = datetime.utcnow() - runner.orphan_after() * 2
+    db.session.add_all([
+        GenerationJob(id='orphan-queued', status='queued', params='{}', created_at=old),
+        GenerationJob(id='orphan-running', status='running', params='{}', created_at=old, started_at=old),
+        GenerationJob(id='live-running', status='running', params='{}', started_at=datetime.utcnow()),
+    ])
+    db.session.commit()
+
+    job = client.get('/api/grids/jobs/orphan-queued').get_json()
+    assert job['status'] == 'failed' and job['error'] == ORPHANED_JOB_ERROR and job['finished_at']
+    assert runner.sweep() == {'orphaned': 0, 'purged': 0}
+    assert db.session.get(GenerationJob, 'orphan-running').status == 'failed'
+    assert db.session.get(GenerationJob, 'live-running').status == 'running'
+    GenerationJob.query.filter(GenerationJob.id.in_(['orphan-queued', 'orphan-running', 'live-running'])).delete()
+    db.session.commit()
+
+
+def test_finished_generation_jobs_are_purged_after_their_ttl(client):
+    """Jobs terminés depuis plus de GENERATION_JOB_TTL_S supprimés ; les jobs récents ou en cours restent."""
+
+    runner = client.application.generation_jobs
+    now = datetime.utcnow()
+    expired = now - timedelta(seconds=runner.ttl_s + 60)
+    db.session.add_all([
+        GenerationJob(id='expired-done', status='done', params='{}', result='{}', finished_at=expired),
+        GenerationJob(id='expired-failed', status='failed', params='{}', error='x', finished_at=expired),
+        GenerationJob(id='recent-done', status='done', params='{}', result='{}', finished_at=now),
+        GenerationJob(id='recent-queued', status='queued', params='{}', created_at=now),
+    ])
+    db.session.commit()
+
+    assert runner.sweep() == {'orphaned': 0, 'purged': 2}
+    assert db.session.get(GenerationJob, 'expired-done') is None and db.session.get(GenerationJob, 'expired-failed') is None
+    assert db.session.get(GenerationJob, 'recent-done') is not None
+    assert db.session.get(GenerationJob, 'recent-queued').status == 'queued'
+    GenerationJob.query.filter(GenerationJob.id.in_(['recent-done', 'recent-queued'])).delete()
+    db.session.commit()
+
+
+def test_generation_stream_emits_progress_then_result(client):
+    """Le flux SSE publie des instantanés de progression puis le résultat final."""
+    headers = get_auth_headers(client, email='streamuser@example.com')
+    dict_id = client.get('/api/dictionaries', headers=headers).get_json()[0]['id']
+    client.post(f'/api/dictionaries/{dict_id}/words', headers=headers,
+                data=json.dumps({'mot': 'ARBRE'}), content_type='application/json')
+    client.application.config['GENERATION_PROGRESS_INTERVAL_MS'] = 0
+    try:
+        response = client.post('/api/grids/generate/stream', headers=headers, content_type='application/json',
+                               data=json.dumps({'size': {'width': 6, 'height': 7}, 'use_global': False}))
+        body = response.get_data(as_text=True)
+    finally:
+        del client.application.config['GENERATION_PROGRESS_INTERVAL_MS']
+
+    assert response.mimetype == 'text/event-stream'
+    events = [block.split('\n', 1) for block in body.strip().split('\n\n') if block.startswith('event:')]
+    names = [name[len('event: '):] for name, _ in events]
+    assert names[0] == 'progress' and names[-1] == 'result'
+    progress = json.loads(events[0][1][len('data: '):])
+    assert progress['nodes'] >= 1 and len(progress['grid']) == 7 and progress['total_slots'] > 0
+    result = json.loads(events[-1][1][len('data: '):])
+    assert result['status'] == 500 and result['error']
+
+
+def test_grid_pool_serves_anonymous_unseeded_requests(client):
+    """Requête anonyme sans seed sur le DELA : grille prise dans la réserve ; un seed force la résolution."""
+    app = client.application
+    dela_trie = DictionnaireTrie()
+    for mot in ('ARBRE', 'TOIT', 'MUR'):
+        dela_trie.insert(mot)
+    ready = {'width': 6, 'height': 7, 'complete': True, 'statistics': {}}
+    pool = GridPool(lambda width, height, cancel_token: dict(ready, statistics={}), sizes=[(6, 7)],
+                    lexicon_version='v1', target=1, idle_ms=0)
+    assert pool.refill_once() and not pool.refill_once()  # Réserve pleine
+    app.dela_trie, app.grid_pool = dela_trie, pool
+    try:
+        request = {'size': {'width': 6, 'height': 7}}
+        seeded = client.post('/api/grids/generate', content_type='application/json',
+                             data=json.dumps({**request, 'seed': 1}))
+        assert 'pooled' not in seeded.get_json().get('grid', {}).get('statistics', {})
+        pooled = client.post('/api/grids/generate', content_type='application/json', data=json.dumps(request))
+        assert pooled.status_code == 200 and pooled.get_json()['grid']['statistics']['pooled']
+        client.post('/api/grids/generate', content_type='application/json', data=json.dumps(request))
+
+        stats = client.get('/api/grids/pool').get_json()
+        assert stats['enabled'] and stats['hits'] == 1 and stats['misses'] == 1
+        assert stats['ready'] == {'6x7': 0} and stats['refills'] == 1 and stats['refill_lag_ms_last'] is not None
+    finally:
+        app.dela_trie, app.grid_pool = None, None
+
+
+def test_grid_pool_refill_is_cancelled_when_a_generation_starts():
+    """Une génération qui démarre (busy()) annule le remplissage en cours, dont la grille est écartée."""
+    def generate(width, height, cancel_token):
+        with pool.busy():  # Requête arrivée pendant le remplissage
+            assert cancel_token.cancelled
+        return {'width': width, 'height': height, 'complete': True, 'statistics': {}}
+
+    pool = GridPool(generate, sizes=[(6, 7)], lexicon_version='v1', target=1, idle_ms=0)
+    assert not pool.refill_once()
+    assert pool.stats['refill_cancellations'] == 1 and pool.snapshot()['ready'] == {'6x7': 0}
+
+
+def test_grid_pool_backs_off_a_failing_size_and_fills_the_others():
+    """Une taille qui échoue toujours est mise de côté : les autres tailles se remplissent, à tour de rôle."""
+    attempts = []
+
+    def generate(width, height, cancel_token):
+        attempts.append((width, height))
+        if (width, height) == (6, 7):
+            return None
+        return {'width': width, 'height': height, 'complete': True, 'statistics': {}}
+
+    pool = GridPool(generate, sizes=[(6, 7), (11, 6), (13, 8)], lexicon_version='v1', target=2, idle_ms=0)
+    for _ in range(10):
+        pool.refill_once()
+    snapshot = pool.snapshot()
+    assert snapshot['ready'] == {'6x7': 0, '11x6': 2, '13x8': 2}
+    assert attempts.count((6, 7)) == 1 and snapshot['refill_failures'] == 1
+    assert snapshot['backing_off'] == ['6x7']
+    assert attempts[1:3] in ([(11, 6), (13, 8)], [(13, 8), (11, 6)])  # Tour de rôle à égalité
+
+    pool._retry_at.clear()  # Attente écoulée : nouvel essai, attente doublée
+    assert not pool.refill_once() and attempts[-1] == (6, 7) and pool._failures[pool._key(6, 7)] == 2
+
+
+def test_grid_batch_streams_one_event_per_grid(client):
+    """Lot : un événement 'grid' par grille (ordre d'achèvement) puis 'done' ; taille du lot bornée."""
+    headers = get_auth_headers(client, email='batchuser@example.com')
+    dict_id = client.get('/api/dictionaries', headers=headers).get_json()[0]['id']
+    client.post(f'/api/dictionaries/{dict_id}/words', headers=headers,
+                data=json.dumps({'mot': 'ARBRE'}), content_type='application/json')
+    request = {'size': {'width': 6, 'height': 7}, 'use_global': False, 'seed': 3}
+    response = client.post('/api/grids/batch', headers=headers, content_type='application/json',
+                           data=json.dumps({**request, 'count': 51}))
+    assert response.status_code == 400
+
+    response = client.post('/api/grids/batch', headers=headers, content_type='application/json',
+                           data=json.dumps({**request, 'count': 2}))
+    assert response.mimetype == 'text/event-stream'
+    body = response.get_data(as_text=True)
+    events = [block.split('\n', 1) for block in body.strip().split('\n\n') if block.startswith('event:')]
+    names = [name[len('event: '):] for name, _ in events]
+    assert names == ['grid', 'grid', 'done']
+    grids = [json.loads(data[len('data: '):]) for _, data in events[:2]]
+    # Un seul mot : aucune grille possible, chaque échec est publié
+    assert sorted(grid['index'] for grid in grids) == [0, 1] and all(grid['error'] for grid in grids)
+    assert json.loads(events[2][1][len('data: '):]) == {'count': 2, 'generated': 0}
+
+
+def test_stream_and_batch_are_refused_when_the_worker_queue_is_full(client):
+    """Flux et lots passent par le pool borné des jobs : file pleine -> 503, aucun thread lancé."""
+    runner = client.application.generation_jobs
+    request = {'size': {'width': 6, 'height': 7}, 'use_global': False, 'seed': 3}
+    max_pending, runner.max_pending = runner.max_pending, 0
+    try:
+        for url in ('/api/grids/generate/stream', '/api/grids/batch'):
+            response = client.post(url, content_type='application/json', data=json.dumps(request))
+            assert response.status_code == 503
+    finally:
+        runner.max_pending = max_pending
+
+
+def test_regenerate_rejects_malformed_cells_and_reuses_compiled_inputs(client):
+    """Case mal formée -> 400 (et non 500) ; lexique et gabarit compilés réutilisés d'un appel à l'autre."""
+    rows = ['TOP', 'ARE', 'NET']
+    cells = [{'x': x, 'y': y, 'char': rows[y][x], 'is_black': False} for y in range(3) for x in range(3)]
+    words = [{'text': w} for w in ('TOP', 'ARE', 'NET', 'TAN', 'ORE', 'PET')]
+    grid = {'width': 3, 'height': 3, 'cells': cells, 'words': words}
+    request = {'use_global': False, 'seed': 1, 'locked_cells': [[x, y] for y in range(3) for x in range(3)]}
+
+    malformed = [
+        [{k: v for k, v in cell.items() if k != 'is_black'} if i == 0 else cell for i, cell in enumerate(cells)],
+        [{k: v for k, v in cell.items() if k != 'x'} if i == 4 else cell for i, cell in enumerate(cells)],
+        [cells[0]] * 9,
+    ]
+    for bad_cells in malformed:
+        response = client.post('/api/grids/regenerate', content_type='application/json',
+                               data=json.dumps({**request, 'grid': {**grid, 'cells': bad_cells}}))
+        assert response.status_code == 400
+    response = client.post('/api/grids/regenerate', content_type='application/json',
+                           data=json.dumps({**request, 'grid': grid, 'locked_cells': [5]}))
+    assert response.status_code == 400
+
+    lexicons, templates = client.application.regeneration_lexicons, client.application.regeneration_templates
+    hits = lexicons.stats['hits'], templates.stats['hits']
+    for _ in range(2):
+        response = client.post('/api/grids/regenerate', content_type='application/json',
+                               data=json.dumps({**request, 'grid': grid}))
+        assert response.status_code == 200
+        assert ''.join(c['char'] for c in response.get_json()['grid']['cells']) == 'TOPARENET'
+    assert lexicons.stats['hits'] > hits[0] and templates.stats['hits'] > hits[1]
+
+
+def test_generation_rejects_non_positive_budgets_and_malformed_forced_words(client):
+    """Budget nul, négatif ou non numérique et 'forced_words' hors liste -> 400 (et non grille vide ou 500)."""
+    request = {'size': {'width': 6, 'height': 7}, 'use_global': False}
+    invalid = [{'time_budget_ms': 0}, {'time_budget_ms': -5}, {'time_budget_ms': 'vite'},
+               {'node_budget': 0}, {'node_budget': -1}, {'forced_words': 5}]
+    for extra in invalid:
+        for url in ('/api/grids/generate', '/api/grids/jobs'):
+            response = client.post(url, content_type='application/json', data=json.dumps({**request, **extra}))
+            assert response.status_code == 400, (url, extra)
@@ -0,0 +1,110 @@
+import multiprocessing
+
+import pytest
+
+import grid_generator
+from grid_generator import GridGenerator, PORTFOLIO_VARIANTS
+from engine.cancellation import CancellationToken
+from engine.grid_solver import GridSolver
+from result_cache import ResultCache
+from trie_engine import DictionnaireTrie
+
+
+def make_trie(words):
+    trie = DictionnaireTrie()
+    for word in words:
+        trie.insert(word)
+    return trie
+
+
+def test_portfolio_configs_are_diversified_and_seeded():
+    configs = GridGenerator.portfolio_configs(5, base_seed=10)
+
+    assert [c['seed'] for c in configs] == [10, 11, 12, 13, 14]
+    assert configs[1]['restarts'] == PORTFOLIO_VARIANTS[1]['restarts']
+    assert configs[4] == {'seed': 14, **PORTFOLIO_VARIANTS[0]}
+
+
+def test_portfolio_returns_none_when_every_configuration_fails():
+    """Toutes les configurations échouent : aucun résultat, et les workers sont arrêtés."""
+    words = ['ABCDEF', 'GHIJKL']
+    assert GridGenerator.generate_portfolio(6, 7, words, make_trie(words), workers=2, seed=0) is None
+
+
+def test_regenerate_region_from_grid_data():
+    """Régénération : même gabarit, slot et case verrouillés conservés, le reste est résolu."""
+    # (fragments de 2 lettres : le solveur valide les fragments croisés)
+    words = ['TOP', 'ARE', 'NET', 'TAN', 'ORE', 'PET', 'TO', 'OP', 'AR', 'RE', 'NE', 'ET', 'TA', 'AN', 'OR', 'PE']
+    rows = ['TOP', 'ARE', 'NET']
+    grid_data = {'width': 3, 'height': 3, 'words': [],
+                 'cells': [{'x': x, 'y': y, 'char': rows[y][x], 'is_black': False}
+                           for y in range(3) for x in range(3)]}
+    generator = GridGenerator.from_grid_data(grid_data, words, make_trie(words), seed=0)
+    top = next(s['id'] for s in generator.solver.slots if s['direction'] == 'across' and s['y'] == 0)
+
+    with pytest.raises(ValueError):
+        generator.lock_region(grid_data, locked_slots=[999])
+    assert generator.lock_region(grid_data, locked_slots=[top], locked_cells=[(0, 2)])
+    assert generator.generate()
+    assert ''.join(c['char'] for c in generator.get_grid_data()['cells']) == 'TOPARENET'
+
+
+def test_result_cache_round_trip_lru_and_database(test_app):
+    """Grille complète gardée sous forme compacte ; LRU borné ; relue depuis la base par un autre cache."""
+    words = ['TOP', 'ARE', 'NET', 'TAN', 'ORE', 'PET', 'TO', 'OP', 'AR', 'RE', 'NE', 'ET', 'TA', 'AN', 'OR', 'PE']
+    rows = ['TOP', 'ARE', 'NET']
+    solved = {'width': 3, 'height': 3, 'words': [],
+              'cells': [{'x': x, 'y': y, 'char': rows[y][x], 'is_black': False} for y in range(3) for x in range(3)]}
+    generator = GridGenerator.from_grid_data(solved, words, make_trie(words), seed=7)
+    assert generator.lock_region(solved, locked_cells=[(0, 0)]) and generator.generate()
+    grid_data = generator.get_grid_data()
+
+    key = ResultCache.make_key(3, 3, GridGenerator.template_id(generator.template), 7, 'lex', 'none', 'policy')
+    assert key != ResultCache.make_key(3, 3, GridGenerator.template_id(generator.template), 8, 'lex', 'none', 'policy')
+    cache = ResultCache(max_entries=1, persist=True)
+    cache.put(key, grid_data)
+    cached = cache.get(key)
+    assert cached['cells'] == grid_data['cells'] and cached['words'] == grid_data['words']
+    assert cached['seed'] == 7 and cached['statistics'] == {'cached': True}
+
+    cache.put('autre', grid_data)  # Évince la première clé de la mémoire
+    assert cache.stats['evicted'] == 1 and len(cache) == 1
+    restarted = ResultCache(persist=True)
+    assert restarted.get(key)['cells'] == grid_data['cells'] and restarted.stats['db_hits'] == 1
+    assert restarted.get('inconnue') is None and restarted.stats['misses'] == 1
+
+
+def test_generate_batch_matches_single_generations(tmp_path, monkeypatch):
+    """Lot : préparation partagée, mêmes grilles que des générations isolées aux mêmes seeds (1 ou 2 workers)."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(GridSolver, 'MIN_SAFE_CANDIDATES', 1)  # Lexique minuscule : forward checking assoupli
+    # Test mono-thread : 'fork' sans risque, les workers héritent du réglage ci-dessus
+    monkeypatch.setattr(grid_generator, '_worker_context', lambda: multiprocessing.get_context('fork'))
+    (tmp_path / 'templates' / '3x3').mkdir(parents=True)
+    (tmp_path / 'templates' / '3x3' / 'template_01.txt').write_text('...\n...\n...\n')
+    words = ['TOE', 'TEN', 'ONE', 'NOT', 'TOT', 'ANT', 'EAT', 'TEA', 'ATE', 'OAT', 'PAT', 'APE', 'PEA',
+             'NAP', 'PAN', 'TAP', 'OPT', 'POT', 'TOP', 'RAT', 'ART', 'TAR', 'ORE', 'ROE', 'NET', 'ARE']
+    words += sorted({w[i:i + 2] for w in words for i in range(2)})
+    trie = make_trie(words)
+    cells = lambda grid_data: ''.join(c['char'] for c in grid_data['cells'])
+
+    singles = []
+    for seed in range(20, 24):
+        generator = GridGenerator(3, 3, words, trie, seed=seed)
+        assert generator.generate()
+        singles.append(cells(generator.get_grid_data()))
+
+    batch = list(GridGenerator.generate_batch(3, 3, words, trie, 4, seed=20))
+    assert [index for index, _ in batch] == [0, 1, 2, 3]
+    assert [cells(grid_data) for _, grid_data in batch] == singles
+    parallel = dict(GridGenerator.generate_batch(3, 3, words, trie, 4, seed=20, workers=2))
+    assert [cells(parallel[index]) for index in range(4)] == singles
+    # Échéance dépassée : relayée aux workers, aucune grille n'est achevée
+    expired = dict(GridGenerator.generate_batch(3, 3, words, trie, 4, seed=20, workers=2,
+                                                cancel_token=CancellationToken.with_timeout(0)))
+    assert all(grid_data is None or not grid_data['complete'] for grid_data in expired.values())
+
+    plan = GridGenerator.new_batch_plan(words)
+    for seed in (20, 21):
+        GridGenerator.run_batch_grid(3, 3, trie, plan, seed)
+    assert len(plan['templates']) == 1 and len(plan['pruned']) == 1 and plan['pattern_matches']
@@ -0,0 +1,439 @@
+import itertools
+import json
+import random
+
+import pytest
+
+from engine.grid_template import GridTemplate
+from engine.slot_finder import SlotFinder
+from engine.word_repository import WordRepository
+from engine.grid_solver import GridSolver
+from engine.beam_solver import BeamSolver
+from engine.nogood_store import NogoodStore
+from engine.solver_trace import SolverTrace, find_blowups
+from engine.cancellation import CancellationToken
+
+# Carré de mots 3x3 : lignes TOP / ARE / NET, colonnes TAN / ORE / PET (ou sa transposée).
+# Les fragments de 2 lettres sont ajoutés car le solveur valide les fragments croisés.
+SQUARE_WORDS = ['TOP', 'ARE', 'NET', 'TAN', 'ORE', 'PET',
+                'TO', 'OP', 'AR', 'RE', 'NE', 'ET', 'TA', 'AN', 'OR', 'PE']
+SQUARE_SOLUTIONS = (['TOP', 'ARE', 'NET'], ['TAN', 'ORE', 'PET'])
+
+
+def make_solver(tmp_path, words, width=3, height=3, black_squares=(), solver_cls=GridSolver):
+    """Construit un solveur (GridSolver par défaut) sur une grille vide (cases noires (x, y) optionnelles) à partir d'une liste de mots."""
+    dela_file = tmp_path / 'mini_dela.csv'
+    dela_file.write_text('\n'.join(f"{w};def" for w in words), encoding='utf-8')
+    template = GridTemplate(width, height)
+    for x, y in black_squares:
+        template.grid[y][x] = GridTemplate.BLACK_SQUARE
+    finder = SlotFinder(template)
+    finder.find_all_slots()
+    solver = solver_cls(template, WordRepository(str(dela_file)), finder)
+    # Dictionnaire minuscule : le FC strict (3 candidats) rejetterait tout
+    solver.MIN_SAFE_CANDIDATES = 1
+    return solver
+
+
+@pytest.fixture(autouse=True)
+def fixed_seed():
+    random.seed(0)
+
+
+def test_solver_fills_word_square(tmp_path):
+    """Le solveur remplit un carré de mots et la vue 2D reflète la grille à plat."""
+    solver = make_solver(tmp_path, SQUARE_WORDS)
+
+    assert solver.solve()
+    assert [''.join(row) for row in solver.grid] in SQUARE_SOLUTIONS
+
+
+def test_slot_pattern_and_revert(tmp_path):
+    """Placer puis annuler un mot restaure exactement les motifs des slots."""
+    solver = make_solver(tmp_path, SQUARE_WORDS)
+    across = next(s for s in solver.slots if s['direction'] == 'across' and s['y'] == 0)
+    down = next(s for s in solver.slots if s['direction'] == 'down' and s['x'] == 2)
+
+    original_state = solver._place_word_on_grid('TOP', across)
+    assert solver._get_slot_pattern(across) == 'TOP'
+    assert solver._get_slot_pattern(down) == 'P??'
+
+    assert down['unknowns'] == 2
+
+    solver._revert_grid_state(original_state, across)
+    assert solver._get_slot_pattern(across) == '???'
+    assert solver._get_slot_pattern(down) == '???'
+    assert down['unknowns'] == 3
+
+
+def test_incremental_patterns_match_grid(tmp_path):
+    """Les motifs maintenus incrémentalement restent identiques à ceux lus dans la grille."""
+    solver = make_solver(tmp_path, SQUARE_WORDS)
+    across = [s for s in solver.slots if s['direction'] == 'across']
+    trail = [(slot, solver._place_word_on_grid(word, slot)) for slot, word in zip(across, ['TOP', 'ARE'])]
+
+    for slot in solver.slots:
+        assert slot['pattern'] == solver._compute_slot_pattern(slot)
+        assert slot['unknowns'] == slot['pattern'].count('?')
+
+    for slot, original_state in reversed(trail):
+        solver._revert_grid_state(original_state, slot)
+    assert all(slot['pattern'] == '???' for slot in solver.slots)
+
+
+def test_unsolvable_grid_returns_false(tmp_path):
+    """Sans mot compatible pour les colonnes, la résolution échoue proprement."""
+    solver = make_solver(tmp_path, ['ABC', 'DEF', 'GHI'])
+
+    assert not solver.solve()
+
+
+def test_ac3_propagation_solves_and_undoes(tmp_path):
+    """Le mode 'ac3' résout la grille ; un placement refusé laisse les domaines intacts."""
+    solver = make_solver(tmp_path, SQUARE_WORDS)
+
+    assert solver.solve(propagation='ac3')
+    assert [''.join(row) for row in solver.grid] in SQUARE_SOLUTIONS
+    assert solver.metrics['ac_revisions'] > 0
+    assert solver.domains.trail  # Les affectations de la solution restent sur la trail
+
+    solver.domains.undo(0)
+    assert all(solver.domains.size(slot['index']) > 0 for slot in solver.slots)
+
+
+def test_unknown_propagation_mode_is_rejected(tmp_path):
+    solver = make_solver(tmp_path, SQUARE_WORDS)
+
+    with pytest.raises(ValueError):
+        solver.solve(propagation='ac4')
+
+
+@pytest.mark.parametrize('backjumping', [True, False])
+def test_solver_with_and_without_backjumping(tmp_path, backjumping):
+    solver = make_solver(tmp_path, SQUARE_WORDS)
+
+    assert solver.solve(backjumping=backjumping)
+    assert [''.join(row) for row in solver.grid] in SQUARE_SOLUTIONS
+
+
+def test_learned_nogoods_are_bounded_and_matched(tmp_path):
+    """Les nogoods appris sont évincés en LRU et reconnus dès que leurs lettres réapparaissent."""
+    solver = make_solver(tmp_path, SQUARE_WORDS)
+    solver.MAX_LEARNED_NOGOODS = 1
+    across = [s for s in solver.slots if s['direction'] == 'across']
+
+    solver._place_word_on_grid('TOP', across[0])
+    solver._learn_nogood(set(across[0]['offsets'][:2]))  # T, O en ligne 0
+    solver._learn_nogood({across[0]['offsets'][2]})      # P en ligne 0 : évince le premier
+    assert len(solver.nogoods) == 1
+    assert solver.metrics['nogoods_evicted'] == 1
+    (literals,) = solver.nogoods.values()
+    assert [letter for _, _, letter in literals] == ['P']
+
+    solver._revert_grid_state(b'...', across[0])
+    solver._place_word_on_grid('TAP', across[0])
+    assert solver._matching_nogood_conflict(set(across[0]['offsets'])) == {across[0]['offsets'][2]}
+
+
+def test_nogood_learning_never_changes_the_search_result(tmp_path):
+    """
+    Un nogood n'est appris que d'une explication complète : sur de petites
+    instances explorées entièrement, la recherche donne le même résultat
+    (même grille, ou même échec) avec et sans apprentissage.
+    """
+    words_3x3 = [''.join(letters) for n in (2, 3) for letters in itertools.product('ABC', repeat=n)]
+    instances = [['AAA', 'AAB', 'ABA', 'ABB', 'BAA', 'BAB', 'BBA']]
+    instances += [random.Random(i).sample(words_3x3, 8 + i % 7) for i in range(12)]
+    learned = 0
+    for words in instances:
+        for backjumping in (True, False):
+            results = []
+            for max_nogood_size in (GridSolver.MAX_NOGOOD_SIZE, -1):  # -1 : apprentissage désactivé
+                random.seed(0)
+                solver = make_solver(tmp_path, words)
+                solver.MAX_CANDIDATES_PER_SLOT = len(words)
+                solver.MAX_NOGOOD_SIZE = max_nogood_size
+                results.append((solver.solve(backjumping=backjumping), [''.join(row) for row in solver.grid]))
+                learned += solver.metrics['nogoods_learned']
+            assert results[0] == results[1], words
+    assert learned > 0
+
+
+def test_step_pauses_and_checkpoint_resumes_in_fresh_solver(tmp_path):
+    """La recherche s'arrête après N nœuds ; son checkpoint JSON reprend sur un solveur neuf."""
+    solver = make_solver(tmp_path, SQUARE_WORDS)
+    solver.start()
+    opened = solver.metrics['recursive_calls']
+    assert solver.step(max_nodes=1) == GridSolver.STATUS_RUNNING
+    assert solver.metrics['recursive_calls'] == opened + 1
+
+    checkpoint = json.loads(json.dumps(solver.checkpoint()))
+    assert checkpoint['stack'][0][1] is not None  # Un mot est en cours sur le premier slot
+
+    resumed = make_solver(tmp_path, SQUARE_WORDS)
+    resumed.restore(checkpoint)
+    assert resumed.grid == solver.grid
+    assert resumed.step() == GridSolver.STATUS_SOLVED
+    assert [''.join(row) for row in resumed.grid] in SQUARE_SOLUTIONS
+    assert resumed.metrics['recursive_calls'] > opened + 1
+
+
+def test_luby_sequence():
+    assert [GridSolver.luby(i) for i in range(1, 16)] == [1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8]
+
+
+# Vocabulaire plus riche : plusieurs impasses avant la solution (redémarrages effectifs)
+RICH_WORDS = ['TOE', 'TEN', 'ONE', 'NOT', 'TOT', 'ANT', 'EAT', 'TEA', 'ATE', 'OAT', 'PAT', 'APE', 'PEA',
+              'NAP', 'PAN', 'TAP', 'OPT', 'POT', 'TOP', 'RAT', 'ART', 'TAR', 'ORE', 'ROE', 'NET', 'ARE']
+RICH_WORDS += sorted({w[i:i + 2] for w in RICH_WORDS for i in range(2)})
+
+
+@pytest.mark.parametrize('policy', GridSolver.RESTART_POLICIES)
+def test_restarts_keep_search_complete(tmp_path, policy):
+    """Avec une coupure minimale, la recherche redémarre mais trouve la solution ou prouve l'échec."""
+    solver = make_solver(tmp_path, RICH_WORDS)
+    solver.RESTART_UNIT = 1
+    assert solver.solve(restarts=policy)
+    assert solver.metrics['restarts'] > 0
+    assert all(solver._compute_slot_pattern(slot) in RICH_WORDS for slot in solver.slots)
+
+    unsolvable = make_solver(tmp_path, ['ABC', 'DEF', 'GHI'])
+    unsolvable.RESTART_UNIT = 1
+    assert not unsolvable.solve(restarts=policy)
+
+    with pytest.raises(ValueError):
+        solver.solve(restarts='never')
+
+
+def test_node_budget_returns_best_partial_grid(tmp_path):
+    """Budget épuisé : la meilleure grille partielle est restituée, cohérente avec les motifs."""
+    solver = make_solver(tmp_path, RICH_WORDS)
+
+    assert not solver.solve(node_budget=2)
+    assert solver.status == GridSolver.STATUS_INCOMPLETE
+    assert solver.placed_words
+    filled = sum(char not in '.#' for row in solver.grid for char in row)
+    assert filled == solver.best_partial['key'][0] == solver.metrics['best_partial_filled']
+    for slot in solver.slots:
+        assert slot['pattern'] == solver._compute_slot_pattern(slot)
+    for word in solver.placed_words:
+        slot = next(s for s in solver.slots if s['id'] == word['id'])
+        assert slot['is_filled'] and slot['pattern'] == word['text']
+
+
+def test_cancel_token_stops_search_like_an_exhausted_budget(tmp_path):
+    """Jeton échu ou annulé : arrêt en 'incomplete', raison relevée dans les statistiques."""
+    solver = make_solver(tmp_path, RICH_WORDS)
+    assert not solver.solve(cancel_token=CancellationToken.with_timeout(0))
+    assert solver.status == GridSolver.STATUS_INCOMPLETE
+    assert solver.cancel_reason == CancellationToken.REASON_DEADLINE
+    assert solver.get_solve_statistics()['cancel_reason'] == 'deadline'
+
+    token = CancellationToken()
+    token.cancel(CancellationToken.REASON_DISCONNECTED)
+    token.cancel()  # La première raison est conservée
+    beam = make_solver(tmp_path, RICH_WORDS, solver_cls=BeamSolver)
+    assert not beam.solve(cancel_token=token)
+    assert beam.status == GridSolver.STATUS_INCOMPLETE and beam.cancel_reason == 'disconnected'
+
+    # Jeton jamais déclenché : résolution inchangée
+    assert make_solver(tmp_path, RICH_WORDS).solve(cancel_token=CancellationToken.with_timeout(60000))
+
+
+def test_lcv_ranks_words_leaving_more_options_to_crossings(tmp_path):
+    """'lcv' classe d'abord les mots dont les lettres sont fréquentes aux positions croisées."""
+    solver = make_solver(tmp_path, RICH_WORDS)
+    solver._set_value_order('lcv')
+    across = next(s for s in solver.slots if s['direction'] == 'across' and s['y'] == 0)
+
+    scores = dict((w, score) for score, w in solver._score_candidates(across, ['TOP', 'APE']))
+    # Les colonnes commencent par ces lettres : T, O, P fréquents en tête ; E très rare (EAT)
+    assert scores['TOP'] > scores['APE']
+
+    assert solver.solve(value_order='lcv')
+    assert all(solver._compute_slot_pattern(slot) in RICH_WORDS for slot in solver.slots)
+    with pytest.raises(ValueError):
+        solver.solve(value_order='random')
+
+
+def test_zobrist_hash_and_transposition_table(tmp_path):
+    """Le hachage incrémental revient à sa valeur après revert ; un état en échec est reconnu."""
+    solver = make_solver(tmp_path, RICH_WORDS)
+    solver._init_zobrist(True)
+    across = next(s for s in solver.slots if s['direction'] == 'across' and s['y'] == 0)
+    empty_hash = solver.grid_hash
+
+    original_state = solver._place_word_on_grid('TOP', across)
+    solver._consume(across, 'TOP')
+    placed_hash = solver.grid_hash
+    solver._fail({across['offsets'][0]})  # L'état "TOP en ligne 0" est en échec
+    solver._unplace(across, 'TOP', original_state, None)
+    assert solver.grid_hash == empty_hash and solver._filled_hash == 0
+
+    solver._place_word_on_grid('TOP', across)
+    assert solver.grid_hash == placed_hash
+    assert solver._transposition_conflict(across) == {across['offsets'][0]}
+    assert solver.metrics['tt_hits'] == 1 and solver.metrics['tt_stores'] == 1
+
+    solver._revert_grid_state(original_state, across)
+    solver._place_word_on_grid('TAP', across)
+    assert solver._transposition_conflict(across) is None
+
+
+def test_compatibility_tables_prefilter_candidates(tmp_path):
+    """Une lettre trop rare à la position croisée écarte le mot sans recherche de motif."""
+    solver = make_solver(tmp_path, RICH_WORDS)
+    solver.MIN_SAFE_CANDIDATES = 5  # En tête de mot de 3 lettres, seuls T (7 mots) et A (5) suffisent
+    solver._build_compatibility_tables()
+    across = next(s for s in solver.slots if s['direction'] == 'across' and s['y'] == 0)
+
+    assert solver._compatible_letters[3][0] == {'T', 'A'}
+    assert solver._filter_compatible(across, ['TOP', 'ATE']) == []
+    assert solver.metrics['compat_rejections'] == 2
+
+
+def test_forward_check_letter_tables_match_pattern_queries(tmp_path):
+    """Le forward checking par tables de lettres donne le même verdict que la requête du motif futur."""
+    solver = make_solver(tmp_path, RICH_WORDS)
+    solver.MIN_SAFE_CANDIDATES = 2
+    across = next(s for s in solver.slots if s['direction'] == 'across' and s['y'] == 1)
+    crossing_counts = {}
+
+    for word in [w for w in RICH_WORDS if len(w) == 3]:
+        original_state = solver._place_word_on_grid(word, across)
+        expected = solver._find_starved_crossing(word, across, original_state)
+        assert solver._find_starved_crossing(word, across, original_state, crossing_counts) is expected
+        solver._revert_grid_state(original_state, across)
+    assert crossing_counts
+
+
+def test_decompose_solves_independent_components(tmp_path):
+    """Case centrale noire, lignes posées : les deux colonnes sont des sous-problèmes indépendants."""
+    solver = make_solver(tmp_path, ['TOP', 'NET', 'TAN', 'PET', 'TIN', 'PAT'], black_squares=[(1, 1)])
+    for word, y in (('TOP', 0), ('NET', 2)):
+        row = next(s for s in solver.slots if s['direction'] == 'across' and s['y'] == y)
+        solver._place_word_on_grid(word, row)
+        solver._consume(row, word)
+
+    columns = {s['index'] for s in solver.slots if s['direction'] == 'down'}
+    assert sorted(map(sorted, solver._open_components())) == sorted([index] for index in columns)
+
+    assert solver.solve(decompose=True)
+    assert solver.metrics['component_splits'] >= 1
+    assert [''.join(row) for row in solver.grid][::2] == ['TOP', 'NET']
+    assert {word['text'] for word in solver.placed_words} <= {'TAN', 'TIN', 'PET', 'PAT'}
+
+
+
+def test_prune_lexicon_keeps_only_words_that_fit_the_template(tmp_path):
+    """Le pré-élagage retire les longueurs absentes du gabarit et les mots sans support aux croisements."""
+    solver = make_solver(tmp_path, SQUARE_WORDS + ['XYZ', 'TOPS'])
+
+    assert solver.prune_lexicon()
+    assert set(solver.repository.words_by_len) == {3}
+    assert solver.repository.words_by_len[3] == set(SQUARE_WORDS[:6])
+    assert (solver.metrics['lexicon_before'], solver.metrics['lexicon_after']) == (18, 6)
+    assert solver.solve()
+    assert [''.join(row) for row in solver.grid] in SQUARE_SOLUTIONS
+
+def test_forced_words_are_preplaced_and_kept(tmp_path):
+    """Les mots imposés sont posés avant la recherche et restent dans la solution."""
+    solver = make_solver(tmp_path, SQUARE_WORDS + ['TEN'])
+
+    assert solver.place_forced_words(['ORE', 'TOP'])
+    assert {word['text'] for word in solver.placed_words} == {'ORE', 'TOP'}
+    # Propagation initiale : TEN n'a plus de place, il quitte le lexique de la recherche
+    assert solver.metrics['forced_pruned'] == 1 and 'TEN' not in solver.repository.words_by_len[3]
+    assert solver.solve()
+    assert [''.join(row) for row in solver.grid] in SQUARE_SOLUTIONS
+    assert {'ORE', 'TOP'} <= {word['text'] for word in solver.placed_words}
+
+    # Aucun slot de 2 lettres : placement impossible ; mots hors dictionnaire refusés
+    assert not make_solver(tmp_path, SQUARE_WORDS).place_forced_words(['OP'])
+    with pytest.raises(ValueError):
+        make_solver(tmp_path, SQUARE_WORDS).place_forced_words(['XYZ'])
+
+
+def test_locked_cells_seed_the_search(tmp_path):
+    """Cases verrouillées : slot complet conservé, lettres isolées imposées au motif, échec sans effet."""
+    solver = make_solver(tmp_path, SQUARE_WORDS)
+    assert solver.lock_cells({(0, 0): 'T', (1, 0): 'O', (2, 0): 'P', (0, 2): 'N'})
+    assert [word['text'] for word in solver.placed_words] == ['TOP']
+    assert solver.solve()
+    assert [''.join(row) for row in solver.grid] == ['TOP', 'ARE', 'NET']
+
+    # Ligne verrouillée qui n'est pas un mot : refus, grille intacte
+    solver = make_solver(tmp_path, SQUARE_WORDS)
+    assert not solver.lock_cells({(0, 0): 'P', (1, 0): 'O', (2, 0): 'T'})
+    assert solver.cells.count(b'.') == 9 and not solver.locked_cells
+    with pytest.raises(ValueError):
+        solver.lock_cells({(3, 0): 'T'})
+
+
+def test_beam_solver_fills_word_square(tmp_path):
+    """Le beam search remplit le carré de mots ; une largeur hors bornes est refusée."""
+    beam = make_solver(tmp_path, SQUARE_WORDS, solver_cls=lambda *args: BeamSolver(*args, beam_width=2))
+
+    assert beam.solve(propagation='ac3')  # (options du backtracking ignorées)
+    assert [''.join(row) for row in beam.grid] in SQUARE_SOLUTIONS
+    assert {word['text'] for word in beam.placed_words} <= set(SQUARE_WORDS)
+    assert beam.get_solve_statistics()['metrics']['beam_levels'] >= len(beam.placed_words)
+    with pytest.raises(ValueError):
+        make_solver(tmp_path, SQUARE_WORDS, solver_cls=lambda *args: BeamSolver(*args, beam_width=0))
+
+
+def test_shared_nogood_store_persists_and_preloads(tmp_path):
+    """Les nogoods exportés survivent au disque, sont bornés par clé et rejettent les candidats du solveur suivant."""
+    first = make_solver(tmp_path, SQUARE_WORDS)
+    across = [s for s in first.slots if s['direction'] == 'across']
+    first._place_word_on_grid('TOP', across[0])
+    first._learn_nogood({across[0]['offsets'][2]})  # P en fin de ligne 0
+    exported = first.export_nogoods()
+    assert exported == [((across[0]['offsets'][2], 'P'),)]
+
+    key = NogoodStore.make_key('3x3', NogoodStore.lexicon_version(SQUARE_WORDS), 'safe1')
+    stale_key = '3x3|lexique|custom|safe1'  # Clé d'un format antérieur
+    store = NogoodStore(path=str(tmp_path / 'nogoods.json'), max_nogoods_per_key=1)
+    assert store.add(key, exported + exported) == 1
+    store.add(stale_key, exported)
+    store.save()
+    reloaded = NogoodStore(path=str(tmp_path / 'nogoods.json'))
+    assert reloaded.get(key) == exported and reloaded.get('autre') == []
+    assert reloaded.get(stale_key) == []
+
+    second = make_solver(tmp_path, SQUARE_WORDS)
+    assert second.preload_nogoods(reloaded.get(key)) == 1
+    assert second.export_nogoods() == []  # Les nogoods préchargés ne sont pas réexportés
+    second._place_word_on_grid('TAP', across[0])
+    assert second._matching_nogood_conflict(set(across[0]['offsets'])) == {across[0]['offsets'][2]}
+    metrics = second.get_solve_statistics()['metrics']
+    assert metrics['shared_nogoods_loaded'] == 1 and metrics['shared_nogood_hits'] == 1
+
+
+def test_trace_ring_buffer_records_search_and_replays(tmp_path):
+    """La trace binaire (anneau borné) suit la recherche, est exportée et se rejoue à l'identique."""
+    # Lexique élargi : plusieurs carrés partiels, donc retours arrière et backjumps
+    words = SQUARE_WORDS + ['TOE', 'NEO', 'OAR', 'PER', 'TEN', 'ANT', 'PAT', 'EON', 'RAN']
+
+    def traced_run():
+        random.seed(0)
+        solver = make_solver(tmp_path, words)
+        solver.enable_trace()
+        assert solver.solve()
+        return solver
+
+    solver = traced_run()
+    trace = solver.get_solve_statistics()['trace']
+    kinds = [event for event, *_ in trace['events']]
+    assert kinds.count('node') + kinds.count('solved') == solver.metrics['recursive_calls'] and kinds[-1] == 'solved'
+    assert kinds.count('backtrack') == solver.metrics['backtracks']
+    assert [e[:4] for e in traced_run().get_solve_statistics()['trace']['events']] == \
+        [e[:4] for e in trace['events']]
+    assert solver.metrics['backtracks'] > 0
+    blowups = find_blowups(trace['events'])
+    assert blowups and blowups[0]['subtree_nodes'] == max(b['subtree_nodes'] for b in blowups) > 0
+
+    ring = SolverTrace(capacity=2)
+    for depth in range(5):
+        ring.record(SolverTrace.NODE, 0, None, depth)
+    assert ring.dropped == 3 and [depth for *_, depth, _ in ring.events()] == [3, 4]
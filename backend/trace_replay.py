@@ -0,0 +1,97 @@
+# DANS backend/trace_replay.py
+
+"""
+Rejoue une génération (taille + seed, mêmes mots que test_harness.py) avec la
+trace binaire du solveur activée, puis indique où l'arbre de recherche a
+explosé : nœuds par profondeur, slots les plus rouverts et plus gros
+sous-arbres en échec.
+
+Usage :
+    python trace_replay.py 6 7 1
+    python trace_replay.py 11 6 4 --options '{"restarts": "luby"}' --verify
+"""
+
+import argparse
+import json
+import logging
+from collections import Counter
+
+from grid_generator import GridGenerator
+from engine.solver_trace import SolverTrace, find_blowups
+from trie_engine import DictionnaireTrie
+
+DELA_FILE = 'dela_clean.csv'
+
+
+def replay(width: int, height: int, seed: int, words: list[str], options: dict | None = None,
+           capacity: int = SolverTrace.DEFAULT_CAPACITY) -> tuple[GridGenerator, dict]:
+    """Génère la grille du seed avec la trace activée ; renvoie (générateur, trace exportée)."""
+    max_len = max(width, height)
+    valid_words = [w for w in words if len(w) <= max_len]
+    trie = DictionnaireTrie()
+    for word in valid_words:
+        trie.insert(word)
+    generator = GridGenerator(width, height, valid_words, prebuilt_trie=trie, seed=seed)
+    generator.solver.enable_trace(capacity)
+    generator.generate(**(options or {}))
+    return generator, generator.get_grid_data()['statistics']['trace']
+
+
+def print_report(generator: GridGenerator, trace: dict, top: int = 5):
+    """Résumé de la trace : où la recherche a passé ses nœuds."""
+    events = trace['events']
+    metrics = generator.solver.metrics
+    print(f"Statut : {generator.solver.status} | {metrics['recursive_calls']} nœuds, "
+          f"{metrics['backtracks']} backtracks, {metrics['backjumps']} backjumps")
+    print(f"Trace : {trace['recorded']} événements ({trace['dropped']} écrasés, capacité {trace['capacity']})")
+
+    print("\nNœuds ouverts par profondeur :")
+    per_depth = Counter(depth for event, _, _, depth, _ in events if event == 'node')
+    widest = max(per_depth.values(), default=1)
+    for depth in sorted(per_depth):
+        print(f"  {depth:3d} {per_depth[depth]:7d} {'#' * max(1, 50 * per_depth[depth] // widest)}")
+
+    print("\nSlots les plus rouverts :")
+    reopened = Counter(slot for event, slot, _, _, _ in events if event == 'node')
+    for slot, count in reopened.most_common(top):
+        print(f"  slot {slot} : {count} ouvertures")
+
+    print("\nPlus gros sous-arbres en échec (point d'explosion) :")
+    for blowup in find_blowups(events, top):
+        print(f"  profondeur {blowup['depth']:3d}, slot {blowup['slot']}, mot '{blowup['word']}' : "
+              f"{blowup['subtree_nodes']} nœuds en {blowup['elapsed_ms']:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rejoue un seed avec la trace du solveur.")
+    parser.add_argument('width', type=int)
+    parser.add_argument('height', type=int)
+    parser.add_argument('seed', type=int)
+    parser.add_argument('--options', default='{}', help="Options JSON de GridGenerator.generate()")
+    parser.add_argument('--capacity', type=int, default=SolverTrace.DEFAULT_CAPACITY)
+    parser.add_argument('--top', type=int, default=5)
+    parser.add_argument('--verify', action='store_true', help="Rejoue deux fois et compare les traces")
+    parser.add_argument('--export', help="Écrit la trace JSON dans ce fichier")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    trie = DictionnaireTrie()
+    trie.load_dela_csv(DELA_FILE)
+    words = trie.get_sorted_words()  # Ordre stable d'un processus à l'autre (pas celui du set)
+    options = json.loads(args.options)
+
+    generator, trace = replay(args.width, args.height, args.seed, words, options, args.capacity)
+    print_report(generator, trace, args.top)
+
+    if args.verify:
+        _, again = replay(args.width, args.height, args.seed, words, options, args.capacity)
+        same = [e[:4] for e in trace['events']] == [e[:4] for e in again['events']]
+        print(f"\nRejeu déterministe : {'OK' if same else 'ÉCHEC (traces différentes)'}")
+    if args.export:
+        with open(args.export, 'w', encoding='utf-8') as f:
+            json.dump(trace, f, ensure_ascii=False)
+        print(f"Trace écrite dans {args.export}")
+
+
+if __name__ == '__main__':
+    main()
@@ -11,6 +11,7 @@ class DictionnaireTrie:
     def __init__(self):
         self.root = TrieNode()
         self.words = set()
+        self._sorted_words = None  # Cache de get_sorted_words(), invalidé par insert()
         logging.info("Initialisation du DictionnaireTrie.")
 
     @staticmethod
@@ -38,6 +39,7 @@ class DictionnaireTrie:
         if not node.is_end_of_word:
             node.is_end_of_word = True
             self.words.add(mot_normalise)
+            self._sorted_words = None
 
     def load_dela_csv(self, file_path):
         """Charge le CSV directement dans le set et le Trie."""
@@ -81,6 +83,30 @@ class DictionnaireTrie:
         """Retourne une liste de tous les mots du set."""
         return list(self.words)
 
+    def get_sorted_words(self) -> list[str]:
+        """
+        Mots triés (liste calculée une fois, à ne pas modifier) : ordre stable d'un
+        processus à l'autre, contrairement au set, pour un échantillon reproductible.
+        """
+        if self._sorted_words is None:
+            self._sorted_words = sorted(self.words)
+        return self._sorted_words
+
+    def get_words_in_trie_order(self) -> list[str]:
+        """
+        Mots dans l'ordre d'un parcours en profondeur (ordre des enfants conservé) :
+        réinsérés dans cet ordre, ils redonnent un Trie identique, dont
+        search_pattern() rend les mêmes mots dans le même ordre (workers d'un pool).
+        """
+        words = []
+        stack = [(self.root, "")]
+        while stack:
+            node, prefix = stack.pop()
+            if node.is_end_of_word:
+                words.append(prefix)
+            stack.extend((child, prefix + char) for char, child in reversed(node.children.items()))
+        return words
+
 class Mot:
     # Cette classe n'est plus utilisée par le Trie, mais on la garde au cas où
     def __init__(self, texte, texte_normalise, definition=None):
@@ -48,7 +48,6 @@ export function GridClientLayout() {
         body: {
           size: { width, height },
           use_global: true,
-          seed: Math.random(),
         },
       });
       setGridData(data.grid);